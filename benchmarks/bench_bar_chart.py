@@ -0,0 +1,46 @@
+"""
+Measures the drawing operators emitted for bar charts, and the time to render and output them.
+
+Run with: PYTHONPATH=src python benchmarks/bench_bar_chart.py
+"""
+
+import re
+import time
+from collections import Counter
+
+from briefly import PDF
+
+CHARTS = 300
+VALUES = [3, 8, 5, 1, 0.1, 7, 4, 9, 2, 6, 5, 3]
+_OPERATOR = re.compile(rb"(?<![\w/])(re|m|l|c|h|f|S|rg|RG|Do|q|Q|cm)(?=\s|$)")
+
+
+def main() -> None:
+    start = time.perf_counter()
+    pdf = PDF()
+    pdf.add_page()
+    for idx in range(CHARTS):
+        pdf.bar_chart(
+            {
+                f"Week {week}": value * (idx % 5 + 1)
+                for week, value in enumerate(VALUES)
+            },
+            f"Chart {idx}",
+            limit=20,
+        )
+    render_time = time.perf_counter() - start
+    operators: Counter[bytes] = Counter()
+    for page in pdf.pages.values():
+        operators.update(_OPERATOR.findall(bytes(page.contents)))
+    start = time.perf_counter()
+    size = len(pdf.output())
+    output_time = time.perf_counter() - start
+
+    print(f"{CHARTS} bar charts on {pdf.page} pages, {size / 1024:.0f} KiB")
+    print(f"render {render_time * 1000:.0f} ms, output {output_time * 1000:.0f} ms")
+    print(f"operators: {sum(operators.values())} total")
+    print("  " + ", ".join(f"{op.decode()}={n}" for op, n in operators.most_common()))
+
+
+if __name__ == "__main__":
+    main()
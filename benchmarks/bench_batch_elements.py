@@ -0,0 +1,57 @@
+"""
+Compares rendering summary cards and tags one at a time with the batch APIs.
+
+Run with: PYTHONPATH=src python benchmarks/bench_batch_elements.py
+"""
+
+import time
+from typing import Callable
+
+from briefly import PDF
+
+CARDS = [[f"Total: {idx}", f"Completed: {idx // 2}", "Late: 3"] for idx in range(600)]
+TAGS = [f"COMPONENT-{idx % 97}" for idx in range(5000)]
+
+
+def single(pdf: PDF) -> None:
+    for idx, items in enumerate(CARDS):
+        pdf._break_page_if_needed(28)
+        x, y = pdf.summary_card(items, width=80)
+        if idx % 2:
+            pdf.set_xy(pdf.l_margin, y + 5)
+        else:
+            pdf.set_xy(x + 5, y - 28)
+    for text in TAGS:
+        if pdf.get_x() + 30 > pdf.w - pdf.r_margin:
+            pdf.set_xy(pdf.l_margin, pdf.get_y() + 7)
+            pdf._break_page_if_needed(5)
+        pdf.tag(text)
+        pdf.set_x(pdf.get_x() + 2)
+
+
+def batch(pdf: PDF) -> None:
+    pdf.summary_cards(CARDS, columns=2)
+    pdf.tags(TAGS)
+
+
+def run(name: str, render: Callable[[PDF], None]) -> None:
+    start = time.perf_counter()
+    pdf = PDF()
+    pdf.add_page()
+    render(pdf)
+    render_time = time.perf_counter() - start
+    content = sum(len(page.contents) for page in pdf.pages.values())
+    size = len(pdf.output())
+    print(
+        f"{name:>6}: render {render_time * 1000:5.0f} ms, {pdf.page} pages,"
+        f" content {content / 1024:.0f} KiB, output {size / 1024:.0f} KiB"
+    )
+
+
+def main() -> None:
+    run("single", single)
+    run("batch", batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares drawing the text cells of the components with fpdf's `cell` and with the direct emission of `PDF._cell`.
+
+Run with: PYTHONPATH=src python benchmarks/bench_cells.py [cards]
+"""
+
+import sys
+import time
+from datetime import date, datetime
+
+from briefly import PDF
+
+STATUSES = ["Done", "In Progress", "Waiting for customer approval"]
+
+
+class CellPDF(PDF):
+    """Draws all cells with fpdf's `cell`."""
+
+    def _can_emit_cell(self, *args: object) -> bool:
+        return False
+
+
+def build(pdf: PDF, cards: int) -> None:
+    pdf.add_page()
+    for idx in range(cards):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            f"Migrate the reporting service #{idx} to the new storage API",
+            STATUSES[idx % len(STATUSES)],
+            date(2025, 1, 3),
+            idx % 4 + 1,
+            3,
+        )
+    pdf.set_xy(pdf.l_margin, pdf.get_y() + 40)
+    pdf.styled_table(
+        ["Key", "Summary", "Status", "Points"],
+        [
+            [f"PROJ-{idx}", f"Task {idx}", STATUSES[idx % len(STATUSES)], "3"]
+            for idx in range(cards)
+        ],
+    )
+    pdf.bar_chart({f"Team {idx}": idx % 13 + 1 for idx in range(40)}, "Story points")
+
+
+def run(name: str, cls: type[PDF], cards: int) -> bytes:
+    pdf = cls(reproducible=True, generation_time=datetime(2025, 1, 2))
+    start = time.perf_counter()
+    build(pdf, cards)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} {elapsed:6.2f} s ({pdf.page} pages)")
+    return bytes(pdf.output())
+
+
+def main(cards: int) -> None:
+    cell = run("fpdf cell", CellPDF, cards)
+    direct = run("direct emission", PDF, cards)
+    print(f"identical output: {cell == direct}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,55 @@
+"""
+Compares the pie chart backends: charts per second, and the peak memory of rendering a chart.
+
+Each backend runs in its own process, so that the memory allocated by matplotlib (outside of the Python allocator) is measured as the growth of the resident set.
+
+Run with: PYTHONPATH=src python benchmarks/bench_chart_backends.py [charts]
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+from briefly.rendering.graphs import (
+    ChartBackend,
+    MatplotlibBackend,
+    RasterBackend,
+    build_pie_chart_bytes,
+)
+
+BACKENDS: dict[str, ChartBackend] = {
+    "matplotlib": MatplotlibBackend(),
+    "raster": RasterBackend(),
+}
+
+
+def run(name: str, charts: int) -> None:
+    backend = BACKENDS[name]
+    # the first chart loads the lazily imported modules
+    build_pie_chart_bytes([1, 2], backend=backend)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for idx in range(charts):
+        values = [idx % 7 + 1, idx % 5 + 1, idx % 3 + 1, 2]
+        build_pie_chart_bytes(values, size=35, backend=backend)
+    elapsed = time.perf_counter() - start
+    # in KiB on Linux
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(
+        f"{name:>10}: {charts / elapsed:7.1f} charts/s,"
+        f" peak memory growth {growth / 1024:5.1f} MiB"
+    )
+
+
+def main(charts: int) -> None:
+    for name in BACKENDS:
+        subprocess.run([sys.executable, __file__, str(charts), name], check=True)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    if len(sys.argv) > 2:
+        run(sys.argv[2], count)
+    else:
+        main(count)
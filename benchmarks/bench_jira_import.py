@@ -0,0 +1,88 @@
+"""
+Measures the memory used to import a large Jira JSON export into a table and task cards.
+
+Run with: PYTHONPATH=src python benchmarks/bench_jira_import.py [size in MB]
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from briefly import PDF
+from briefly.jira import issue_table, read_json_issues, render_task_cards
+
+STATUSES = ["To Do", "In Progress", "Code Review", "Done"]
+PRIORITIES = ["Highest", "High", "Medium", "Low"]
+
+
+def write_export(path: Path, size: int) -> int:
+    """
+    Writes a search response with issues of about 1 KiB each, up to the size in bytes.
+    """
+    count = 0
+    with path.open("w") as export:
+        export.write('{"startAt": 0, "issues": [')
+        while export.tell() < size:
+            issue = {
+                "key": f"PROJ-{count}",
+                "fields": {
+                    "summary": f"Issue {count} with a title wrapped on the card",
+                    "status": {"name": STATUSES[count % 4]},
+                    "priority": {"name": PRIORITIES[count % 4]},
+                    "duedate": f"2025-{count % 12 + 1:02d}-{count % 28 + 1:02d}",
+                    "customfield_10016": count % 8,
+                    "description": "Lorem ipsum dolor sit amet. " * 30,
+                },
+            }
+            export.write(("," if count else "") + json.dumps(issue))
+            count += 1
+        export.write("]}")
+    return count
+
+
+def run(name: str, path: Path, render) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = render(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:>10}: {count} issues in {elapsed:5.1f} s,"
+        f" peak {peak / 1024 / 1024:5.1f} MiB"
+    )
+
+
+def parse(path: Path) -> int:
+    return sum(1 for _ in read_json_issues(path))
+
+
+def table(path: Path) -> int:
+    pdf = PDF(dry_run=True)
+    pdf.add_page()
+    issue_table(pdf, read_json_issues(path), columns=("key", "summary", "status"))
+    return pdf.element_counts["table_row"]
+
+
+def cards(path: Path) -> int:
+    pdf = PDF(dry_run=True)
+    pdf.add_page()
+    return render_task_cards(pdf, read_json_issues(path))
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "export.json"
+        count = write_export(path, size * 1024 * 1024)
+        print(f"export: {path.stat().st_size / 1024 / 1024:.0f} MiB, {count} issues")
+        run("parse", path, parse)
+        run("table", path, table)
+        run("task cards", path, cards)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares rendering the whole report to show its first page with rendering the first page of a `LazyReport`.
+
+Run with: PYTHONPATH=src python benchmarks/bench_lazy_pages.py [cards]
+"""
+
+import sys
+import time
+from datetime import date, datetime
+
+from briefly import PDF, LazyReport
+
+GENERATION_TIME = datetime(2025, 1, 2)
+STATUSES = ["Done", "In Progress", "Waiting for customer approval"]
+
+
+def build(pdf: PDF, cards: int) -> None:
+    pdf.add_page()
+    pdf.main_title("Sprint summary")
+    pdf.section_title("Overview")
+    pdf.bar_chart({"Alice": 12, "Bob": 8, "Carol": 15}, "Story points")
+    pdf.section_title("Tasks")
+    for idx in range(cards):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            f"Migrate the reporting service #{idx} to the new storage API",
+            STATUSES[idx % len(STATUSES)],
+            date(2025, 1, 3),
+            idx % 4 + 1,
+            3,
+        )
+
+
+def main(cards: int) -> None:
+    start = time.perf_counter()
+    pdf = PDF(generation_time=GENERATION_TIME)
+    build(pdf, cards)
+    pdf.output()
+    whole = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lazy = LazyReport(lambda pdf: build(pdf, cards), generation_time=GENERATION_TIME)
+    layout = time.perf_counter() - start
+
+    timings = []
+    for pages in (range(1, 2), range(lazy.page_count // 2, lazy.page_count // 2 + 1)):
+        start = time.perf_counter()
+        lazy.render_pages(pages)
+        timings.append(time.perf_counter() - start)
+
+    print(f"whole report ({pdf.page} pages): {whole:7.3f} s")
+    print(f"lazy layout:                 {layout:7.3f} s")
+    print(f"first page:                  {timings[0]:7.3f} s")
+    print(f"middle page:                 {timings[1]:7.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
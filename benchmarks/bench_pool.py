@@ -0,0 +1,59 @@
+"""
+Compares rendering small reports with fresh `PDF` instances and with a `PDFPool`.
+
+Usage: python benchmarks/bench_pool.py [reports]
+"""
+
+import sys
+import time
+from datetime import date
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.pool import PDFPool
+from briefly.style import PURPLE_HAZE
+
+
+def render(pdf: PDF) -> bytes:
+    pdf.add_page()
+    pdf.main_title("Sprint summary")
+    pdf.section_title("Overview")
+    pdf.summary_card(["Total Tickets: 58", "Completed: 42", "Blocked: 6"], width=50)
+    pdf.set_y(80)
+    for idx in range(6):
+        pdf.task_card(f"PROJ-{idx}", "Fix login flow", "Done", date(2025, 1, 3), 2, 3)
+    return bytes(pdf.output())
+
+
+def main(reports: int) -> None:
+    start = time.perf_counter()
+    for _ in range(reports):
+        PDF(PURPLE_HAZE)
+    construction = time.perf_counter() - start
+
+    pool = PDFPool(PURPLE_HAZE, max_idle=1)
+    pool.prewarm(1)
+    start = time.perf_counter()
+    for _ in range(reports):
+        pool.release(pool.acquire())
+    reuse = time.perf_counter() - start
+
+    print(f"construction: {construction / reports * 1000:7.2f} ms/instance")
+    print(f"pool reuse:   {reuse / reports * 1000:7.2f} ms/instance")
+
+    start = time.perf_counter()
+    for _ in range(reports):
+        render(PDF(PURPLE_HAZE))
+    fresh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(reports):
+        with pool.pdf() as pdf:
+            render(pdf)
+    pooled = time.perf_counter() - start
+
+    print(f"fresh report:  {fresh / reports * 1000:7.2f} ms/report")
+    print(f"pooled report: {pooled / reports * 1000:7.2f} ms/report")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
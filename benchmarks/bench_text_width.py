@@ -0,0 +1,40 @@
+"""
+Compares the precomputed width tables with fpdf's `get_string_width`.
+
+Run with: PYTHONPATH=src python benchmarks/bench_text_width.py
+"""
+
+import timeit
+
+from briefly import PDF
+from briefly.rendering.pdf_generator import FONT_FAMILY, LABEL_SIZE
+
+TEXTS = {
+    "ascii": "PROJ-1234 Fix the login flow",
+    "latin": "Zażółć gęślą jaźń, Ærøskøbing",
+    "other": "Deploy ✓ 漢字 → done",
+}
+NUMBER = 20_000
+
+
+def main() -> None:
+    pdf = PDF()
+    pdf.add_page()
+    pdf.set_font(FONT_FAMILY, "", LABEL_SIZE)
+    for name, text in TEXTS.items():
+        assert pdf._text_width(text) == pdf.get_string_width(text)
+        fpdf_time = timeit.timeit(
+            lambda text=text: pdf.get_string_width(text), number=NUMBER
+        )
+        table_time = timeit.timeit(
+            lambda text=text: pdf._text_width(text), number=NUMBER
+        )
+        print(
+            f"{name:>6}: get_string_width {fpdf_time / NUMBER * 1e6:6.2f} us,"
+            f" precomputed {table_time / NUMBER * 1e6:6.2f} us"
+            f" ({fpdf_time / table_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares rendering a report in a light and a dark style twice, and with a single layout pass.
+
+Usage: python benchmarks/bench_variants.py [cards]
+"""
+
+import sys
+import time
+from datetime import date, datetime
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.variants import render
+from briefly.style import LATTE, MOCHA
+
+GENERATION_TIME = datetime(2025, 1, 2)
+
+
+def build(pdf: PDF, cards: int) -> None:
+    pdf.add_page()
+    pdf.main_title("Sprint summary")
+    pdf.section_title("Overview")
+    pdf.pie_chart({"Done": 42, "In Progress": 10, "Blocked": 6}, "Status")
+    pdf.bar_chart({"Alice": 12, "Bob": 8, "Carol": 15}, "Story points")
+    pdf.section_title("Tasks")
+    for idx in range(cards):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            f"Migrate the reporting service #{idx} to the new storage API",
+            "Waiting for review",
+            date(2025, 1, 3),
+            idx % 4 + 1,
+            3,
+        )
+
+
+def main(cards: int) -> None:
+    start = time.perf_counter()
+    for style in (LATTE, MOCHA):
+        pdf = PDF(style, generation_time=GENERATION_TIME)
+        build(pdf, cards)
+        pdf.output()
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for pdf in render(
+        lambda pdf: build(pdf, cards), [LATTE, MOCHA], generation_time=GENERATION_TIME
+    ):
+        pdf.output()
+    single = time.perf_counter() - start
+
+    print(f"two renders:        {separate:7.2f} s")
+    print(f"single layout pass: {single:7.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,59 @@
+"""
+Generates `briefly/rendering/font_metrics.py`, the precomputed advance widths of the
+bundled fonts. Run it again whenever a font file in `briefly/fonts` changes:
+
+    python scripts/generate_font_metrics.py
+"""
+
+from importlib.resources import files
+from pathlib import Path
+
+from fpdf import FPDF
+
+from briefly.rendering.font_spec import FONT_FAMILY, FONTS
+
+# Basic Latin, Latin-1 Supplement, Latin Extended-A and B
+CODEPOINTS = 0x250
+ROW_SIZE = 14
+OUTPUT = Path(__file__).parents[1] / "src/briefly/rendering/font_metrics.py"
+
+HEADER = '''"""
+Precomputed advance widths of the bundled fonts, in 1/1000 em, rounded the same way as
+fpdf does.
+
+Generated by scripts/generate_font_metrics.py, do not edit.
+"""
+
+from collections.abc import Mapping
+
+# advance widths of the code points 0 to PRECOMPUTED_CODEPOINTS - 1, by font style
+'''
+
+
+def main() -> None:
+    pdf = FPDF()
+    font_pkg = files("briefly.fonts")
+    lines = [HEADER, f"PRECOMPUTED_CODEPOINTS: int = {CODEPOINTS:#x}\n\n"]
+    lines.append("# fmt: off\n")
+    lines.append("ADVANCE_WIDTHS: Mapping[str, tuple[int, ...]] = {\n")
+    for font in FONTS:
+        if font.family != FONT_FAMILY:
+            continue
+        pdf.add_font(font.family, font.style, str(font_pkg / font.filename))
+        ttf = pdf.fonts[font.family.lower() + font.style]
+        widths = [
+            int(ttf.cw.get(code, ttf.desc.missing_width)) for code in range(CODEPOINTS)
+        ]
+        lines.append(f"    # {font.filename}\n")
+        lines.append(f'    "{font.style}": (\n')
+        for start in range(0, CODEPOINTS, ROW_SIZE):
+            row = ", ".join(str(width) for width in widths[start : start + ROW_SIZE])
+            lines.append(f"        {row},\n")
+        lines.append("    ),\n")
+    lines.append("}\n")
+    lines.append("# fmt: on\n")
+    OUTPUT.write_text("".join(lines))
+
+
+if __name__ == "__main__":
+    main()
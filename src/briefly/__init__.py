@@ -1,4 +1,25 @@
+from briefly.rendering.graphs import ChartBackend, MatplotlibBackend, RasterBackend
+from briefly.rendering.lazy import LazyReport
+from briefly.rendering.merge import merge
 from briefly.rendering.pdf_generator import PDF
-from briefly.style import Style, Color
+from briefly.rendering.pool import PDFPool
+from briefly.rendering.snapshot import PageSnapshot, record_pages, snapshot_page, stamp
+from briefly.rendering.variants import render
+from briefly.style import Color, Style
 
-__all__ = ["PDF", "Style", "Color"]
+__all__ = [
+    "PDF",
+    "ChartBackend",
+    "Color",
+    "LazyReport",
+    "MatplotlibBackend",
+    "PDFPool",
+    "PageSnapshot",
+    "RasterBackend",
+    "Style",
+    "merge",
+    "record_pages",
+    "render",
+    "snapshot_page",
+    "stamp",
+]
@@ -0,0 +1,380 @@
+"""
+Streaming import of Jira issue exports into task cards and table rows.
+
+Both the JSON responses of the issue search API (``{"issues": [...]}``, or a plain array
+of issues) and the CSV exports are parsed incrementally: only the issue being read is
+kept in memory, so that exports larger than the available memory can be rendered.
+The fields are mapped to the arguments of `PDF.task_card`, and the due dates are parsed
+only when they are used.
+
+Example::
+
+    with open("export.json", "rb") as export:
+        render_task_cards(pdf, read_json_issues(export, base_url="https://example.atlassian.net"))
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import IO, Any, Optional, Union
+
+from briefly.rendering.pdf_generator import PDF
+
+Source = Union[str, "os.PathLike[str]", IO[str], IO[bytes]]
+
+# the priorities of task cards (1 is the highest) of the default Jira priority schemes
+PRIORITIES: Mapping[str, int] = {
+    "highest": 1,
+    "blocker": 1,
+    "critical": 1,
+    "high": 2,
+    "major": 2,
+    "medium": 3,
+    "low": 4,
+    "minor": 4,
+    "lowest": 4,
+    "trivial": 4,
+}
+
+# the titles of the columns of `issue_table`, by the `Issue` field they show
+COLUMNS: Mapping[str, str] = {
+    "key": "Key",
+    "summary": "Summary",
+    "status": "Status",
+    "priority": "Priority",
+    "due": "Due date",
+    "estimate": "Story points",
+}
+
+_CHUNK_SIZE = 64 * 1024
+_MAX_ISSUE_SIZE = 16 * 1024 * 1024
+# the date formats of the CSV exports, after the ISO format of the API
+_DATE_FORMATS = ("%d/%b/%y %I:%M %p", "%d/%b/%y", "%d/%m/%Y", "%m/%d/%Y")
+_WHITESPACE = re.compile(r"[\s,]*")
+
+
+@dataclass(frozen=True)
+class Issue:
+    """
+    A Jira issue, with the fields shown by the task cards.
+
+    :ivar key: The key of the issue, e.g. "PROJ-1".
+    :ivar summary: The title of the issue.
+    :ivar status: The name of the status, e.g. "In Progress".
+    :ivar due: The due date, as exported. It is parsed by `due_date`.
+    :ivar priority: The name of the priority, e.g. "High".
+    :ivar estimate: The story points estimate.
+    :ivar flagged: Whether the issue is flagged as an impediment.
+    :ivar link: The link to the issue, when the base URL of the Jira site is known.
+    """
+
+    key: str
+    summary: str
+    status: str
+    due: Optional[str] = None
+    priority: Optional[str] = None
+    estimate: Optional[float] = None
+    flagged: bool = False
+    link: Optional[str] = None
+
+    @property
+    def due_date(self) -> Optional[date]:
+        """
+        The due date, parsed from the ISO format of the API or from the formats of the CSV exports.
+
+        :raises ValueError: When the due date has an unknown format.
+        """
+        return _parse_date(self.due) if self.due else None
+
+    @property
+    def priority_level(self) -> Optional[int]:
+        """
+        The priority of the task card (1 is the highest), or None for unknown priorities, see `PRIORITIES`.
+        """
+        return PRIORITIES.get(self.priority.lower()) if self.priority else None
+
+    def task_card_arguments(self) -> dict[str, Any]:
+        """
+        Returns the arguments of `PDF.task_card` showing the issue.
+        The estimate is rounded to whole story points.
+        """
+        return {
+            "task_id": self.key,
+            "title": self.summary,
+            "status": self.status,
+            "due_date": self.due_date,
+            "priority": self.priority_level,
+            "estimate": None if self.estimate is None else round(self.estimate),
+            "flagged": self.flagged,
+            "link": self.link or 0,
+        }
+
+    def table_row(self, columns: Sequence[str]) -> list[str]:
+        """
+        Returns the cells of the issue in a table row.
+
+        :param columns: The fields shown in the columns, see `COLUMNS`.
+        """
+        row = []
+        for column in columns:
+            if column == "due":
+                due_date = self.due_date
+                row.append(due_date.strftime("%d.%m.%Y") if due_date else "")
+            elif column == "estimate":
+                row.append("" if self.estimate is None else f"{self.estimate:g}")
+            else:
+                value = getattr(self, column)
+                row.append("" if value is None else str(value))
+        return row
+
+
+def read_json_issues(
+    source: Source,
+    base_url: Optional[str] = None,
+    story_points_field: str = "customfield_10016",
+    flagged_field: str = "customfield_10021",
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[Issue]:
+    """
+    Reads the issues of a JSON export incrementally.
+
+    The export is either the response of the issue search API, with the issues in the "issues" array, or an array of issues. Each issue has a "key" and the "fields" of the API.
+
+    :param source: The path of the export, or a text or binary file object.
+    :param base_url: The URL of the Jira site, used to link the issues (e.g. "https://example.atlassian.net").
+    :param story_points_field: The id of the custom field with the story points.
+    :param flagged_field: The id of the custom field set on flagged issues.
+    :param chunk_size: The number of characters read at once.
+    :return: The issues, in the order of the export.
+    :raises ValueError: When the export is not valid JSON, or has no array of issues.
+    :raises TypeError: When an issue of the export is not a JSON object.
+    """
+    with _open_text(source) as stream:
+        for item in _iter_json_array(stream, "issues", chunk_size):
+            if not isinstance(item, dict):
+                raise TypeError("The issues of the export must be JSON objects")
+            fields = item.get("fields") or {}
+            key = str(item.get("key", ""))
+            estimate = fields.get(story_points_field)
+            yield Issue(
+                key=key,
+                summary=fields.get("summary") or "",
+                status=_name(fields.get("status")) or "",
+                due=fields.get("duedate"),
+                priority=_name(fields.get("priority")),
+                estimate=None if estimate is None else float(estimate),
+                flagged=bool(fields.get(flagged_field)),
+                link=_issue_link(base_url, key),
+            )
+
+
+def read_csv_issues(
+    source: Source,
+    base_url: Optional[str] = None,
+    story_points_column: str = "Custom field (Story Points)",
+    flagged_column: str = "Custom field (Flagged)",
+) -> Iterator[Issue]:
+    """
+    Reads the issues of a CSV export row by row.
+
+    The columns are found by their titles in the header row (ignoring the case): "Issue key", "Summary", "Status", "Due date" and "Priority", and the custom fields below. When a title is repeated (e.g. for multi-value fields), the first column is used.
+
+    :param source: The path of the export, or a text or binary file object.
+    :param base_url: The URL of the Jira site, used to link the issues (e.g. "https://example.atlassian.net").
+    :param story_points_column: The title of the column with the story points.
+    :param flagged_column: The title of the column set on flagged issues.
+    :return: The issues, in the order of the export.
+    :raises ValueError: When the export has no "Issue key" column, or an estimate is not a number.
+    """
+    with _open_text(source) as stream:
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        indices: dict[str, int] = {}
+        for idx, title in enumerate(header):
+            indices.setdefault(title.strip().lower(), idx)
+        if "issue key" not in indices:
+            raise ValueError("The export has no 'Issue key' column")
+
+        def column(row: Sequence[str], title: str) -> Optional[str]:
+            idx = indices.get(title.lower())
+            if idx is None or idx >= len(row) or not row[idx].strip():
+                return None
+            return row[idx].strip()
+
+        for row in reader:
+            if not row:
+                continue
+            key = column(row, "Issue key") or ""
+            estimate = column(row, story_points_column)
+            yield Issue(
+                key=key,
+                summary=column(row, "Summary") or "",
+                status=column(row, "Status") or "",
+                due=column(row, "Due date"),
+                priority=column(row, "Priority"),
+                estimate=None if estimate is None else float(estimate),
+                flagged=column(row, flagged_column) is not None,
+                link=_issue_link(base_url, key),
+            )
+
+
+def render_task_cards(pdf: PDF, issues: Iterable[Issue]) -> int:
+    """
+    Renders a task card of each issue, see `PDF.task_card`.
+
+    :param pdf: The report to render the cards in.
+    :param issues: The issues, e.g. from `read_json_issues` or `read_csv_issues`.
+    :return: The number of rendered cards.
+    """
+    count = 0
+    for issue in issues:
+        pdf.task_card(**issue.task_card_arguments())
+        count += 1
+    return count
+
+
+def issue_table(
+    pdf: PDF,
+    issues: Iterable[Issue],
+    columns: Sequence[str] = ("key", "summary", "status", "due"),
+    sample_size: int = 1000,
+) -> None:
+    """
+    Renders the issues in a table, see `PDF.styled_table`. The rows are created while the table is drawn.
+
+    :param pdf: The report to render the table in.
+    :param issues: The issues, e.g. from `read_json_issues` or `read_csv_issues`.
+    :param columns: The fields shown in the columns, see `COLUMNS`.
+    :param sample_size: The number of the first rows used to estimate the widths of the columns.
+    :raises ValueError: When a column is unknown.
+    """
+    unknown = [column for column in columns if column not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    pdf.styled_table(
+        [COLUMNS[column] for column in columns],
+        (issue.table_row(columns) for issue in issues),
+        sample_size=sample_size,
+    )
+
+
+@contextmanager
+def _open_text(source: Source) -> Iterator[IO[str]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8-sig", newline="") as stream:
+            yield stream
+    elif isinstance(source.read(0), str):
+        yield source  # type: ignore[misc]
+    else:
+        # not closing the file object of the caller
+        wrapper = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")  # type: ignore[type-var]
+        try:
+            yield wrapper
+        finally:
+            wrapper.detach()
+
+
+def _iter_json_array(stream: IO[str], key: str, chunk_size: int) -> Iterator[Any]:
+    """
+    Yields the items of the array of issues one by one, decoding each item separately.
+    """
+    buffer = _skip_to_array(stream, key, chunk_size)
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as error:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"Invalid JSON export: {error}") from error
+            if len(buffer) - pos > _MAX_ISSUE_SIZE:
+                raise ValueError("An issue of the export is too large") from error
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if end == len(buffer):
+            # a number or a literal may continue in the next chunk
+            chunk = stream.read(chunk_size)
+            if chunk:
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+        yield item
+        pos = end
+
+
+def _skip_to_array(stream: IO[str], key: str, chunk_size: int) -> str:
+    """
+    Reads the export up to the array of issues: the value of `key` in the top-level object, or the top-level array.
+
+    :return: The rest of the read text, after the opening bracket.
+    """
+    depth = 0
+    in_string = escaped = False
+    string: list[str] = []
+    pending_key: Optional[str] = None
+    last_string: Optional[str] = None
+    while chunk := stream.read(chunk_size):
+        for idx, char in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    last_string = "".join(string)
+                elif depth == 1 and len(string) <= len(key):
+                    string.append(char)
+                continue
+            if char == '"':
+                in_string = True
+                string = []
+            elif char == ":" and depth == 1:
+                pending_key, last_string = last_string, None
+            elif char == "[" and (depth == 0 or (depth == 1 and pending_key == key)):
+                return chunk[idx + 1 :]
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+            elif not char.isspace():
+                pending_key = None
+    raise ValueError(f"The export has no '{key}' array")
+
+
+def _name(value: Any) -> Optional[str]:
+    # the statuses and priorities of the API are objects with a name
+    if isinstance(value, Mapping):
+        name = value.get("name")
+        return None if name is None else str(name)
+    return None if value is None else str(value)
+
+
+def _issue_link(base_url: Optional[str], key: str) -> Optional[str]:
+    if base_url is None or not key:
+        return None
+    return f"{base_url.rstrip('/')}/browse/{key}"
+
+
+def _parse_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unknown date format: {text}")
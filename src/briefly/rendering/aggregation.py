@@ -0,0 +1,217 @@
+"""
+Reduction of large chart data sets to the data points that are actually displayed.
+
+Both helpers make a single pass over the values of the mapping and never sort it as a
+whole, so that only the visible slices/bars reach the renderer and the legend.
+Array-like data (NumPy arrays, pandas Series, Arrow arrays, buffers) is reduced with
+vectorized operations, creating Python objects only for the visible items.
+"""
+
+import heapq
+import math
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from operator import itemgetter
+from typing import Any, Optional, TypeVar, Union
+
+import numpy as np
+import numpy.typing as npt
+
+Bins = Union[int, Sequence[float]]
+K = TypeVar("K", bound=str)
+# the data of a chart: a mapping of labels to values, or array-like values
+ChartData = Union[Mapping[K, float], npt.ArrayLike]
+
+
+def top_n_items(
+    data: Mapping[K, float], n: int, other_label: str = "Other"
+) -> list[tuple[str, float]]:
+    """
+    Selects the `n` largest data points and aggregates the rest into a single item.
+
+    The cost is O(len(data) * log(n)).
+
+    :param data: The data as a mapping of labels to values.
+    :param n: The number of data points to keep.
+    :param other_label: The label of the item with the sum of the remaining values.
+    :return: The largest data points sorted by value (descending), followed by the aggregated item, if any.
+    """
+    if n <= 0:
+        raise ValueError("top_n must be positive")
+    top: list[tuple[str, float]] = heapq.nlargest(n, data.items(), key=itemgetter(1))
+    if len(data) <= n:
+        return top
+    rest = math.fsum(data.values()) - math.fsum(value for _, value in top)
+    return [*top, (other_label, rest)]
+
+
+def bin_items(data: Mapping[K, float], bins: Bins) -> list[tuple[str, float]]:
+    """
+    Counts the data points falling into each bin of values.
+
+    :param data: The data as a mapping of labels to values.
+    :param bins: The number of equal-width bins spanning the range of values, or the sorted bin edges. Values outside the edges are ignored.
+    :return: The bins labeled with their range, in ascending order, with the count of data points in each bin.
+    """
+    if not data:
+        return []
+    if isinstance(bins, int):
+        low = high = next(iter(data.values()))
+        for value in data.values():
+            if value < low:
+                low = value
+            elif value > high:
+                high = value
+        edges = _bin_edges(bins, low, high)
+    else:
+        edges = _bin_edges(bins)
+
+    counts = [0] * (len(edges) - 1)
+    last = len(counts) - 1
+    for value in data.values():
+        if value < edges[0] or value > edges[-1]:
+            continue
+        counts[min(bisect_right(edges, value) - 1, last)] += 1
+
+    return _bin_labels(edges, counts)
+
+
+def _bin_edges(bins: Bins, low: float = 0, high: float = 0) -> list[float]:
+    if isinstance(bins, int):
+        if bins <= 0:
+            raise ValueError("bins must be positive")
+        if low == high:
+            # unit-width bins starting at the only value, the last edge is not the maximum
+            return [low + idx for idx in range(bins + 1)]
+        step = (high - low) / bins
+        return [low + idx * step for idx in range(bins)] + [high]
+    edges = list(bins)
+    if len(edges) < 2 or edges != sorted(edges):
+        raise ValueError("bin edges must be sorted and contain at least 2 values")
+    return edges
+
+
+def _bin_labels(edges: Sequence[float], counts: list[int]) -> list[tuple[str, float]]:
+    return [
+        (f"{edges[idx]:g}-{edges[idx + 1]:g}", count)
+        for idx, count in enumerate(counts)
+    ]
+
+
+def aggregate_items(
+    data: Mapping[K, float],
+    top_n: Optional[int] = None,
+    other_label: str = "Other",
+    bins: Optional[Bins] = None,
+) -> list[tuple[str, float]]:
+    """
+    Applies the binning and then the top-N selection to the data, if requested.
+
+    :param data: The data as a mapping of labels to values.
+    :param top_n: The number of data points to keep, see `top_n_items`.
+    :param other_label: The label of the item aggregating the data points not in the top N.
+    :param bins: The bins to count the values in, see `bin_items`.
+    :return: The aggregated data points.
+    """
+    if bins is not None:
+        binned = bin_items(data, bins)
+        return (
+            binned if top_n is None else top_n_items(dict(binned), top_n, other_label)
+        )
+    if top_n is not None:
+        return top_n_items(data, top_n, other_label)
+    return list(data.items())
+
+
+def as_values(data: npt.ArrayLike) -> npt.NDArray[Any]:
+    """
+    Converts array-like chart data to a one-dimensional numeric array, without copying it when possible.
+
+    :param data: A NumPy array, pandas Series, Arrow array or any object supporting the buffer protocol.
+    :return: The values as an array.
+    :raises ValueError: When the data is not a one-dimensional array of numbers.
+    """
+    values = np.asarray(data)
+    if values.ndim != 1 or values.dtype.kind not in "biuf":
+        raise ValueError("Chart data must be a one-dimensional array of numbers")
+    return values
+
+
+def aggregate_array(
+    data: npt.ArrayLike,
+    labels: Optional[Sequence[str]] = None,
+    top_n: Optional[int] = None,
+    other_label: str = "Other",
+    bins: Optional[Bins] = None,
+) -> list[tuple[str, float]]:
+    """
+    Applies the binning and then the top-N selection to array-like data, like `aggregate_items`.
+    The reductions are vectorized, and the labels are only read for the returned items. NaN values are ignored.
+
+    :param data: The values, see `as_values`.
+    :param labels: The labels of the values, indexed by position (e.g. a list, a NumPy array or a pandas Index). By default, the values are labeled by their position.
+    :param top_n: The number of data points to keep, see `top_n_items`.
+    :param other_label: The label of the item aggregating the data points not in the top N.
+    :param bins: The bins to count the values in, see `bin_items`.
+    :return: The aggregated data points, or all data points in their order when no aggregation is requested.
+    """
+    values = as_values(data)
+    if labels is not None and len(labels) != len(values):
+        raise ValueError("The number of labels must match the number of values")
+    positions: Optional[npt.NDArray[np.intp]] = None
+    if values.dtype.kind == "f":
+        valid = ~np.isnan(values)
+        if not valid.all():
+            positions = np.flatnonzero(valid)
+            values = values[positions]
+
+    def label(index: int) -> str:
+        position = index if positions is None else int(positions[index])
+        return str(position) if labels is None else str(labels[position])
+
+    if bins is not None:
+        binned = _bin_array(values, bins)
+        return (
+            binned if top_n is None else top_n_items(dict(binned), top_n, other_label)
+        )
+    if top_n is None:
+        return [(label(idx), value) for idx, value in enumerate(values.tolist())]
+    if top_n <= 0:
+        raise ValueError("top_n must be positive")
+
+    top = _top_n_indices(values, top_n)
+    items = [(label(int(idx)), values[idx].item()) for idx in top]
+    if len(values) <= top_n:
+        return items
+    rest = (values.sum() - values[top].sum()).item()
+    return [*items, (other_label, rest)]
+
+
+def _top_n_indices(values: npt.NDArray[Any], n: int) -> npt.NDArray[np.intp]:
+    # the indices of the n largest values by value (descending), the first ones on ties
+    if n < len(values):
+        kth = np.partition(values, len(values) - n)[len(values) - n]
+        above = np.flatnonzero(values > kth)
+        equal = np.flatnonzero(values == kth)[: n - len(above)]
+        candidates = np.sort(np.concatenate([above, equal]))
+    else:
+        candidates = np.arange(len(values))
+    keys = values[candidates]
+    if keys.dtype.kind in "bu":
+        # not negated in place, as unsigned values would wrap around
+        keys = keys.astype(np.int64)
+    return candidates[np.argsort(-keys, kind="stable")]
+
+
+def _bin_array(values: npt.NDArray[Any], bins: Bins) -> list[tuple[str, float]]:
+    if not len(values):
+        return []
+    if isinstance(bins, int):
+        edges = _bin_edges(bins, values.min().item(), values.max().item())
+    else:
+        edges = _bin_edges(bins)
+    inside = values[(values >= edges[0]) & (values <= edges[-1])]
+    indices = np.searchsorted(np.asarray(edges), inside, side="right") - 1
+    last = len(edges) - 2
+    counts = np.bincount(np.minimum(indices, last), minlength=last + 1)
+    return _bin_labels(edges, counts.tolist())
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    The statistics of a cache.
+
+    :ivar hits: The number of lookups of cached keys.
+    :ivar misses: The number of lookups of keys that were not cached.
+    :ivar size: The number of cached entries.
+    :ivar maxsize: The maximum number of cached entries.
+    """
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of the lookups of cached keys, or 0 if there were no lookups.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[_K, _V]):
+    """
+    A small bounded cache with least-recently-used eviction.
+
+    :param maxsize: The maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[_K, _V] = OrderedDict()
+
+    def get(self, key: _K) -> Optional[_V]:
+        """
+        Returns the cached value for the key, or None if the key is not cached.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: _K, value: _V) -> None:
+        """
+        Stores the value, evicting the least recently used entry if the cache is full.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self) -> CacheStats:
+        """
+        Returns the hit and miss counts and the size of the cache.
+        """
+        return CacheStats(self.hits, self.misses, len(self._data), self.maxsize)
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the statistics.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
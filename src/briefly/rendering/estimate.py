@@ -0,0 +1,85 @@
+"""
+Estimation of the size of a generated document, without producing the output.
+
+The constants are calibrated on reports generated with the bundled Inter fonts, with
+compressed content streams.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+_DOCUMENT_OVERHEAD: int = 1_500
+_PAGE_OVERHEAD: int = 1_000
+_LINK_OVERHEAD: int = 75
+_CONTENT_COMPRESSION_RATIO: float = 0.16
+_FONT_OVERHEAD: int = 2_000
+_FONT_BYTES_PER_GLYPH: int = 150
+_CHART_IMAGE_OVERHEAD: int = 2_000
+_CHART_IMAGE_BYTES_PER_SLICE: int = 200
+
+# average size of the uncompressed drawing operators of the elements skipped in the
+# dry-run mode
+ELEMENT_CONTENT_BYTES: Mapping[str, int] = {
+    "summary_card": 260,
+    "summary_card_line": 82,
+    "table_cell": 145,
+    "tag": 320,
+    "task_card": 1235,
+    "bar_plot": 150,
+    "bar": 284,
+    "legend_label": 294,
+    "progress_bar": 730,
+    "gauge": 640,
+    "donut_slice": 160,
+}
+
+
+@dataclass(frozen=True)
+class LayoutEstimate:
+    """
+    The estimated properties of a laid out document.
+
+    :ivar pages: The number of pages.
+    :ivar elements: The number of rendered elements, keyed by the element type (e.g. "task_card").
+    :ivar content_bytes: The size of the uncompressed page content streams.
+    :ivar estimated_size: The estimated size of the output file, in bytes.
+    """
+
+    pages: int
+    elements: Mapping[str, int]
+    content_bytes: int
+    estimated_size: int
+
+
+def estimate_output_size(
+    pages: int,
+    content_bytes: int,
+    font_glyphs: Iterable[int],
+    chart_slices: Iterable[int],
+    links: int,
+) -> int:
+    """
+    Estimates the size of the output file.
+
+    :param pages: The number of pages.
+    :param content_bytes: The size of the uncompressed page content streams.
+    :param font_glyphs: The number of used glyphs of each embedded font.
+    :param chart_slices: The number of slices of each distinct chart image.
+    :param links: The number of link annotations.
+    :return: The estimated size in bytes.
+    """
+    fonts = sum(
+        _FONT_OVERHEAD + glyphs * _FONT_BYTES_PER_GLYPH for glyphs in font_glyphs
+    )
+    images = sum(
+        _CHART_IMAGE_OVERHEAD + slices * _CHART_IMAGE_BYTES_PER_SLICE
+        for slices in chart_slices
+    )
+    return int(
+        _DOCUMENT_OVERHEAD
+        + pages * _PAGE_OVERHEAD
+        + content_bytes * _CONTENT_COMPRESSION_RATIO
+        + fonts
+        + images
+        + links * _LINK_OVERHEAD
+    )
@@ -0,0 +1,154 @@
+"""
+Precomputed advance widths of the bundled fonts, in 1/1000 em, rounded the same way as
+fpdf does.
+
+Generated by scripts/generate_font_metrics.py, do not edit.
+"""
+
+from collections.abc import Mapping
+
+# advance widths of the code points 0 to PRECOMPUTED_CODEPOINTS - 1, by font style
+PRECOMPUTED_CODEPOINTS: int = 0x250
+
+# fmt: off
+ADVANCE_WIDTHS: Mapping[str, tuple[int, ...]] = {
+    # Inter-Regular.ttf
+    "": (
+        260, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 264, 250, 431, 615, 626, 905, 624, 274, 328, 328,
+        483, 643, 250, 442, 250, 341, 621, 382, 583, 607, 630, 584, 600, 538,
+        598, 600, 250, 258, 643, 643, 643, 518, 970, 669, 646, 726, 704, 589,
+        570, 737, 724, 249, 551, 651, 549, 878, 729, 756, 624, 756, 637, 626,
+        626, 721, 669, 965, 662, 659, 620, 328, 341, 328, 453, 455, 277, 537,
+        586, 544, 586, 557, 334, 587, 566, 222, 222, 526, 222, 855, 566, 571,
+        586, 586, 346, 498, 318, 566, 534, 781, 524, 534, 511, 403, 312, 403,
+        643, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 264, 253, 544, 595, 706, 531, 250, 551,
+        566, 896, 436, 549, 643, 656, 646, 438, 438, 643, 411, 421, 277, 567,
+        580, 250, 250, 280, 462, 549, 759, 796, 839, 518, 669, 669, 669, 669,
+        669, 669, 979, 726, 589, 589, 589, 589, 249, 249, 249, 249, 729, 729,
+        756, 756, 756, 756, 756, 643, 756, 721, 721, 721, 721, 659, 616, 594,
+        537, 537, 537, 537, 537, 537, 892, 544, 557, 557, 557, 557, 222, 222,
+        222, 222, 563, 566, 571, 571, 571, 571, 571, 643, 571, 566, 566, 566,
+        566, 534, 586, 534, 669, 537, 669, 537, 669, 537, 726, 544, 726, 544,
+        726, 544, 726, 544, 704, 684, 729, 586, 589, 557, 589, 557, 589, 557,
+        589, 557, 589, 557, 737, 587, 737, 587, 737, 587, 737, 587, 724, 566,
+        750, 566, 249, 222, 249, 222, 249, 222, 249, 222, 249, 222, 799, 444,
+        551, 222, 651, 526, 504, 549, 222, 549, 222, 549, 320, 545, 342, 578,
+        222, 729, 566, 729, 566, 729, 566, 656, 729, 566, 756, 571, 756, 571,
+        756, 571, 996, 962, 637, 346, 637, 346, 637, 346, 626, 498, 626, 498,
+        626, 498, 626, 498, 626, 318, 626, 367, 626, 318, 721, 566, 721, 566,
+        721, 566, 721, 566, 721, 566, 721, 566, 965, 781, 659, 534, 659, 620,
+        511, 620, 511, 620, 511, 278, 586, 782, 637, 586, 757, 657, 726, 726,
+        603, 729, 840, 615, 586, 524, 589, 737, 607, 570, 371, 737, 616, 929,
+        250, 322, 657, 526, 222, 606, 888, 729, 566, 756, 755, 570, 850, 617,
+        760, 586, 706, 626, 498, 613, 526, 318, 621, 308, 626, 720, 606, 746,
+        615, 692, 667, 620, 511, 660, 660, 608, 523, 583, 613, 524, 524, 615,
+        249, 341, 222, 250, 656, 1215, 1098, 1099, 771, 444, 1280, 951, 789, 669,
+        537, 249, 222, 756, 571, 721, 566, 721, 566, 721, 566, 721, 566, 721,
+        566, 557, 669, 537, 669, 537, 979, 892, 737, 653, 737, 587, 651, 526,
+        756, 571, 756, 571, 660, 604, 222, 1324, 1215, 1098, 737, 587, 1073, 616,
+        729, 566, 669, 537, 979, 892, 756, 571, 669, 537, 669, 537, 589, 557,
+        589, 557, 249, 222, 249, 222, 756, 571, 756, 571, 637, 346, 637, 346,
+        721, 566, 721, 566, 626, 498, 626, 318, 615, 524, 724, 566, 614, 743,
+        614, 614, 620, 511, 669, 537, 589, 557, 756, 571, 756, 571, 756, 571,
+        756, 571, 659, 534, 378, 723, 399, 222, 886, 886, 669, 726, 544, 573,
+        626, 498, 511, 524, 524, 653, 724, 706, 589, 557, 587, 222, 756, 587,
+        630, 346, 650, 534,
+    ),
+    # Inter-Bold.ttf
+    "B": (
+        376, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 219, 267, 490, 630, 653, 955, 652, 286, 342, 342,
+        541, 660, 264, 450, 264, 369, 655, 399, 605, 625, 661, 605, 625, 557,
+        623, 625, 264, 268, 660, 660, 660, 565, 1009, 721, 648, 729, 706, 608,
+        583, 739, 725, 264, 567, 693, 559, 902, 733, 752, 635, 754, 652, 653,
+        643, 710, 715, 1006, 707, 699, 641, 342, 369, 342, 468, 476, 311, 559,
+        605, 563, 605, 569, 377, 605, 594, 251, 251, 557, 251, 890, 594, 588,
+        605, 605, 380, 529, 368, 594, 564, 825, 546, 564, 534, 446, 352, 446,
+        660, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 219, 269, 563, 617, 743, 552, 319, 545,
+        594, 896, 448, 627, 660, 656, 643, 400, 441, 660, 411, 422, 311, 604,
+        578, 264, 346, 283, 471, 627, 802, 834, 887, 565, 721, 721, 721, 721,
+        721, 721, 1018, 729, 608, 608, 608, 608, 264, 264, 264, 264, 751, 733,
+        752, 752, 752, 752, 752, 660, 752, 710, 710, 710, 710, 699, 649, 637,
+        559, 559, 559, 559, 559, 559, 890, 563, 569, 569, 569, 569, 251, 251,
+        251, 251, 580, 594, 588, 588, 588, 588, 588, 660, 588, 594, 594, 594,
+        594, 564, 605, 564, 721, 559, 721, 559, 721, 559, 729, 563, 729, 563,
+        729, 563, 729, 563, 706, 729, 751, 605, 608, 569, 608, 569, 608, 569,
+        608, 569, 608, 569, 739, 605, 739, 605, 739, 605, 739, 605, 725, 594,
+        784, 594, 264, 251, 264, 251, 264, 251, 264, 251, 264, 251, 831, 503,
+        567, 251, 693, 557, 563, 559, 251, 559, 251, 559, 375, 560, 425, 599,
+        251, 733, 594, 733, 594, 733, 594, 656, 733, 594, 752, 588, 752, 588,
+        752, 588, 1025, 954, 652, 380, 652, 380, 652, 380, 653, 529, 653, 529,
+        653, 529, 653, 529, 643, 368, 643, 443, 643, 368, 710, 594, 710, 594,
+        710, 594, 710, 594, 710, 594, 710, 594, 1006, 825, 699, 564, 699, 641,
+        534, 641, 534, 641, 534, 310, 605, 838, 636, 605, 803, 687, 729, 729,
+        650, 751, 895, 649, 605, 626, 608, 737, 625, 583, 444, 739, 716, 960,
+        281, 347, 706, 557, 251, 616, 931, 733, 594, 752, 754, 587, 910, 715,
+        825, 605, 741, 653, 529, 646, 624, 368, 695, 360, 643, 710, 649, 760,
+        647, 764, 699, 641, 534, 666, 666, 625, 555, 605, 638, 626, 555, 652,
+        279, 373, 251, 267, 656, 1240, 1139, 1125, 811, 503, 1300, 985, 845, 721,
+        559, 264, 251, 752, 588, 710, 594, 710, 594, 710, 594, 710, 594, 710,
+        594, 569, 721, 559, 721, 559, 1018, 890, 739, 666, 739, 605, 693, 557,
+        752, 588, 752, 588, 666, 621, 251, 1347, 1240, 1139, 739, 605, 1076, 720,
+        733, 594, 721, 559, 1018, 890, 752, 588, 721, 559, 721, 559, 608, 569,
+        608, 569, 264, 251, 264, 251, 752, 588, 752, 588, 652, 380, 652, 380,
+        710, 594, 710, 594, 653, 529, 643, 368, 649, 555, 725, 594, 650, 761,
+        649, 648, 641, 534, 721, 559, 608, 569, 752, 588, 752, 588, 752, 588,
+        752, 588, 699, 564, 408, 750, 469, 251, 930, 930, 721, 729, 563, 604,
+        643, 529, 534, 555, 555, 670, 740, 741, 608, 569, 609, 251, 757, 604,
+        655, 380, 703, 569,
+    ),
+    # Inter-Italic.ttf
+    "I": (
+        260, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 264, 250, 431, 615, 626, 905, 668, 274, 328, 328,
+        483, 644, 250, 443, 250, 341, 621, 382, 582, 607, 631, 583, 600, 539,
+        598, 600, 250, 257, 644, 644, 644, 518, 970, 669, 646, 726, 704, 588,
+        570, 737, 724, 249, 551, 651, 549, 878, 729, 756, 624, 756, 637, 626,
+        626, 721, 669, 965, 662, 659, 610, 328, 340, 328, 453, 455, 277, 587,
+        586, 544, 586, 549, 336, 586, 567, 223, 222, 526, 222, 855, 566, 571,
+        586, 586, 347, 499, 319, 567, 534, 781, 524, 534, 511, 404, 312, 403,
+        644, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656, 656,
+        656, 656, 656, 656, 656, 656, 264, 253, 544, 595, 706, 532, 250, 550,
+        566, 898, 436, 549, 644, 656, 646, 438, 438, 644, 411, 421, 204, 568,
+        580, 250, 250, 281, 462, 550, 754, 795, 833, 489, 669, 669, 669, 669,
+        669, 669, 962, 726, 588, 588, 588, 588, 249, 249, 249, 249, 729, 729,
+        756, 756, 756, 756, 756, 644, 756, 721, 721, 721, 721, 659, 616, 594,
+        587, 587, 587, 587, 587, 587, 881, 544, 549, 549, 549, 549, 223, 223,
+        223, 223, 563, 566, 571, 571, 571, 571, 571, 644, 571, 567, 567, 567,
+        567, 534, 586, 534, 669, 587, 669, 587, 669, 587, 726, 544, 726, 544,
+        726, 544, 726, 544, 704, 668, 729, 586, 588, 549, 588, 549, 588, 549,
+        588, 549, 588, 549, 737, 586, 737, 586, 737, 586, 737, 586, 724, 567,
+        751, 567, 249, 223, 249, 223, 249, 223, 249, 223, 249, 223, 800, 445,
+        551, 222, 651, 526, 504, 549, 222, 549, 222, 549, 287, 545, 342, 549,
+        222, 729, 566, 729, 566, 729, 566, 656, 729, 566, 756, 571, 756, 571,
+        756, 571, 972, 959, 637, 347, 637, 347, 637, 347, 626, 499, 626, 499,
+        626, 499, 626, 499, 626, 319, 626, 319, 626, 319, 721, 567, 721, 567,
+        721, 567, 721, 567, 721, 567, 721, 567, 965, 781, 659, 534, 659, 610,
+        511, 610, 511, 610, 511, 278, 586, 782, 637, 586, 756, 657, 726, 726,
+        544, 729, 840, 615, 586, 524, 588, 737, 606, 570, 371, 737, 616, 932,
+        250, 323, 657, 526, 222, 615, 888, 729, 567, 756, 755, 570, 851, 617,
+        761, 586, 706, 626, 498, 613, 525, 319, 621, 332, 626, 720, 606, 746,
+        615, 692, 667, 610, 511, 660, 660, 608, 524, 582, 613, 524, 524, 615,
+        249, 341, 222, 250, 656, 1215, 1028, 1100, 771, 444, 1281, 952, 789, 669,
+        587, 249, 223, 756, 571, 721, 567, 721, 567, 721, 567, 721, 567, 721,
+        567, 549, 669, 587, 669, 587, 962, 881, 737, 586, 737, 586, 651, 526,
+        756, 571, 756, 571, 660, 604, 222, 1313, 1215, 1028, 737, 586, 1073, 615,
+        729, 566, 669, 587, 962, 881, 756, 571, 669, 587, 669, 587, 588, 549,
+        588, 549, 249, 223, 249, 223, 756, 571, 756, 571, 637, 347, 637, 347,
+        721, 567, 721, 567, 626, 499, 626, 319, 615, 523, 724, 567, 614, 743,
+        614, 614, 610, 511, 669, 587, 588, 549, 756, 571, 756, 571, 756, 571,
+        756, 571, 659, 534, 378, 723, 400, 222, 886, 886, 669, 726, 544, 573,
+        626, 505, 511, 524, 524, 646, 724, 706, 588, 549, 588, 220, 756, 587,
+        625, 347, 650, 536,
+    ),
+}
+# fmt: on
@@ -1,46 +1,196 @@
+from collections.abc import Sequence
 from io import BytesIO
-from typing import Optional
+from typing import Optional, Protocol
 
-from matplotlib import pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 
 from briefly.style import Color
 
-NOTION_CHART_COLORS = [
+NOTION_CHART_COLORS: tuple[Color, ...] = (
     (155, 207, 87),  # green
     (246, 199, 68),  # yellow
     (108, 155, 245),  # blue
     (221, 148, 255),  # purple
     (255, 170, 153),  # coral
     (181, 181, 181),  # gray
-]
+)
+
+# the resolution of the charts at their printed size, sufficient for the flat slices
+CHART_DPI: float = 150
+# the smallest side of a chart image in pixels, keeping the edges of tiny charts smooth
+_MIN_CHART_PIXELS: int = 160
+# the palette entries per slice color, for the anti-aliased edges
+_PALETTE_LEVELS: int = 8
+# the radius of the pie relative to the size of the image, as drawn by matplotlib
+_PIE_RADIUS: float = 0.4
+
+
+def chart_dpi(size: float) -> float:
+    """
+    Returns the lowest resolution sufficient for a chart printed at the provided size.
+
+    :param size: The printed size of the chart in mm.
+    :return: The resolution in dots per inch.
+    """
+    return max(CHART_DPI, _MIN_CHART_PIXELS * 25.4 / size)
+
+
+class ChartBackend(Protocol):
+    """
+    Rasterizes the pie charts, see `build_pie_chart_bytes`.
+
+    :ivar name: The name of the backend, identifying its output in the reproducible reports.
+    """
+
+    name: str
+
+    def pie_chart(
+        self, values: Sequence[float], size: float, colors: Sequence[Color], dpi: float
+    ) -> Image.Image:
+        """
+        Draws the slices clockwise from the top, on a transparent square image.
+        The pie has 80% of the width of the image, like the pie charts of matplotlib.
+
+        :param values: The non-negative values of the slices, with a positive sum.
+        :param size: The size of the image in mm.
+        :param colors: The colors of the slices, repeated if there are more slices.
+        :param dpi: The resolution of the image.
+        :return: The RGBA image.
+        """
+        ...
+
+
+class MatplotlibBackend:
+    """
+    Draws the pie charts with matplotlib, on its own figure without the global state of pyplot, so charts can be built in parallel threads.
+    """
+
+    name = "matplotlib"
+
+    def pie_chart(
+        self, values: Sequence[float], size: float, colors: Sequence[Color], dpi: float
+    ) -> Image.Image:
+        size_inch = size / 25.4
+        fig = Figure(figsize=(size_inch, size_inch))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        graph_colors = [(r / 255, g / 255, b / 255) for r, g, b in colors]
+        ax.pie(values, colors=graph_colors, startangle=90, counterclock=False)
+
+        buf = BytesIO()
+        fig.tight_layout(pad=0)
+        fig.savefig(buf, format="png", dpi=dpi, transparent=True)
+        buf.seek(0)
+        image = Image.open(buf)
+        image.load()
+        return image
+
+
+class RasterBackend:
+    """
+    Draws the pie charts directly into a NumPy pixel buffer, without the figure, axes and layout of matplotlib.
+    The edges are anti-aliased with the coverage of each pixel, estimated from the distance of its center to the edge.
+    """
+
+    name = "raster"
+
+    def pie_chart(
+        self, values: Sequence[float], size: float, colors: Sequence[Color], dpi: float
+    ) -> Image.Image:
+        # the same image size as matplotlib, which truncates the size in pixels
+        pixels = int(size / 25.4 * dpi)
+        # the positions of the pixel centers, from the center of the image
+        offsets = np.arange(pixels, dtype=np.float32) + 0.5 - pixels / 2
+        radius = _PIE_RADIUS * pixels
+        distance = np.hypot(offsets[np.newaxis, :], offsets[:, np.newaxis])
+        alpha = np.clip(radius - distance + 0.5, 0, 1)
+        # only the pixels covered by the pie are colored
+        rows, columns = np.nonzero(alpha)
+        dx, dy, distance = offsets[columns], offsets[rows], distance[rows, columns]
+
+        # the empty slices have no area and no edges
+        shown = [idx for idx, value in enumerate(values) if value > 0]
+        palette = np.array(
+            [colors[idx % len(colors)] for idx in shown], dtype=np.float32
+        )
+        ends = np.cumsum([values[idx] for idx in shown]) / sum(values) * 360
+        starts = np.concatenate(([0.0], ends[:-1]))
+        # the angle clockwise from the top, with the y axis of the image pointing down
+        angles = np.degrees(np.arctan2(dx, -dy)) % 360
+        slices = np.minimum(np.searchsorted(ends, angles, side="right"), len(shown) - 1)
+        rgb = palette[slices]
+        if len(shown) > 1:
+            # blends the pixels along the nearest edge with the adjacent slice
+            to_start = _edge_distance(angles - starts[slices], distance)
+            to_end = _edge_distance(ends[slices] - angles, distance)
+            adjacent = np.where(
+                to_start < to_end, slices - 1, (slices + 1) % len(shown)
+            )
+            weight = np.clip(np.minimum(to_start, to_end) + 0.5, 0, 1)[:, np.newaxis]
+            rgb = weight * rgb + (1 - weight) * palette[adjacent]
+
+        image = np.zeros((pixels, pixels, 4), dtype=np.uint8)
+        image[rows, columns, :3] = np.rint(rgb)
+        image[..., 3] = np.rint(alpha * 255)
+        return Image.fromarray(image, "RGBA")
+
+
+def _edge_distance(angle: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    # the distance to the radius at the angle, or to the center beyond a right angle
+    result: np.ndarray = distance * np.sin(np.radians(np.clip(angle, 0, 90)))
+    return result
+
+
+DEFAULT_CHART_BACKEND: ChartBackend = MatplotlibBackend()
 
 
 def build_pie_chart_bytes(
     values: list[float],
     size: float = 35,
-    colors: Optional[list[Color]] = None,
+    colors: Optional[Sequence[Color]] = None,
+    dpi: Optional[float] = None,
+    palette: bool = True,
+    backend: Optional[ChartBackend] = None,
 ) -> Optional[BytesIO]:
     """
     Return a PNG image as bytes for a pie chart.
     :param values: The values to plot
     :param size: The size of the chart in mm
     :param colors: Optional list of colors to use for each value
+    :param dpi: The resolution of the image. By default, the lowest resolution sufficient for the size, see `chart_dpi`.
+    :param palette: Whether the image is quantized to an indexed palette of the slice colors (with transparency), instead of a full RGBA image.
+    :param backend: The rasterizer of the chart. By default, matplotlib is used, see `DEFAULT_CHART_BACKEND`.
     :return: the bytes of the chart or None if there are no values
+    :raises ValueError: When a value is negative.
     """
 
-    size_inch = size / 25.4
-
     if sum(values) == 0:
         return None
+    if any(value < 0 for value in values):
+        raise ValueError("The values of a pie chart must not be negative")
 
-    fig, ax = plt.subplots(figsize=(size_inch, size_inch))
-    colors = colors or NOTION_CHART_COLORS
-    graph_colors = [(r / 255, g / 255, b / 255) for r, g, b in colors[: len(values)]]
-    ax.pie(values, colors=graph_colors, startangle=90, counterclock=False)
-
+    graph_colors = list((colors or NOTION_CHART_COLORS)[: len(values)])
+    image = (backend or DEFAULT_CHART_BACKEND).pie_chart(
+        values, size, graph_colors, dpi or chart_dpi(size)
+    )
+    if palette:
+        return _quantize(image, len(graph_colors))
     buf = BytesIO()
-    plt.tight_layout(pad=0)
-    plt.savefig(buf, format="png", dpi=200, transparent=True)
-    plt.close(fig)
+    image.save(buf, format="png")
     buf.seek(0)
     return buf
+
+
+def _quantize(image: Image.Image, color_count: int) -> BytesIO:
+    # the slices are flat, so a few levels per color cover the blended edges
+    indexed = image.quantize(
+        colors=min(256, (color_count + 1) * _PALETTE_LEVELS),
+        method=Image.Quantize.FASTOCTREE,
+    )
+    out = BytesIO()
+    indexed.save(out, format="png", optimize=True)
+    out.seek(0)
+    return out
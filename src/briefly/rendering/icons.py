@@ -1,7 +1,123 @@
-# https://fonts.google.com/icons
+"""
+The icons of the reports, drawn as vector paths.
 
-PRIORITY_ICON = "\uf16a"  # fire
+The outlines are taken from Material Icons (https://fonts.google.com/icons, Apache
+License 2.0), on a 24x24 grid with the y axis pointing down, like in SVG.
+"""
 
-DUE_DATE_ICON = "\uf540"  # calendar with clock
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cache
 
-FLAG_ICON = "\ue153"  # flag
+ICON_GRID: float = 24
+
+_PATH_TOKEN = re.compile(r"[MmLlHhVvCcSsZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_ARGUMENT_COUNTS: Mapping[str, int] = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4}
+
+
+@dataclass(frozen=True)
+class Icon:
+    """
+    A single-color icon.
+
+    :ivar name: The name of the icon.
+    :ivar path: The outline of the icon as SVG path data. The supported commands are M, L, H, V, C, S and Z (absolute and relative).
+    """
+
+    name: str
+    path: str
+
+
+PRIORITY_ICON = Icon(
+    "whatshot",
+    "M13.5.67s.74 2.65.74 4.8c0 2.06-1.35 3.73-3.41 3.73-2.07 0-3.63-1.67-3.63-3.73"
+    "l.03-.36C5.21 7.51 4 10.62 4 14c0 4.42 3.58 8 8 8s8-3.58 8-8C20 8.61 17.41 3.8"
+    " 13.5.67zM11.71 19c-1.78 0-3.22-1.4-3.22-3.14 0-1.62 1.05-2.76 2.81-3.12 1.77-.36"
+    " 3.6-1.21 4.62-2.58.39 1.29.59 2.65.59 4.04 0 2.65-2.15 4.8-4.8 4.8z",
+)
+
+DUE_DATE_ICON = Icon(
+    "event",
+    "M17 12h-5v5h5v-5zM16 1v2H8V1H6v2H5c-1.11 0-1.99.9-1.99 2L3 19c0 1.1.89 2 2 2h14"
+    "c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2h-1V1h-2zm3 18H5V8h14v11z",
+)
+
+FLAG_ICON = Icon("flag", "M14.4 6L14 4H5v17h2v-7h5.6l.4 2h7V6z")
+
+
+@cache
+def compile_icon(icon: Icon) -> str:
+    """
+    Converts the outline of the icon to PDF path operators, filling the path with the current fill color.
+    The coordinates are in the units of the icon grid, with the y axis pointing up.
+
+    :param icon: The icon to convert.
+    :return: The content stream drawing the icon.
+    :raises ValueError: When the path data is malformed or uses an unsupported command.
+    """
+    tokens = _PATH_TOKEN.findall(icon.path)
+    operators: list[str] = []
+    x = y = start_x = start_y = 0.0
+    # the second control point of the last curve, reflected by the S command
+    control: tuple[float, float] | None = None
+    command = ""
+    idx = 0
+
+    def point(px: float, py: float) -> str:
+        return f"{px:.2f} {ICON_GRID - py:.2f}"
+
+    while idx < len(tokens):
+        if tokens[idx].isalpha():
+            command = tokens[idx]
+            idx += 1
+            if command in "Zz":
+                operators.append("h")
+                x, y = start_x, start_y
+                control = None
+                continue
+        if not command or command in "Zz":
+            raise ValueError(f"Missing path command in the icon '{icon.name}'")
+
+        kind = command.upper()
+        count = _ARGUMENT_COUNTS[kind]
+        arguments = tokens[idx : idx + count]
+        if len(arguments) < count or any(token.isalpha() for token in arguments):
+            raise ValueError(
+                f"Invalid arguments of '{command}' in the icon '{icon.name}'"
+            )
+        values = [float(token) for token in arguments]
+        idx += count
+        dx, dy = (x, y) if command.islower() else (0.0, 0.0)
+
+        if kind == "M":
+            x, y = values[0] + dx, values[1] + dy
+            start_x, start_y = x, y
+            operators.append(f"{point(x, y)} m")
+            # the following coordinate pairs are implicit line commands
+            command = "l" if command.islower() else "L"
+        elif kind in "LHV":
+            if kind == "L":
+                x, y = values[0] + dx, values[1] + dy
+            elif kind == "H":
+                x = values[0] + dx
+            else:
+                y = values[0] + dy
+            operators.append(f"{point(x, y)} l")
+        else:
+            if kind == "C":
+                x1, y1 = values[0] + dx, values[1] + dy
+                values = values[2:]
+            elif control is None:
+                x1, y1 = x, y
+            else:
+                x1, y1 = 2 * x - control[0], 2 * y - control[1]
+            x2, y2 = values[0] + dx, values[1] + dy
+            x, y = values[2] + dx, values[3] + dy
+            operators.append(f"{point(x1, y1)} {point(x2, y2)} {point(x, y)} c")
+            control = (x2, y2)
+            continue
+        control = None
+
+    operators.append("f")
+    return "\n".join(operators)
@@ -0,0 +1,285 @@
+"""
+Rendering of a subset of the pages of a report on demand, e.g. a preview of the first page.
+
+The report is laid out once in the dry-run mode, recording the calls of the element methods
+with the position of the caret (and the font and colors) before each call. A subset of the
+pages is rendered by replaying only the calls drawing on them, starting from the recorded
+position, so the cost of a preview does not depend on the length of the report. The footers
+show the page numbers of the whole report.
+"""
+
+import bisect
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.pool import PDFPool
+from briefly.rendering.snapshot import PageSnapshot, snapshot_page, stamp
+from briefly.style import PURPLE_HAZE, Style
+
+# the calls that draw nothing on the page they end on
+_PAGE_BREAKS = frozenset({"add_page", "table_of_contents"})
+
+
+@dataclass(frozen=True)
+class _State:
+    """
+    The state of the report before an element call.
+
+    :ivar page: The current page, 0 before the first page is added.
+    :ivar x: The horizontal position of the caret.
+    :ivar y: The vertical position of the caret.
+    :ivar font: The font family, style and size in points.
+    :ivar colors: The text, fill and draw colors, as device colors.
+    :ivar line_width: The line width.
+    :ivar last_height: The height of the last cell, used by `ln`.
+    """
+
+    page: int
+    x: float
+    y: float
+    font: tuple[str, str, float]
+    colors: tuple[Any, Any, Any]
+    line_width: float
+    last_height: float
+
+
+@dataclass(frozen=True)
+class _Call:
+    name: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    state: _State
+
+
+def _state(report: PDF) -> _State:
+    doc: Any = report
+    return _State(
+        page=report.page,
+        x=report.x,
+        y=report.y,
+        font=(report.font_family, report.font_style, report.font_size_pt),
+        colors=(report.text_color, report.fill_color, report.draw_color),
+        line_width=report.line_width,
+        last_height=doc._lasth,
+    )
+
+
+def _restore(report: PDF, state: _State) -> None:
+    doc: Any = report
+    doc.set_font(*state.font)
+    text_color, fill_color, draw_color = state.colors
+    doc.set_text_color(text_color)
+    doc.set_fill_color(fill_color)
+    doc.set_draw_color(draw_color)
+    report.set_line_width(state.line_width)
+    report.set_xy(state.x, state.y)
+    doc._lasth = state.last_height
+
+
+class LazyReport:
+    """
+    A report laid out up front, whose pages are rendered on demand, e.g. to show the first page of a long report
+    as a preview before the whole report is rendered.
+
+    The report is built once in the dry-run mode, recording the calls of the element methods (e.g. `task_card`)
+    and where each of them starts. `render_pages` replays only the calls drawing on the requested pages.
+    The element arguments are kept for the rendering, the iterated rows of `styled_table` are stored as a list.
+
+    Content drawn with the `FPDF` methods directly is not rendered, but the changes of the caret position between
+    the element calls are kept. Internal links to pages that are not rendered point to the first rendered page.
+    The pages of a table of contents are only rendered with the whole report.
+
+    The pages are rendered by pre-initialized generators (see `PDFPool`), so that the fonts are not registered for each
+    request, and can be rendered from several threads at once.
+
+    :ivar page_count: The number of pages of the whole report.
+    :param build: The function building the report on the provided report, starting with `add_page`.
+    :param style: The style of the report.
+    :param kwargs: Additional arguments passed to the `PDF` constructor. By default, the rendered pages share the generation time.
+    :raises ValueError: In the dry-run mode.
+    """
+
+    def __init__(
+        self, build: Callable[[PDF], Any], style: Style = PURPLE_HAZE, **kwargs: Any
+    ) -> None:
+        if kwargs.pop("dry_run", False):
+            raise ValueError("Reports in the dry-run mode cannot be rendered lazily")
+        layout = _LayoutPDF(style, **kwargs)
+        kwargs["generation_time"] = layout.generation_time
+        build(layout)
+        self.page_count = layout.page
+        self._pool = _PagesPool(style, max_idle=2, **kwargs)
+        # the fonts are registered up front
+        self._pool.prewarm(1)
+        self._calls = layout.calls
+        # the states before each call, and after the last one
+        self._states = [call.state for call in layout.calls] + [_state(layout)]
+        self._pages = [state.page for state in self._states]
+        self._links = [layout.anchor_names.get(link) for link in sorted(layout.links)]
+        toc = layout.toc_placeholder
+        self._toc_pages = (
+            range(toc.start_page, toc.start_page + toc.pages) if toc else range(0)
+        )
+
+    def render_pages(self, pages: range) -> bytes:
+        """
+        Renders a subset of the pages as a standalone report.
+
+        :param pages: The numbers of the pages, e.g. `range(1, 2)` for the first page.
+        :return: The PDF document with the pages. Its footers show the page numbers of the whole report.
+        :raises ValueError: When a page does not exist, or is a page of the table of contents.
+        """
+        first, last = self._bounds(pages)
+        with self._pool.pdf() as pdf:
+            report = self._replay(pdf, first, last)
+            if pages.step == 1 and report.page_numbers.start == first:
+                return bytes(report.output())
+            snapshots = [_snapshot(report, number) for number in pages]
+        # the pages preceding the first page, drawn by a continued call, are not kept
+        with self._pool.pdf() as pdf:
+            report = _pages_pdf(pdf, pages)
+            for snapshot in snapshots:
+                stamp(report, snapshot)
+            return bytes(report.output())
+
+    def page_snapshots(self, pages: range) -> list[PageSnapshot]:
+        """
+        Renders the content of a subset of the pages, e.g. to stamp them into other reports (see `stamp`).
+
+        :param pages: The numbers of the pages.
+        :return: The snapshots of the pages, without the footers.
+        :raises ValueError: When a page does not exist, or is a page of the table of contents.
+        """
+        first, last = self._bounds(pages)
+        with self._pool.pdf() as pdf:
+            report = self._replay(pdf, first, last)
+            return [_snapshot(report, number) for number in pages]
+
+    def _bounds(self, pages: range) -> tuple[int, int]:
+        if not pages:
+            raise ValueError("At least one page is required")
+        first, last = min(pages), max(pages)
+        if first < 1 or last > self.page_count:
+            raise ValueError(
+                f"The report has pages 1 to {self.page_count}, requested {first} to {last}"
+            )
+        if any(number in self._toc_pages for number in range(first, last + 1)):
+            raise ValueError(
+                "The table of contents is only rendered with the whole report"
+            )
+        return first, last
+
+    def _start(self, first: int) -> int:
+        """
+        :return: The index of the first call drawing on the page, or of the state after the last call.
+        """
+        index = bisect.bisect_left(self._pages, first)
+        # a call continued from the previous pages, e.g. a long table
+        if (
+            index > 0
+            and self._pages[index - 1] < first
+            and self._calls[index - 1].name not in _PAGE_BREAKS
+        ):
+            index -= 1
+        return index
+
+    def _replay(self, pdf: PDF, first: int, last: int) -> "_PagesPDF":
+        start = self._start(first)
+        state = self._states[start]
+        report = _pages_pdf(pdf, range(max(state.page, 1), last + 1))
+        # the same link identifiers as in the layout
+        for name in self._links:
+            if name is None:
+                report.add_link(page=1)
+            else:
+                report.anchor_link(name)
+        if state.page:
+            report.add_page()
+            _restore(report, state)
+        try:
+            for call in self._calls[start:]:
+                if call.state.page > last:
+                    break
+                if report.page:
+                    report.set_xy(call.state.x, call.state.y)
+                getattr(report, call.name)(*call.args, **call.kwargs)
+        except _LastPageReached:
+            pass
+        return report
+
+
+def _pages_pdf(pdf: PDF, page_numbers: range) -> "_PagesPDF":
+    assert isinstance(pdf, _PagesPDF)
+    pdf.page_numbers = page_numbers
+    return pdf
+
+
+def _snapshot(report: "_PagesPDF", number: int) -> PageSnapshot:
+    return snapshot_page(report, report.page_numbers.index(number) + 1)
+
+
+class _PagesPool(PDFPool):
+    def _create(self) -> PDF:
+        return _PagesPDF(self.style, **self._kwargs)
+
+
+class _LastPageReached(Exception):
+    pass
+
+
+class _LayoutPDF(PDF):
+    """
+    The report laid out in the dry-run mode, recording the element calls.
+    """
+
+    def __init__(self, style: Style, **kwargs: Any) -> None:
+        super().__init__(style, dry_run=True, **kwargs)
+        self.calls: list[_Call] = []
+        self.anchor_names: dict[int, str] = {}
+
+    def _record_call(
+        self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> None:
+        self.calls.append(_Call(name, args, dict(kwargs), _state(self)))
+
+    def anchor_link(self, name: str) -> int:
+        link = super().anchor_link(name)
+        self.anchor_names[link] = name
+        return link
+
+    def styled_table(
+        self,
+        headers: list[str],
+        rows: Iterable[Sequence[str]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        # the rows are iterated again when the pages are rendered
+        super().styled_table(headers, list(rows), *args, **kwargs)
+
+
+class _PagesPDF(PDF):
+    """
+    A report with a subset of the pages of a `LazyReport`.
+
+    :ivar page_numbers: The numbers of the pages in the whole report. No pages are added after the last one.
+    """
+
+    page_numbers = range(1, 1)
+
+    def page_no(self) -> int:
+        return self.page_numbers[self.page - 1]
+
+    def add_page(self, *args: Any, **kwargs: Any) -> None:
+        if self.page == len(self.page_numbers):
+            raise _LastPageReached()
+        super().add_page(*args, **kwargs)
+
+    def _resolve_anchors(self) -> None:
+        # the anchors on the pages that are not rendered keep the placeholder destination
+        for name, link in self._anchor_links.items():
+            target: Optional[tuple[int, float]] = self._anchor_targets.get(name)
+            if target is not None:
+                self.set_link(link, y=target[1], page=target[0])
@@ -0,0 +1,183 @@
+"""
+Layout engine for chart legends.
+
+All labels are measured in one batch and arranged column by column, so that the legend
+fits into the available space. Labels wider than a column are truncated with an
+ellipsis, and the tail of a legend with too many entries is aggregated into a single
+"Other" entry.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional
+
+LEGEND_ROW_HEIGHT: float = 5
+LEGEND_MIN_ROWS: int = 4
+LEGEND_DOT_WIDTH: float = 3
+
+_FIRST_COLUMN_OFFSET: float = 2
+_COLUMN_SPACING: float = 10
+_MIN_COLUMN_WIDTH: float = 15
+_ELLIPSIS = "..."
+
+Measure = Callable[[Sequence[str]], list[float]]
+
+
+@dataclass(frozen=True)
+class LegendEntry:
+    """
+    A single positioned legend entry.
+
+    :ivar label: The (possibly truncated) text of the entry.
+    :ivar color_index: Index of the data point the entry describes, or None for the aggregated "Other" entry.
+    :ivar column: The column of the entry.
+    :ivar row: The row of the entry within its column.
+    """
+
+    label: str
+    color_index: Optional[int]
+    column: int
+    row: int
+
+
+@dataclass(frozen=True)
+class LegendLayout:
+    """
+    The computed layout of a legend, relative to the legend origin.
+
+    :ivar entries: The positioned entries, in the order of the input labels.
+    :ivar column_widths: The text width of each column.
+    :ivar rows: The number of rows of the tallest column.
+    """
+
+    entries: tuple[LegendEntry, ...]
+    column_widths: tuple[float, ...]
+    rows: int
+
+    @property
+    def column_offsets(self) -> tuple[float, ...]:
+        """
+        The horizontal offsets of the columns from the legend origin.
+        """
+        offsets = []
+        offset = _FIRST_COLUMN_OFFSET
+        for width in self.column_widths:
+            offsets.append(offset)
+            offset += width + _COLUMN_SPACING
+        return tuple(offsets)
+
+    @property
+    def width(self) -> float:
+        """
+        The width of the legend, including the spacing after the last column.
+        """
+        return _FIRST_COLUMN_OFFSET + sum(
+            width + _COLUMN_SPACING for width in self.column_widths
+        )
+
+    @property
+    def height(self) -> float:
+        """
+        The height of the legend entries (without the caption).
+        """
+        return self.rows * LEGEND_ROW_HEIGHT
+
+
+def layout_legend(
+    labels: Sequence[str],
+    measure: Measure,
+    max_width: float,
+    max_height: float,
+    other_label: str = "Other",
+) -> LegendLayout:
+    """
+    Computes the layout of legend entries that fits into the given space.
+
+    Columns hold at least `LEGEND_MIN_ROWS` entries. More rows are used only when the
+    columns would not fit into `max_width` otherwise.
+
+    :param labels: The texts of the legend entries.
+    :param measure: Function returning the widths of a batch of texts.
+    :param max_width: The available width.
+    :param max_height: The available height for the entries.
+    :param other_label: The label of the entry aggregating the entries that do not fit.
+    :return: The computed layout.
+    """
+    if not labels:
+        return LegendLayout((), (), 0)
+
+    max_rows = max(LEGEND_MIN_ROWS, int(max_height // LEGEND_ROW_HEIGHT))
+    max_columns = max(
+        1,
+        int(
+            (max_width - LEGEND_DOT_WIDTH + _COLUMN_SPACING)
+            // (_MIN_COLUMN_WIDTH + _COLUMN_SPACING)
+        ),
+    )
+
+    texts = list(labels)
+    color_indices: list[Optional[int]] = list(range(len(texts)))
+    capacity = max_rows * max_columns
+    if len(texts) > capacity:
+        hidden = len(texts) - capacity + 1
+        texts = texts[: capacity - 1] + [f"{other_label} (+{hidden})"]
+        color_indices = color_indices[: capacity - 1] + [None]
+
+    widths = measure(texts)
+
+    rows = min(LEGEND_MIN_ROWS, len(texts))
+    column_widths = _column_widths(widths, rows)
+    while _extent(column_widths) > max_width and rows < min(max_rows, len(texts)):
+        rows += 1
+        column_widths = _column_widths(widths, rows)
+
+    if rows > LEGEND_MIN_ROWS:
+        # balance the columns, so that the last one is not almost empty
+        rows = ceil(len(texts) / len(column_widths))
+        column_widths = _column_widths(widths, rows)
+
+    if _extent(column_widths) > max_width:
+        limit = max(
+            _MIN_COLUMN_WIDTH,
+            (max_width - LEGEND_DOT_WIDTH - _FIRST_COLUMN_OFFSET) / len(column_widths)
+            - _COLUMN_SPACING,
+        )
+        for idx, width in enumerate(widths):
+            if width > limit:
+                texts[idx], widths[idx] = _truncate(texts[idx], limit, measure)
+        column_widths = _column_widths(widths, rows)
+
+    entries = tuple(
+        LegendEntry(text, color_index, idx // rows, idx % rows)
+        for idx, (text, color_index) in enumerate(zip(texts, color_indices))
+    )
+    return LegendLayout(entries, tuple(column_widths), rows)
+
+
+def _column_widths(widths: Sequence[float], rows: int) -> list[float]:
+    return [max(widths[start : start + rows]) for start in range(0, len(widths), rows)]
+
+
+def _extent(column_widths: Sequence[float]) -> float:
+    return (
+        _FIRST_COLUMN_OFFSET
+        + sum(column_widths)
+        + _COLUMN_SPACING * (len(column_widths) - 1)
+        + LEGEND_DOT_WIDTH
+    )
+
+
+def _truncate(text: str, limit: float, measure: Measure) -> tuple[str, float]:
+    low, high = 0, len(text)
+    best, best_width = _ELLIPSIS, measure([_ELLIPSIS])[0]
+    while low <= high:
+        middle = (low + high) // 2
+        candidate = text[:middle].rstrip() + _ELLIPSIS
+        width = measure([candidate])[0]
+        if width <= limit:
+            best, best_width = candidate, width
+            low = middle + 1
+        else:
+            high = middle - 1
+    return best, best_width
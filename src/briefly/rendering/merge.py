@@ -0,0 +1,284 @@
+"""
+Concatenation of reports into a single document.
+
+The pages are appended at the content-stream level, without rendering the reports
+again: the text is re-encoded for the font subsets of the merged document, so that
+each font is embedded once, and identical chart images are shared.
+"""
+
+import copy
+import re
+import zlib
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from typing import Any, Optional
+
+from fpdf.enums import PDFResourceType
+from fpdf.fonts import TTFFont
+from fpdf.outline import OutlineSection
+from fpdf.syntax import DestinationXYZ, PDFContentStream
+from fpdf.util import escape_parens
+
+from briefly.rendering.pdf_generator import PDF, FormXObject
+from briefly.rendering.spill import SpilledData, SpilledPages
+from briefly.style import PURPLE_HAZE, Style
+
+# the streams are generated by fpdf, which escapes all parentheses in strings
+_CONTENT_TOKEN = re.compile(
+    rb"\((?:[^\\()]|\\.)*\)|/F(\d+)(\s+[-+]?[\d.]+\s+Tf)|/I(\d+)(\s+Do)", re.DOTALL
+)
+_STRING_ESCAPE = re.compile(rb"\\(.)", re.DOTALL)
+
+
+def merge(reports: Iterable[PDF], style: Style = PURPLE_HAZE, **kwargs: Any) -> PDF:
+    """
+    Concatenates the reports into a single report.
+
+    The reports are consumed one at a time, so they can be generated lazily (e.g. one report per team) and released once appended.
+    The page numbers in the footer are renumbered, and the footer shows the generation time of the merged report.
+
+    :param reports: The reports to merge. The reports must not be in the dry-run mode.
+    :param style: The style of the merged report, used for the footer.
+    :param kwargs: Additional arguments passed to the `PDF` constructor.
+    :return: The merged report, ready to be output.
+    """
+    merged = PDF(style, **kwargs)
+    for report in reports:
+        append_report(merged, report)
+    return merged
+
+
+def append_report(
+    target: PDF,
+    report: PDF,
+    images: Optional[Mapping[str, dict[str, Any]]] = None,
+    transform: Optional[Callable[[bytes], bytes]] = None,
+) -> None:
+    """
+    Appends the pages of a report to the target report.
+
+    Fonts are matched by their key and images by their content hash, so the resources
+    shared by the reports (including the icons and the gridlines of the charts) are embedded once. Links, anchors and outline entries are kept.
+
+    :param target: The report to append the pages to.
+    :param report: The appended report. It must not be modified afterwards.
+    :param images: The images embedded instead of the images of the report, by their key in the image cache of the report, with the same indices (e.g. the charts drawn in another style).
+    :param transform: A function applied to the content stream of each page (e.g. substituting the colors).
+    :raises ValueError: When the report cannot be appended (e.g. it is in the dry-run mode).
+    :raises TypeError: When the report uses a font that is not a TrueType font (e.g. a core font), whose glyphs cannot be mapped.
+    """
+    if report.dry_run or target.dry_run:
+        raise ValueError("Reports in the dry-run mode cannot be merged")
+    if report.toc_placeholder is not None and not report.buffer:
+        raise ValueError("Output the report first to render its table of contents")
+    if not report.buffer:
+        report._resolve_anchors()
+    if target._input_hash is not None:
+        if report._input_hash is None:
+            raise ValueError(
+                "Only reproducible reports can be merged into a reproducible report"
+            )
+        target._input_hash.update("append_report", report.content_hash())
+
+    # fpdf internals, missing in the type stubs
+    target_doc: Any = target
+    report_doc: Any = report
+
+    fonts = _map_fonts(target, _report_fonts(report))
+    images_by_key = report.image_cache.images if images is None else images
+    image_indices = _map_images(target, images_by_key, report._form_xobjects)
+    page_offset = target.page
+    destinations: dict[int, Any] = {}
+
+    background = target.page_background
+    target.page_background = None
+    try:
+        for number, page in list(report.pages.items()):
+            # the background is drawn by the appended content stream
+            target.add_page()
+            used_fonts: set[int] = set()
+            used_images: set[int] = set()
+            content = _without_footer(
+                report, number, _page_content(report, number, page)
+            )
+            if transform is not None:
+                content = transform(content)
+            content = _rewrite_content(
+                content, fonts, image_indices, used_fonts, used_images
+            )
+            # isolates the graphics state of the appended page from the footer
+            target._out(b"q\n" + content + b"\nQ")
+            for index in used_fonts:
+                target_doc._resource_catalog.add(
+                    PDFResourceType.FONT, index, target.page
+                )
+            for index in used_images:
+                target_doc._resource_catalog.add(
+                    PDFResourceType.X_OBJECT, index, target.page
+                )
+            for annotation in page.annots or ():
+                target_doc.pages[target.page].add_annotation(
+                    _move_annotation(annotation, page_offset, destinations)
+                )
+    finally:
+        target.page_background = background
+
+    for section in report_doc._outline:
+        target_doc._outline.append(
+            OutlineSection(
+                section.name,
+                section.level,
+                section.page_number + page_offset,
+                _move_destination(section.dest, page_offset),
+            )
+        )
+    for name, dest in report_doc.named_destinations.items():
+        if name in target_doc.named_destinations:
+            raise ValueError(f"Named destination '{name}' is defined in both reports")
+        target_doc.named_destinations[name] = _move_destination(dest, page_offset)
+    target.element_counts.update(report.element_counts)
+
+
+def _without_footer(report: PDF, number: int, content: bytes) -> bytes:
+    footer = report._footer_ranges.get(number)
+    if footer is None:
+        return content
+    start, end = footer
+    return content[:start] + content[end:]
+
+
+class _FontMapping:
+    __slots__ = ("font", "name", "table")
+
+    def __init__(self, font: Any, table: dict[int, int]) -> None:
+        self.font = font
+        self.name = f"/F{font.i}".encode()
+        self.table = table
+
+
+# the key, the index and the glyphs (with their positions in the subset) of a font
+FontGlyphs = tuple[str, int, Iterable[tuple[Any, int]]]
+
+
+def _report_fonts(report: PDF) -> Iterator[FontGlyphs]:
+    for key, font in report.fonts.items():
+        if not isinstance(font, TTFFont):
+            raise TypeError(f"Font '{key}' is not a TrueType font and cannot be merged")
+        yield key, font.i, font.subset.items()
+
+
+def _map_fonts(target: PDF, fonts: Iterable[FontGlyphs]) -> dict[int, _FontMapping]:
+    mappings: dict[int, _FontMapping] = {}
+    for key, index, glyphs in fonts:
+        target_font: Any = target.fonts.get(key)
+        if target_font is None:
+            raise ValueError(f"Font '{key}' is not available in the merged report")
+        # maps the positions in the font subset of the report to the merged subset
+        table = {
+            char_id: target_font.subset.pick_glyph(glyph)
+            for glyph, char_id in glyphs
+            if glyph is not None
+        }
+        mappings[index] = _FontMapping(target_font, table)
+    return mappings
+
+
+def _map_images(
+    target: PDF,
+    images_by_key: Mapping[str, dict[str, Any]],
+    forms: Mapping[Hashable, FormXObject],
+) -> dict[int, int]:
+    images: dict[int, int] = {}
+    target_images = target.image_cache.images
+    for key, info in images_by_key.items():
+        target_info = target_images.get(key)
+        if target_info is None:
+            target_info = copy.copy(info)
+            target_info["i"] = target._xobject_index()
+            target_info["usages"] = 0
+            for field in ("data", "smask"):
+                if isinstance(info.get(field), SpilledData):
+                    # the spill file of the report is deleted when the report is reset
+                    target_info[field] = bytes(info[field])
+            target_images[key] = target_info
+            target._track_image(target_info)
+        target_info["usages"] += info["usages"]
+        images[info["i"]] = target_info["i"]
+    for form_key, form in forms.items():
+        images[form.index] = target._form_xobject(form_key, form.content, form.b_box)
+    return images
+
+
+def _page_content(report: PDF, number: int, page: Any) -> bytes:
+    if isinstance(report.pages, SpilledPages) and number in report.pages.spilled:
+        # read without loading the page back into the report
+        return report.pages.read(number)
+    contents = page.contents
+    if isinstance(contents, PDFContentStream):
+        # the report was already output
+        data = contents.content_stream()
+        return zlib.decompress(data) if contents.filter else data
+    return bytes(contents)
+
+
+def _rewrite_content(
+    content: bytes,
+    fonts: dict[int, _FontMapping],
+    images: dict[int, int],
+    used_fonts: set[int],
+    used_images: set[int],
+) -> bytes:
+    font: Optional[_FontMapping] = None
+
+    def replace(match: re.Match[bytes]) -> bytes:
+        nonlocal font
+        if match.group(1) is not None:
+            font = fonts[int(match.group(1))]
+            used_fonts.add(font.font.i)
+            return font.name + match.group(2)
+        if match.group(3) is not None:
+            index = images[int(match.group(3))]
+            used_images.add(index)
+            return b"/I%d" % index + match.group(4)
+        if font is None:
+            return match.group(0)
+        return _reencode_string(match.group(0), font)
+
+    return _CONTENT_TOKEN.sub(replace, content)
+
+
+def _reencode_string(literal: bytes, font: _FontMapping) -> bytes:
+    raw = _STRING_ESCAPE.sub(_unescape, literal[1:-1])
+    text = raw.decode("utf-16-be").translate(font.table)
+    return b"(" + escape_parens(text.encode("utf-16-be")) + b")"
+
+
+def _unescape(match: re.Match[bytes]) -> bytes:
+    char = match.group(1)
+    return b"\r" if char == b"r" else char
+
+
+def _move_annotation(
+    annotation: Any, page_offset: int, destinations: dict[int, Any]
+) -> Any:
+    dest = getattr(annotation, "dest", None)
+    if dest is None or not hasattr(dest, "page_number"):
+        return annotation
+    # the destinations shared by several annotations are moved once
+    moved_dest = destinations.get(id(dest))
+    if moved_dest is None:
+        moved_dest = _move_destination(dest, page_offset)
+        destinations[id(dest)] = moved_dest
+    moved = copy.copy(annotation)
+    moved.dest = moved_dest
+    return moved
+
+
+def _move_destination(dest: DestinationXYZ, page_offset: int) -> DestinationXYZ:
+    # not using DestinationXYZ.replace, which refuses already output destinations
+    assert dest.page_number is not None
+    return DestinationXYZ(
+        page=dest.page_number + page_offset,
+        top=dest.top,
+        left=dest.left,
+        zoom=dest.zoom,
+    )
@@ -0,0 +1,105 @@
+"""
+Path construction operators for the shapes drawn as compound paths.
+
+The coordinates are in PDF points, with the y axis pointing up. The functions return
+the operators of a closed subpath (or a series of subpaths) without the painting
+operator, so that several shapes can be painted with a single operation.
+"""
+
+import math
+
+# the distance of the Bezier control points approximating a quarter circle of radius 1
+_KAPPA: float = 0.5523
+
+
+def rounded_rect(x: float, y: float, w: float, h: float, r: float = 0) -> str:
+    """
+    Returns the subpath of a rectangle, with rounded corners if `r` is positive.
+
+    :param x: The left side of the rectangle.
+    :param y: The bottom side of the rectangle.
+    :param w: The width of the rectangle.
+    :param h: The height of the rectangle.
+    :param r: The radius of the corners. It is reduced to fit into the rectangle.
+    :return: The path construction operators.
+    """
+    r = min(r, w / 2, h / 2)
+    if r <= 0:
+        return f"{x:.2f} {y:.2f} {w:.2f} {h:.2f} re"
+    c = r * (1 - _KAPPA)
+    x2, y2 = x + w, y + h
+    return (
+        f"{x + r:.2f} {y:.2f} m {x2 - r:.2f} {y:.2f} l"
+        f" {x2 - c:.2f} {y:.2f} {x2:.2f} {y + c:.2f} {x2:.2f} {y + r:.2f} c"
+        f" {x2:.2f} {y2 - r:.2f} l"
+        f" {x2:.2f} {y2 - c:.2f} {x2 - c:.2f} {y2:.2f} {x2 - r:.2f} {y2:.2f} c"
+        f" {x + r:.2f} {y2:.2f} l"
+        f" {x + c:.2f} {y2:.2f} {x:.2f} {y2 - c:.2f} {x:.2f} {y2 - r:.2f} c"
+        f" {x:.2f} {y + r:.2f} l"
+        f" {x:.2f} {y + c:.2f} {x + c:.2f} {y:.2f} {x + r:.2f} {y:.2f} c h"
+    )
+
+
+def horizontal_lines(width: float, ys: list[float]) -> str:
+    """
+    Returns the subpaths of horizontal lines starting at x = 0.
+
+    :param width: The length of the lines.
+    :param ys: The vertical positions of the lines.
+    :return: The path construction operators.
+    """
+    return "\n".join(f"0 {y:.2f} m {width:.2f} {y:.2f} l" for y in ys)
+
+
+def arc(
+    cx: float, cy: float, r: float, start: float, end: float, move: bool = True
+) -> str:
+    """
+    Returns the path of a circular arc, approximated with a Bezier curve per quarter circle (or less).
+
+    :param cx: The horizontal position of the center.
+    :param cy: The vertical position of the center.
+    :param r: The radius.
+    :param start: The angle of the start of the arc, in degrees counterclockwise from the positive x axis.
+    :param end: The angle of the end of the arc. The arc is clockwise when it is lower than `start`.
+    :param move: Whether the path starts at the start of the arc. Otherwise, a line is drawn to it from the current point.
+    :return: The path construction operators.
+    """
+    segments = max(1, math.ceil(abs(end - start) / 90))
+    step = math.radians(end - start) / segments
+    # the distance of the control points for an arc of the step angle
+    k = 4 / 3 * math.tan(step / 4)
+    a = math.radians(start)
+    operators = [
+        f"{cx + r * math.cos(a):.2f} {cy + r * math.sin(a):.2f} {'m' if move else 'l'}"
+    ]
+    for _ in range(segments):
+        b = a + step
+        cos_a, sin_a, cos_b, sin_b = math.cos(a), math.sin(a), math.cos(b), math.sin(b)
+        operators.append(
+            f"{cx + r * (cos_a - k * sin_a):.2f} {cy + r * (sin_a + k * cos_a):.2f}"
+            f" {cx + r * (cos_b + k * sin_b):.2f} {cy + r * (sin_b - k * cos_b):.2f}"
+            f" {cx + r * cos_b:.2f} {cy + r * sin_b:.2f} c"
+        )
+        a = b
+    return " ".join(operators)
+
+
+def annular_sector(
+    cx: float, cy: float, outer: float, inner: float, start: float, end: float
+) -> str:
+    """
+    Returns the subpath of a sector of a ring (e.g. a slice of a donut chart), or of a pie slice if `inner` is 0.
+
+    :param cx: The horizontal position of the center.
+    :param cy: The vertical position of the center.
+    :param outer: The outer radius.
+    :param inner: The inner radius.
+    :param start: The angle of the start of the sector, in degrees counterclockwise from the positive x axis.
+    :param end: The angle of the end of the sector.
+    :return: The path construction operators.
+    """
+    if inner <= 0:
+        return f"{cx:.2f} {cy:.2f} m {arc(cx, cy, outer, start, end, move=False)} h"
+    outer_arc = arc(cx, cy, outer, start, end)
+    return f"{outer_arc} {arc(cx, cy, inner, end, start, move=False)} h"
@@ -1,27 +1,173 @@
-from datetime import datetime, date
+from collections import Counter, defaultdict
+import inspect
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, date, timezone
+from functools import wraps
+from importlib import metadata
 from importlib.resources import files
-from typing import Any, List, Optional, Tuple, TypeVar, Mapping
-
-from fpdf import FPDF, YPos, XPos
-from fpdf.enums import MethodReturnValue
-
-from briefly.rendering.font_spec import FONT_FAMILY, FONTS, ICON_FONT_FAMILY
-from briefly.rendering.graphs import build_pie_chart_bytes
-from briefly.rendering.icons import FLAG_ICON, DUE_DATE_ICON, PRIORITY_ICON
+from io import BytesIO
+from itertools import chain, islice
+from typing import (
+    Any,
+    Concatenate,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Mapping,
+    ParamSpec,
+    Union,
+)
+
+import matplotlib
+from fontTools import ttLib  # type: ignore[import-untyped]
+from fpdf import FPDF, FPDF_VERSION, YPos, XPos
+from fpdf.enums import CharVPos, MethodReturnValue, PDFResourceType, TextMode
+from fpdf.fonts import SubsetMap, TTFFont
+from fpdf.image_parsing import preload_image
+from fpdf.outline import OutlineSection
+from fpdf.syntax import Name, PDFArray, PDFContentStream
+
+from briefly.rendering.aggregation import (
+    Bins,
+    ChartData,
+    aggregate_array,
+    aggregate_items,
+)
+from briefly.rendering.cache import CacheStats, LRUCache
+from briefly.rendering.estimate import (
+    ELEMENT_CONTENT_BYTES,
+    LayoutEstimate,
+    estimate_output_size,
+)
+from briefly.rendering.font_metrics import ADVANCE_WIDTHS
+from briefly.rendering.font_spec import FONT_FAMILY, FONTS
+from briefly.rendering.graphs import (
+    DEFAULT_CHART_BACKEND,
+    ChartBackend,
+    build_pie_chart_bytes,
+)
+from briefly.rendering.icons import (
+    DUE_DATE_ICON,
+    FLAG_ICON,
+    ICON_GRID,
+    PRIORITY_ICON,
+    Icon,
+    compile_icon,
+)
+from briefly.rendering.legend import (
+    LEGEND_DOT_WIDTH,
+    LEGEND_ROW_HEIGHT,
+    LegendLayout,
+    layout_legend,
+)
+from briefly.rendering.paths import annular_sector, horizontal_lines, rounded_rect
+from briefly.rendering.reproducible import InputHash, pinned_time
+from briefly.rendering.spill import MemoryUsage, SpilledData, SpilledPages, SpillFile
+from briefly.rendering.text_metrics import CharWidthTable, estimate_column_widths
+from briefly.rendering.wrap import can_wrap, wrap_text
 from briefly.style import Style, PURPLE_HAZE, Color
 
 HEADER_SIZE: int = 20
 SECTION_TITLE_SIZE: int = 13
 TEXT_SIZE: int = 10
-ICON_FONT_SIZE: int = 7
+ICON_SIZE: int = 7
 LABEL_SIZE: int = 7
 MARGIN_SIZE: int = 25
 
 _SMALL_SPACING: float = 2
 _MEDIUM_SPACING: float = 5
 _LARGE_SPACING: float = 10
+_GRIDLINE_SPACING: float = 5
+_BAR_CORNER_RADIUS: float = 0.5
+_GRID_COLUMN_WIDTH: float = 77.5
+_PROGRESS_BAR_HEIGHT: float = 3
+# the radius of the hole of the donut charts and gauges, relative to their radius
+_DONUT_HOLE: float = 0.6
+_GAUGE_HOLE: float = 0.7
 
 K = TypeVar("K", bound=str)
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+def _glyph_chars(subset: SubsetMap) -> set[str]:
+    chars: set[str] = set()
+    # SubsetMap has no keys(), the glyphs are the keys of its items
+    glyphs = (glyph for glyph, _ in subset.items() if glyph is not None)
+    for glyph in glyphs:
+        codes = glyph.unicode if isinstance(glyph.unicode, tuple) else (glyph.unicode,)
+        chars.update(chr(code) for code in codes)
+    return chars
+
+
+def _reset_font(font: TTFFont, reload: bool) -> None:
+    if reload:
+        # the font file is subset in place when the document is output
+        font.ttfont = ttLib.TTFont(
+            font.ttffile,
+            recalcTimestamp=False,
+            fontNumber=getattr(font, "collection_font_number", 0),
+            lazy=True,
+        )
+    font.subset = SubsetMap(font)
+    font.missing_glyphs = []
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("briefly")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+def _hashed(
+    method: Callable[Concatenate["PDF", _P], _R],
+) -> Callable[Concatenate["PDF", _P], _R]:
+    """
+    Adds the calls of an element method to the input hash of reproducible reports, see `PDF.content_hash`,
+    and passes them to `PDF._record_call`.
+    The calls made by other element methods are part of the outer call and are not hashed.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self: "PDF", /, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        if self._hashing:
+            return method(self, *args, **kwargs)
+        if self._input_hash is not None:
+            # the defaults are hashed too, as they affect the output
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            self._input_hash.update(method.__name__, arguments)
+        self._record_call(method.__name__, args, kwargs)
+        self._hashing = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._hashing = False
+
+    return wrapper
+
+
+@dataclass(frozen=True)
+class FormXObject:
+    """
+    A reusable drawing registered in a report, see `PDF._form_xobject`.
+
+    :ivar index: The index of the XObject in the resources of the pages.
+    :ivar content: The drawing operators.
+    :ivar b_box: The bounding box of the drawing (left, bottom, right, top).
+    """
+
+    index: int
+    content: str
+    b_box: tuple[float, float, float, float]
 
 
 class PDF(FPDF):
@@ -30,40 +176,398 @@ class PDF(FPDF):
 
     Creates an A4 PDF with margin of 25mm on all sides. The default used font is Inter.
 
+    In the dry-run mode, the layout of the report is computed as usual, but no drawing operators are emitted and no charts are rasterized.
+    The pages of the output are empty, use `estimate` to get the page count and the estimated size of the report.
+
+    With a memory budget, the content of the finished pages and the chart images is spilled to a temporary file
+    whenever the buffered content exceeds the budget, and read back when the report is output. See `memory_usage`.
+
+    An instance must be used by one thread at a time. Separate instances share no mutable state, so reports can be
+    rendered concurrently in threads (see also `PDFPool`).
+
+    In the reproducible mode, the same inputs always produce the same bytes: the generation time (printed in the
+    footers and used as the creation date, from which the document ID is derived) is pinned, and `content_hash`
+    identifies the inputs before anything is rendered.
+
     :param style: The style to use for the report. The default value is `Style.PURPLE_HAZE`.
+    :param dry_run: Whether to compute the layout only.
+    :param memory_budget: The maximum size of the page content and image data held in memory, in bytes. Unlimited by default. The content of the current page is never spilled.
+    :param reproducible: Whether to produce reproducible output.
+    :param generation_time: The generation time of the report. By default, the current time is used, or the `SOURCE_DATE_EPOCH` environment variable in the reproducible mode.
+    :param chart_backend: The rasterizer of the pie charts, e.g. `RasterBackend()` to draw them without matplotlib. By default, `DEFAULT_CHART_BACKEND`.
     """
 
     style: Style
 
-    def __init__(self, style: Style = PURPLE_HAZE, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        style: Style = PURPLE_HAZE,
+        dry_run: bool = False,
+        memory_budget: Optional[int] = None,
+        reproducible: bool = False,
+        generation_time: Optional[datetime] = None,
+        chart_backend: Optional[ChartBackend] = None,
+        **kwargs: Any,
+    ) -> None:
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError("memory_budget must be positive")
         super().__init__(**kwargs)
+        self._fpdf_kwargs = kwargs
         self.style = style
-        self.set_margin(MARGIN_SIZE)
-        self.set_page_background(style.background_color)
-        self.generation_time = datetime.now()
+        self.dry_run = dry_run
+        self.memory_budget = memory_budget
+        self.reproducible = reproducible
+        self._generation_time = (
+            pinned_time(generation_time) if reproducible else generation_time
+        )
+        self.chart_backend = chart_backend or DEFAULT_CHART_BACKEND
+        self._legend_layouts: LRUCache[tuple[Any, ...], LegendLayout] = LRUCache()
+        self._char_widths: dict[tuple[str, float], CharWidthTable] = {}
+        self._chart_images: LRUCache[tuple[Any, ...], bytes] = LRUCache()
+        self._wrapped_lines: LRUCache[tuple[Any, ...], tuple[str, ...]] = LRUCache(
+            maxsize=1024
+        )
+        self._start_report()
         self._setup_fonts()
 
+    def _start_report(self) -> None:
+        self.element_counts: Counter[str] = Counter()
+        self._dry_run_content_bytes = 0
+        self._dry_run_links = 0
+        self._dry_run_chars: defaultdict[str, set[str]] = defaultdict(set)
+        self._chart_slices: dict[tuple[float, ...], int] = {}
+        # the values and sizes of the pie chart images, by image index, see `render`
+        self._chart_sources: dict[int, tuple[tuple[float, ...], float]] = {}
+        self._anchor_links: dict[str, int] = {}
+        self._anchor_targets: dict[str, tuple[int, float]] = {}
+        # the start and end offsets of the footer in the content of each page
+        self._footer_ranges: dict[int, tuple[int, int]] = {}
+        self._form_xobjects: dict[Hashable, FormXObject] = {}
+        self._resident_pages: list[int] = []
+        self._resident_images: list[dict[str, Any]] = []
+        self._tracked_images: set[int] = set()
+        self._resident_bytes = 0
+        self._peak_memory = 0
+        self._spill: Optional[SpillFile] = None
+        if self.memory_budget is not None and not self.dry_run:
+            self._spill = SpillFile()
+            self.pages = SpilledPages(self.pages, self._spill)
+        self.set_margin(MARGIN_SIZE)
+        self.set_page_background(self.style.background_color)
+        self.generation_time = self._generation_time or datetime.now()
+        self._hashing = False
+        self._input_hash: Optional[InputHash] = None
+        if self.reproducible:
+            creation_date = self.generation_time
+            if creation_date.tzinfo is None:
+                # not depending on the local timezone
+                creation_date = creation_date.replace(tzinfo=timezone.utc)
+            self.set_creation_date(creation_date)
+            self._input_hash = InputHash()
+            self._input_hash.update(
+                "report",
+                _package_version(),
+                FPDF_VERSION,
+                matplotlib.__version__,
+                self.style,
+                self._fpdf_kwargs,
+                self.generation_time,
+                self.chart_backend.name,
+            )
+
+    def _record_call(
+        self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> None:
+        """
+        Called before each call of an element method that is not made by another element method, see `LazyReport`.
+
+        :param name: The name of the method.
+        :param args: The positional arguments of the call.
+        :param kwargs: The keyword arguments of the call.
+        """
+
     def _setup_fonts(self) -> None:
         font_pkg = files("briefly.fonts")
         for font in FONTS:
             self.add_font(font.family, font.style, str(font_pkg / font.filename))
         self.set_font(FONT_FAMILY, "", TEXT_SIZE)
 
+    def reset(self) -> None:
+        """
+        Discards the content of the report, so that the instance can be reused for another report.
+
+        The pages, links and the generation time are reset, while the registered fonts, the style and the layout caches are kept.
+        This is much cheaper than creating a new instance.
+        """
+        fonts = self.fonts
+        was_output = self.buffer is not None
+        if self._spill is not None:
+            self._spill.close()
+        FPDF.__init__(self, **self._fpdf_kwargs)
+        for font in fonts.values():
+            if isinstance(font, TTFFont):
+                _reset_font(font, reload=was_output)
+        self.fonts.update(fonts)
+        self._start_report()
+        self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+
+    def _out(self, s: str | bytes) -> None:
+        if self.dry_run:
+            self._dry_run_content_bytes += len(s) + 1
+        else:
+            super()._out(s)  # type: ignore[misc]
+
+    def _dry_run_element(self, element: str, *texts: str, count: int = 1) -> None:
+        self._dry_run_content_bytes += ELEMENT_CONTENT_BYTES[element] * count
+        chars = self._dry_run_chars[FONT_FAMILY.lower()]
+        for text in texts:
+            chars.update(text)
+
+    def estimate(self) -> LayoutEstimate:
+        """
+        Estimates the properties of the report laid out so far.
+        The estimated size is approximate, and is most useful in the dry-run mode, before any rendering work is done.
+
+        :return: The page count, element counts and the estimated output size.
+        """
+        if self.dry_run:
+            content_bytes = self._dry_run_content_bytes
+        else:
+            content_bytes = sum(len(page.contents) for page in self.pages.values())
+            if isinstance(self.pages, SpilledPages):
+                content_bytes += sum(self.pages.spilled.values())
+        font_glyphs = []
+        for key, font in self.fonts.items():
+            if not isinstance(font, TTFFont):
+                continue
+            chars = self._dry_run_chars.get(key, set()).union(_glyph_chars(font.subset))
+            if chars:
+                font_glyphs.append(len(chars))
+        links = self._dry_run_links + sum(
+            len(page.annots) for page in self.pages.values()
+        )
+        return LayoutEstimate(
+            pages=self.page,
+            elements=dict(self.element_counts),
+            content_bytes=content_bytes,
+            estimated_size=estimate_output_size(
+                self.page,
+                content_bytes,
+                font_glyphs,
+                self._chart_slices.values(),
+                links,
+            ),
+        )
+
+    @_hashed
+    def add_page(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Starts a new page, see `FPDF.add_page`. The previous page is accounted to the memory usage of the report.
+        """
+        finished = self.page
+        super().add_page(*args, **kwargs)
+        if finished and not self.in_toc_rendering:
+            self._resident_pages.append(finished)
+            self._resident_bytes += len(self.pages[finished].contents)
+            self._check_memory_budget()
+
+    def memory_usage(self) -> MemoryUsage:
+        """
+        Returns the memory used by the page content and the image data of the report, see `memory_budget`.
+        The usage is sampled when a page is finished and when a chart image is added.
+
+        :return: The current and peak usage, and the size of the spilled content.
+        """
+        current = self._memory_in_use()
+        self._peak_memory = max(self._peak_memory, current)
+        spilled = self._spill.size if self._spill is not None else 0
+        return MemoryUsage(current=current, peak=self._peak_memory, spilled=spilled)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Returns the statistics of the layout caches, kept for the lifetime of the instance (also across `reset`).
+
+        :return: The statistics of the wrapped lines of the task cards, the legend layouts and the chart images, by cache name.
+        """
+        return {
+            "wrapped_lines": self._wrapped_lines.stats(),
+            "legend_layouts": self._legend_layouts.stats(),
+            "chart_images": self._chart_images.stats(),
+        }
+
+    def _memory_in_use(self) -> int:
+        if not self.page or self.dry_run:
+            return self._resident_bytes
+        return self._resident_bytes + len(self.pages[self.page].contents)
+
+    def _track_image(self, info: dict[str, Any]) -> None:
+        if info["i"] in self._tracked_images:
+            return
+        self._tracked_images.add(info["i"])
+        self._resident_images.append(info)
+        self._resident_bytes += len(info["data"]) + len(info.get("smask") or b"")
+        self._check_memory_budget()
+
+    def _check_memory_budget(self) -> None:
+        current = self._memory_in_use()
+        self._peak_memory = max(self._peak_memory, current)
+        if self.memory_budget is None or self._spill is None:
+            return
+        pages = self.pages
+        assert isinstance(pages, SpilledPages)
+        # the oldest pages are spilled first, the images once all pages are spilled
+        while current > self.memory_budget and self._resident_pages:
+            released = pages.spill(self._resident_pages.pop(0))
+            self._resident_bytes -= released
+            current -= released
+        while current > self.memory_budget and self._resident_images:
+            released = self._spill_image(self._resident_images.pop(0))
+            self._resident_bytes -= released
+            current -= released
+
+    def _spill_image(self, info: dict[str, Any]) -> int:
+        assert self._spill is not None
+        released = 0
+        for field in ("data", "smask"):
+            data = info.get(field)
+            if isinstance(data, (bytes, bytearray)):
+                key = f"image/{info['i']}/{field}"
+                self._spill.write(key, data)
+                info[field] = SpilledData(self._spill, key, len(data))
+                released += len(data)
+        return released
+
+    def output(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Outputs the report, see `FPDF.output`. The destinations of the anchors are resolved first.
+
+        :raises ValueError: When a link points to an anchor that was never defined.
+        """
+        if not self.buffer:
+            self._resolve_anchors()
+        # the table of contents rendered on output is not part of the inputs
+        self._hashing = True
+        try:
+            return super().output(*args, **kwargs)
+        finally:
+            self._hashing = False
+
+    def content_hash(self) -> str:
+        """
+        Returns a stable hash of the inputs of a reproducible report: the calls of the element methods (e.g. `task_card`)
+        with their arguments, the style, the page setup, the generation time and the versions of the libraries.
+
+        Reports with the same hash have the same output, so the hash can be computed in the dry-run mode to look up a
+        cached output before rendering. Content drawn with the `FPDF` methods directly is not part of the hash.
+
+        :return: The SHA-256 hash as a hex string.
+        :raises ValueError: When the report is not in the reproducible mode.
+        """
+        if self._input_hash is None:
+            raise ValueError(
+                "The content hash is only available in the reproducible mode"
+            )
+        return self._input_hash.hexdigest()
+
+    def anchor_link(self, name: str) -> int:
+        """
+        Returns the internal link to the anchor with the given name, to be used as a `link` of any element.
+        The elements also accept the "#name" shorthand.
+
+        The anchor may be defined after the link is created: the destinations are resolved when the report is output.
+        All links to the same anchor share a single destination.
+
+        :param name: The name of the anchor.
+        :return: The link identifier.
+        """
+        link = self._anchor_links.get(name)
+        if link is None:
+            # placeholder destination, updated in _resolve_anchors
+            link = self.add_link(page=1)
+            self._anchor_links[name] = link
+        return link
+
+    def _resolve_link(self, link: Optional[str | int]) -> str | int:
+        if isinstance(link, str) and link.startswith("#"):
+            return self.anchor_link(link[1:])
+        return link or 0
+
+    def _define_anchor(self, name: Optional[str]) -> None:
+        if name is None:
+            return
+        if name in self._anchor_targets:
+            raise ValueError(f"Anchor '{name}' is already defined")
+        self.anchor_link(name)
+        self._anchor_targets[name] = (self.page, self.y)
+
+    def _resolve_anchors(self) -> None:
+        undefined = self._anchor_links.keys() - self._anchor_targets.keys()
+        if undefined:
+            raise ValueError(f"Undefined anchors: {', '.join(sorted(undefined))}")
+        for name, link in self._anchor_links.items():
+            page, y = self._anchor_targets[name]
+            self.set_link(link, y=y, page=page)
+
+    @_hashed
+    def table_of_contents(self, title: str = "Contents", pages: int = 1) -> None:
+        """
+        Reserves the pages for a table of contents, listing all section titles of the report with their page numbers.
+        The table is rendered when the report is output, so it can be placed before the sections.
+        Each section title is also added to the document outline (bookmarks).
+
+        :param title: The title of the table of contents.
+        :param pages: The number of pages reserved for the table. Each page fits about 35 sections.
+        """
+        self.insert_toc_placeholder(
+            lambda pdf, outline: self._render_table_of_contents(title, outline),
+            pages=pages,
+            reset_page_indices=False,
+        )
+
+    def _render_table_of_contents(
+        self, title: str, outline: Sequence[OutlineSection]
+    ) -> None:
+        self.set_font(FONT_FAMILY, "B", SECTION_TITLE_SIZE)
+        self.set_text_color(*self.style.section_title_color)
+        self.cell(0, 10, title, new_y=YPos.NEXT)
+        self.set_y(self.get_y() + _MEDIUM_SPACING)
+        self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+        self.set_text_color(*self.style.font_color)
+        row_height = 6
+        for section in outline:
+            if self.will_page_break(row_height):
+                self.add_page(same=True)
+            y = self.y
+            self.cell(self.epw - 15, row_height, section.name)
+            self.cell(15, row_height, str(section.page_number), align="R")
+            dest: Any = section.dest
+            target_y = (self.h_pt - dest.top) / self.k
+            link = self.add_link(y=target_y, page=section.page_number)
+            # a single annotation per row
+            self.link(self.l_margin, y, self.epw, row_height, link)
+            self.ln(row_height)
+
     def footer(self) -> None:
         """
         Creates the footer with the report generation time and page number.
         """
+        # the footer is replaced when the page is merged into another report
+        start = len(self.pages[self.page].contents)
         self.set_y(-15)
         self.set_font(FONT_FAMILY, "I", 7)
         time_str: str = self.generation_time.strftime("%d.%m.%Y %H:%M:%S")
         self.cell(0, 10, time_str, align="L")
         self.cell(0, 10, f"Page {self.page_no()}", align="R")
+        # the table of contents is drawn after the footer of its pages
+        self._footer_ranges[self.page] = (start, len(self.pages[self.page].contents))
 
+    @_hashed
     def main_title(self, text: str) -> None:
         """
         Creates the main title (header) of the report.
         :param text: The text to display in the header.
         """
+        self.element_counts["main_title"] += 1
         self.set_font(FONT_FAMILY, "B", size=HEADER_SIZE)
         self.set_fill_color(*self.style.header_background)
         self.set_text_color(*self.style.header_color)
@@ -71,31 +575,46 @@ class PDF(FPDF):
         self.set_text_color(*self.style.font_color)
         self.set_y(self.get_y() + _LARGE_SPACING)
 
+    @_hashed
     def divider(self) -> None:
         """
         Creates a simple divider line (using the border color).
         """
+        self.element_counts["divider"] += 1
         self.set_draw_color(*self.style.border_color)
         x1, x2 = self.l_margin, self.w - self.r_margin
         y = self.get_y() + _MEDIUM_SPACING
         self.line(x1, y, x2, y)
         self.ln(_MEDIUM_SPACING)
 
-    def section_title(self, text: str, link: Optional[str] = None) -> None:
+    @_hashed
+    def section_title(
+        self,
+        text: str,
+        link: Optional[str | int] = None,
+        anchor: Optional[str] = None,
+        level: int = 0,
+    ) -> None:
         """
-        Creates a section title.
+        Creates a section title. The title is added to the document outline, see `table_of_contents`.
         :param text: The text to display in the section title.
-        :param link: The link to navigate to when clicking on the section title.
+        :param link: The link to navigate to when clicking on the section title. Use "#name" to link to an anchor.
+        :param anchor: The name of the anchor defined at the section title, see `anchor_link`.
+        :param level: The level of the section in the document outline.
         """
+        self.element_counts["section_title"] += 1
         self.set_y(self.get_y() + _MEDIUM_SPACING)
         self._break_page_if_needed(content_height=40)
+        self._define_anchor(anchor)
+        self.start_section(text, level, strict=False)
         self.set_font(FONT_FAMILY, "B", SECTION_TITLE_SIZE)
         self.set_text_color(*self.style.section_title_color)
-        self.cell(0, 10, text, link=link or 0, new_y=YPos.NEXT)
+        self.cell(0, 10, text, link=self._resolve_link(link), new_y=YPos.NEXT)
         self.set_font(FONT_FAMILY, size=TEXT_SIZE)
         self.set_text_color(*self.style.font_color)
         self.set_y(self.get_y() + _MEDIUM_SPACING)
 
+    @_hashed
     def summary_card(self, items: List[str], width: int = 80) -> tuple[float, float]:
         """
         Creates a summary card with the provided lines of text.
@@ -107,31 +626,36 @@ class PDF(FPDF):
         :param width: The width of the card.
         :return: The position of the right bottom corner of the summary card.
         """
+        self.element_counts["summary_card"] += 1
         padding = _MEDIUM_SPACING
         row_height = 6
         card_height = (len(items) * row_height) + 2 * padding
         self._break_page_if_needed(card_height)
         start_x, start_y = self.x, self.y
 
-        self.set_fill_color(*self.style.card_background)
-        self.rect(
-            start_x,
-            start_y,
-            width,
-            card_height,
-            style="F",
-            round_corners=True,
-            corner_radius=1.5,
-        )
-        self.set_font(FONT_FAMILY, "", TEXT_SIZE)
-        self.set_text_color(*self.style.font_color)
+        if self.dry_run:
+            self._dry_run_element("summary_card")
+            self._dry_run_element("summary_card_line", *items, count=len(items))
+        else:
+            self.set_fill_color(*self.style.card_background)
+            self.rect(
+                start_x,
+                start_y,
+                width,
+                card_height,
+                style="F",
+                round_corners=True,
+                corner_radius=1.5,
+            )
+            self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+            self.set_text_color(*self.style.font_color)
 
-        x = start_x + padding
-        y = start_y + padding
-        for text in items:
-            self.set_xy(x, y)
-            self.cell(width - 2 * padding, row_height, text, align="L")
-            y = y + row_height
+            x = start_x + padding
+            y = start_y + padding
+            for text in items:
+                self.set_xy(x, y)
+                self._cell(width - 2 * padding, row_height, text, align="L")
+                y = y + row_height
 
         if start_x + width >= self.w - self.r_margin:
             self.set_xy(self.l_margin, start_y + card_height + padding)
@@ -139,42 +663,196 @@ class PDF(FPDF):
             self.set_xy(start_x + width + padding, start_y)
         return start_x + width, start_y + card_height
 
+    @_hashed
+    def summary_cards(
+        self, cards: Sequence[Sequence[str]], columns: int = 2
+    ) -> tuple[float, float]:
+        """
+        Creates a grid of summary cards (see `summary_card`), filling the width between the current position and the right margin.
+        Each row of the grid is as high as its highest card, and starts a new page when it does not fit on the current page.
+
+        The text of all cards is measured in one pass, and the lines wider than the card are shortened with an ellipsis.
+        The backgrounds of the cards on a page are painted as a single path, and their text as a single text object.
+
+        After the rendering, the caret is positioned below the grid, at the left margin.
+
+        :param cards: The lines of text of each card.
+        :param columns: The number of cards in a row.
+        :return: The position of the right bottom corner of the grid.
+        """
+        if columns <= 0:
+            raise ValueError("columns must be positive")
+        if not cards:
+            return self.x, self.y
+        self.element_counts["summary_card"] += len(cards)
+        padding = _MEDIUM_SPACING
+        row_height = 6
+        left = self.x
+        width = (self.w - self.r_margin - left - (columns - 1) * padding) / columns
+        text_width = width - 2 * padding - 2 * self.c_margin
+
+        self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+        self.set_text_color(*self.style.font_color)
+        lines = [line for items in cards for line in items]
+        if self.dry_run:
+            self._dry_run_element("summary_card", count=len(cards))
+            self._dry_run_element("summary_card_line", *lines, count=len(lines))
+        widths = iter(self._measure_texts(lines))
+        backgrounds: list[str] = []
+        texts: list[tuple[float, float, str]] = []
+        baseline = 0.5 * row_height + 0.3 * self.font_size
+
+        def flush() -> None:
+            if backgrounds and not self.dry_run:
+                self.set_fill_color(*self.style.card_background)
+                self._out("\n".join(backgrounds) + " f")
+                self._text_block(texts, self.style.font_color)
+            backgrounds.clear()
+            texts.clear()
+
+        y = self.y
+        for row_start in range(0, len(cards), columns):
+            row = cards[row_start : row_start + columns]
+            card_height = max(len(items) for items in row) * row_height + 2 * padding
+            if y + card_height >= self.h - self.b_margin:
+                flush()
+                self.add_page()
+                y = self.y
+            for column, items in enumerate(row):
+                x = left + column * (width + padding)
+                height = len(items) * row_height + 2 * padding
+                backgrounds.append(
+                    rounded_rect(
+                        x * self.k,
+                        (self.h - y - height) * self.k,
+                        width * self.k,
+                        height * self.k,
+                        1.5 * self.k,
+                    )
+                )
+                line_y = y + padding
+                for text in items:
+                    if next(widths) > text_width:
+                        text = self._trim_with_ellipsis(text, int(text_width) + 1)
+                    texts.append((x + padding + self.c_margin, line_y + baseline, text))
+                    line_y += row_height
+            y += card_height + padding
+
+        flush()
+        end_y = y - padding
+        self.set_xy(self.l_margin, y)
+        return left + min(columns, len(cards)) * (width + padding) - padding, end_y
+
+    @_hashed
     def styled_table(
         self,
         headers: list[str],
-        rows: list[list[str]],
-        col_widths: list[int],
+        rows: Iterable[Sequence[str]],
+        col_widths: Union[Sequence[float], Literal["auto"]] = "auto",
+        sample_size: int = 1000,
+        exact_candidates: int = 0,
     ) -> None:
         """
         Creates a styled table with the provided headers and rows.
         The rows have alternating background colors, defined by the `table_row_colors` style property.
 
         :param headers: The titles of the columns.
-        :param rows: The rows of data to include in the table.
-        :param col_widths: The widths of the columns.
+        :param rows: The rows of data to include in the table. An iterator (e.g. a generator reading an export) is consumed while the table is drawn, without keeping the rows in memory. It is not supported in the reproducible mode.
+        :param col_widths: The widths of the columns. When set to "auto", the widths are estimated from a sample of the rows (the first `sample_size` rows of an iterator), and scaled down to the available width if needed.
+        :param sample_size: The number of rows sampled to estimate the column widths.
+        :param exact_candidates: The number of the longest sampled cells per column that are measured exactly when estimating the column widths.
         """
+        self.element_counts["styled_table"] += 1
+        if isinstance(col_widths, str):
+            sample: Sequence[Sequence[str]]
+            if isinstance(rows, Sequence):
+                sample = rows
+            else:
+                sample = list(islice(rows, sample_size))
+                rows = chain(sample, rows)
+            col_widths = self._auto_col_widths(
+                headers, sample, sample_size, exact_candidates
+            )
+
         self.set_font(FONT_FAMILY, "B", TEXT_SIZE)
         self.set_fill_color(*self.style.table_header_color)
         self.set_text_color(*self.style.font_color)
 
         for i, h in enumerate(headers):
-            self.cell(col_widths[i], 10, h, border="B", fill=True)
+            self._cell(col_widths[i], 10, h, border="B", fill=True)
         self.ln(10)
 
         # rows
         self.set_font(FONT_FAMILY, "", LABEL_SIZE)
 
         for idx, row in enumerate(rows):
+            self.element_counts["table_row"] += 1
+            if self.dry_run:
+                self._dry_run_element("table_cell", *row, count=len(row))
+                if self.will_page_break(LABEL_SIZE):
+                    self.add_page(same=True)
+                self.ln(LABEL_SIZE)
+                continue
+
             self.set_fill_color(*self.style.table_row_colors[idx % 2])
 
             for i, cell in enumerate(row):
-                self.cell(col_widths[i], LABEL_SIZE, cell, border="B", fill=True)
+                self._cell(col_widths[i], LABEL_SIZE, cell, border="B", fill=True)
             self.set_fill_color(*self.style.card_background)
             self.ln()
 
         self.set_fill_color(*self.style.card_background)
         self.set_y(self.get_y() + _LARGE_SPACING)
 
+    def _auto_col_widths(
+        self,
+        headers: list[str],
+        rows: Sequence[Sequence[str]],
+        sample_size: int,
+        exact_candidates: int,
+    ) -> list[float]:
+        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+        widths = estimate_column_widths(
+            headers,
+            rows,
+            self._char_width_table(FONT_FAMILY, "B", TEXT_SIZE),
+            self._char_width_table(FONT_FAMILY, "", LABEL_SIZE),
+            padding=2 * self.c_margin,
+            sample_size=sample_size,
+            exact_candidates=exact_candidates,
+            measure_exact=self.get_string_width,
+        )
+        available_width = self.w - self.r_margin - self.x
+        total_width = sum(widths)
+        if total_width > available_width:
+            widths = [width * available_width / total_width for width in widths]
+        return widths
+
+    def _char_width_table(self, family: str, style: str, size: float) -> CharWidthTable:
+        key = (family.lower() + style, size)
+        table = self._char_widths.get(key)
+        if table is None:
+            font: Any = self.fonts[key[0]]
+            table = CharWidthTable(
+                font.cw,
+                font.desc.missing_width,
+                size,
+                self.k,
+                ADVANCE_WIDTHS.get(style)
+                if key[0] == FONT_FAMILY.lower() + style
+                else None,
+            )
+            self._char_widths[key] = table
+        return table
+
+    def _text_width(self, text: str) -> float:
+        # equivalent to get_string_width, without fpdf's per-call text processing
+        table = self._char_width_table(
+            self.font_family, self.font_style, self.font_size_pt
+        )
+        return table.measure(text)
+
+    @_hashed
     def tag(self, text: str, color: Optional[Color] = None) -> Tuple[float, float]:
         """
         Creates a tag (rounded corners) with the provided text and color.
@@ -185,27 +863,100 @@ class PDF(FPDF):
         :param color: The background color of the tag. By default, the `background_color` style property is used.
         :return: The position of the right bottom corner of the tag.
         """
+        self.element_counts["tag"] += 1
         bg = color or self.style.background_color
         self.set_font(FONT_FAMILY, "", LABEL_SIZE)
         self.set_text_color(*self.style.font_color)
 
-        text_w = self.get_string_width(text) + _SMALL_SPACING * 2
         text_h = 5
         x, y = self.x, self.y
 
-        self.set_fill_color(*bg)
-        self.rect(
-            x, y, text_w, text_h, style="F", round_corners=True, corner_radius=1.5
-        )
-
-        self.cell(text_w, text_h, text, align="C")
+        text_w = self._text_width(text) + _SMALL_SPACING * 2
+        if self.dry_run:
+            self._dry_run_element("tag", text)
+        else:
+            self.set_fill_color(*bg)
+            self.rect(
+                x, y, text_w, text_h, style="F", round_corners=True, corner_radius=1.5
+            )
+            self._cell(text_w, text_h, text, align="C")
         self.set_x(x + text_w)
         return text_w, text_h
 
+    @_hashed
+    def tags(
+        self,
+        texts: Sequence[str],
+        color: Optional[Color] = None,
+        wrap_width: Optional[float] = None,
+    ) -> tuple[float, float]:
+        """
+        Creates a row of tags (see `tag`) separated by a small spacing.
+        The tags wrap to a new line when they exceed the wrap width, and to a new page when a line does not fit on the current page.
+
+        The text of all tags is measured in one pass. The backgrounds of the tags on a page are painted as a single path, and their text as a single text object.
+
+        After the rendering, the caret is positioned below the last line of tags, at the start of the lines.
+
+        :param texts: The texts of the tags.
+        :param color: The background color of the tags. By default, the `background_color` style property is used.
+        :param wrap_width: The width of the lines, starting at the current position. By default, the lines end at the right margin.
+        :return: The position of the right bottom corner of the last tag.
+        """
+        if not texts:
+            return self.x, self.y
+        self.element_counts["tag"] += len(texts)
+        bg = color or self.style.background_color
+        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+        self.set_text_color(*self.style.font_color)
+        if self.dry_run:
+            self._dry_run_element("tag", *texts, count=len(texts))
+
+        text_h = 5
+        left = self.x
+        right = self.w - self.r_margin if wrap_width is None else left + wrap_width
+        baseline = 0.5 * text_h + 0.3 * self.font_size
+        backgrounds: list[str] = []
+        labels: list[tuple[float, float, str]] = []
+
+        def flush() -> None:
+            if backgrounds and not self.dry_run:
+                self.set_fill_color(*bg)
+                self._out("\n".join(backgrounds) + " f")
+                self._text_block(labels, self.style.font_color)
+            backgrounds.clear()
+            labels.clear()
+
+        x, y = left, self.y
+        for text, width in zip(texts, self._measure_texts(texts)):
+            text_w = width + _SMALL_SPACING * 2
+            if x > left and x + text_w > right:
+                x, y = left, y + text_h + _SMALL_SPACING
+            if y + text_h >= self.h - self.b_margin:
+                flush()
+                self.add_page()
+                x, y = left, self.y
+            backgrounds.append(
+                rounded_rect(
+                    x * self.k,
+                    (self.h - y - text_h) * self.k,
+                    text_w * self.k,
+                    text_h * self.k,
+                    1.5 * self.k,
+                )
+            )
+            labels.append((x + (text_w - width) / 2, y + baseline, text))
+            x += text_w + _SMALL_SPACING
+
+        flush()
+        self.set_xy(left, y + text_h + _SMALL_SPACING)
+        return x - _SMALL_SPACING, y + text_h
+
     def _break_page_if_needed(self, content_height: float) -> None:
         if self.y + content_height >= self.h - self.b_margin:
             self.add_page()
 
+    @_hashed
     def task_card(
         self,
         task_id: str,
@@ -216,6 +967,7 @@ class PDF(FPDF):
         estimate: Optional[int] = None,
         flagged: bool = False,
         link: str | int = 0,
+        anchor: Optional[str] = None,
     ) -> tuple[float, float]:
         """
         Creates a task card with the provided information. The card is designed to fit to a 2-column grid.
@@ -233,97 +985,111 @@ class PDF(FPDF):
         :param priority: The priority of the task. Supported values are between 1 (highest priority) and 4 (lowest priority).
         :param estimate: The story points estimate of the task, if any.
         :param flagged: Whether the task is flagged.
-        :param link: The link to the task details page.
+        :param link: The link to the task details page. Use "#name" to link to an anchor.
+        :param anchor: The name of the anchor defined at the task card, see `anchor_link`.
         :return: The position of the right bottom corner of the task card.
         """
-        width = 77.5
+        self.element_counts["task_card"] += 1
+        width = _GRID_COLUMN_WIDTH
         height = 30
         self._break_page_if_needed(height)
+        self._define_anchor(anchor)
+        link = self._resolve_link(link)
 
         start_x, start_y = self.x, self.y
         row_height = 5
 
-        stripe_color: Color = (
-            self.style.priority_color if priority == 1 else self.style.border_color
-        )
-        self.accent_card(stripe_color, width, height)
-
-        if flagged:
-            self.set_text_color(*self.style.disabled_color)
-
-        text_start_x = start_x + 12.5
-        self.set_font(FONT_FAMILY, "B", LABEL_SIZE)
-        self.set_xy(text_start_x, start_y + 9)
-        self.cell(
-            15,
-            row_height,
-            task_id,
-            align="R",
-            link=link,
-            new_x=XPos.LEFT,
-            new_y=YPos.NEXT,
-        )
+        if self.dry_run:
+            self._dry_run_element("task_card", title, status, f"SP: {estimate}")
+            self._dry_run_chars[FONT_FAMILY.lower() + "B"].update(task_id)
+            if link:
+                self._dry_run_links += 1
+        else:
+            stripe_color: Color = (
+                self.style.priority_color if priority == 1 else self.style.border_color
+            )
+            self.accent_card(stripe_color, width, height)
 
-        _, y = self._two_line_label(status, text_start_x, self.y + 1)
-        y = y + 1
-        self.set_xy(text_start_x - 3, y + 0.2)
-        if due_date:
-            self.set_font(ICON_FONT_FAMILY, "", 7)
-            self.cell(3, row_height, DUE_DATE_ICON, align="L")
-            x, _ = self._small_label(
-                due_date.strftime("%d.%m.%Y") if due_date else "N/A",
-                text_start_x,
-                y,
+            if flagged:
+                self.set_text_color(*self.style.disabled_color)
+
+            text_start_x = start_x + 12.5
+            self.set_font(FONT_FAMILY, "B", LABEL_SIZE)
+            self.set_xy(text_start_x, start_y + 9)
+            self._cell(
+                15,
+                row_height,
+                task_id,
+                align="R",
+                new_x=XPos.LEFT,
+                new_y=YPos.NEXT,
             )
-        else:
-            x = text_start_x + 15
 
-        x, _ = self._priority_icons(priority, flagged, x + 6, y)
+            _, y = self._two_line_label(status, text_start_x, self.y + 1)
+            y = y + 1
+            text_color = self.style.disabled_color if flagged else self.style.font_color
+            if due_date:
+                self._icon(
+                    DUE_DATE_ICON,
+                    text_start_x - 3 + self.c_margin,
+                    y + 0.2 + (row_height - self._icon_size) / 2,
+                    text_color,
+                )
+                x, _ = self._small_label(
+                    due_date.strftime("%d.%m.%Y") if due_date else "N/A",
+                    text_start_x,
+                    y,
+                )
+            else:
+                x = text_start_x + 15
 
-        story_points_text = f"SP: {estimate or 'N/A'}"
-        x, _ = self._small_label(story_points_text, x, y)
-        if flagged:
-            self._flagged_icon(x + 6, y)
+            x, _ = self._priority_icons(priority, flagged, x + 6, y)
 
-        self._task_title(title, text_start_x + 15, start_y + 4, link=link)
+            story_points_text = f"SP: {estimate or 'N/A'}"
+            x, _ = self._small_label(story_points_text, x, y)
+            if flagged:
+                self._flagged_icon(x + 6, y)
 
-        self.set_text_color(*self.style.font_color)
+            self._task_title(title, text_start_x + 15, start_y + 4)
+
+            if link:
+                # a single annotation over the whole card, instead of one per line
+                self.link(start_x, start_y, width, height, link)
+            self.set_text_color(*self.style.font_color)
+        self._advance_in_grid(start_x, start_y, width, height)
+        return start_x + width, start_y + height
+
+    def _advance_in_grid(
+        self, start_x: float, start_y: float, width: float, height: float
+    ) -> None:
+        # moves to the right column if the element is in the left one, or to the next row
         if start_x == self.l_margin:
             self.set_xy(start_x + width + _MEDIUM_SPACING, start_y)
         else:
             self.set_y(start_y + height + _MEDIUM_SPACING)
-        return start_x + width, start_y + height
 
     def _task_title(self, title: str, x: float, y: float, link: str | int = 0) -> None:
         self.set_xy(x, y)
         self.set_font(FONT_FAMILY, size=TEXT_SIZE)
-        title_lines = self.multi_cell(
-            45,
-            15,
-            title,
-            max_line_height=4,
-            dry_run=True,
-            output=MethodReturnValue.LINES,
-        )
+        title_lines = self._wrap(title, 45)
         if len(title_lines) == 1:
-            self.cell(45, 5, title, align="L", link=link)
-        elif len(title_lines) < 4:
-            self.multi_cell(45, 15, title, align="L", max_line_height=4, link=link)
-        else:
-            title_lines[3] = self._trim_with_ellipsis(title_lines[3], 45)
-            title = " ".join(title_lines[0:4])
-            self.multi_cell(45, 15, title, align="L", max_line_height=4, link=link)
+            self._cell(45, 5, title, align="L", link=link)
+            return
+        if len(title_lines) >= 4:
+            trimmed = self._trim_with_ellipsis(title_lines[3], 45)
+            title_lines = self._wrap(" ".join((*title_lines[:3], trimmed)), 45)
+        self._wrapped_cell(45, 15, title_lines, "L", max_line_height=4, link=link)
 
     def _trim_with_ellipsis(self, text: str, column_width: int) -> str:
         ellipsis_chars = "..."
         trimmed_text = text
-        string_width = self.get_string_width(trimmed_text)
+        string_width = self._text_width(trimmed_text)
         words = text.split()
 
         while string_width > (column_width - 1):
             words = words[:-1]
             trimmed_text = " ".join(words) + ellipsis_chars
-            string_width = self.get_string_width(trimmed_text)
+            string_width = self._text_width(trimmed_text)
 
         return trimmed_text
 
@@ -336,41 +1102,332 @@ class PDF(FPDF):
     ) -> tuple[float, float]:
         x, y = x or self.x, y or self.y
         if priority:
-            self.set_font(ICON_FONT_FAMILY, size=ICON_FONT_SIZE)
-            self.set_xy(x, y + 0.5)
             if priority == 1:
-                self.set_text_color(*self.style.priority_color)
-
-            text = PRIORITY_ICON * (5 - priority)
-            self.cell(15, 5, text)
-            self.set_font(FONT_FAMILY, size=LABEL_SIZE)
-            if flagged:
-                self.set_text_color(*self.style.disabled_color)
+                color = self.style.priority_color
+            elif flagged:
+                color = self.style.disabled_color
             else:
-                self.set_text_color(*self.style.font_color)
+                color = self.style.font_color
+            icon_y = y + 0.5 + (5 - self._icon_size) / 2
+            self._icon(PRIORITY_ICON, x + self.c_margin, icon_y, color, 5 - priority)
         self.set_xy(x + 15, y)
         return x + 15, y + 3
 
     def _small_label(self, text: str, x: float, y: float) -> tuple[float, float]:
         self.set_font(FONT_FAMILY, "", LABEL_SIZE)
         self.set_xy(x, y)
-        self.cell(15, 5, text, align="R")
+        self._cell(15, 5, text, align="R")
         return x + 15, self.y + 3
 
     def _two_line_label(self, text: str, x: float, y: float) -> tuple[float, float]:
         self.set_font(FONT_FAMILY, "", LABEL_SIZE)
         self.set_xy(x, y)
-        self.multi_cell(15, 6, text, align="R", max_line_height=3)
+        self._wrapped_cell(15, 6, self._wrap(text, 15), "R", max_line_height=3)
 
         return x + 15, self.y
 
+    def _wrap(self, text: str, width: float) -> tuple[str, ...]:
+        """
+        Returns the lines of the text wrapped in a cell of the width with the current font, like `multi_cell`.
+        The lines are cached, as the same texts (e.g. statuses) are wrapped on every task card.
+        """
+        max_width = width - 2 * self.c_margin
+        key = (
+            text,
+            round(max_width, 6),
+            self.font_family,
+            self.font_style,
+            self.font_size_pt,
+        )
+        lines = self._wrapped_lines.get(key)
+        if lines is None:
+            if can_wrap(text):
+                lines = wrap_text(text, max_width, self._text_width)
+            else:
+                lines = tuple(
+                    self.multi_cell(
+                        width, dry_run=True, text=text, output=MethodReturnValue.LINES
+                    )
+                )
+            self._wrapped_lines.put(key, lines)
+        return lines
+
+    def _wrapped_cell(
+        self,
+        w: float,
+        h: float,
+        lines: Sequence[str],
+        align: str,
+        max_line_height: float,
+        link: str | int = 0,
+    ) -> None:
+        # draws the wrapped lines like `multi_cell(w, h, text, align, max_line_height=...)`
+        line_height = h if len(lines) == 1 else min(h, max_line_height)
+        for idx, line in enumerate(lines):
+            last = idx == len(lines) - 1
+            self._cell(
+                w,
+                line_height,
+                line,
+                align=align,
+                link=link,
+                new_x=XPos.RIGHT if last else XPos.LEFT,
+                new_y=YPos.NEXT,
+            )
+        if line_height * len(lines) < h:
+            self.y += h - line_height * len(lines)
+
     def _flagged_icon(self, x: float, y: float) -> None:
-        self.set_font(ICON_FONT_FAMILY, "", ICON_FONT_SIZE)
-        self.set_text_color(*self.style.priority_color)
-        self.set_xy(x, y + 0.3)
-        self.cell(3, 5, FLAG_ICON, align="R")
-        self.set_xy(self.x, y)
-        self.set_text_color(*self.style.disabled_color)
+        icon_x = x + 3 - self.c_margin - self._icon_size
+        icon_y = y + 0.3 + (5 - self._icon_size) / 2
+        self._icon(FLAG_ICON, icon_x, icon_y, self.style.priority_color)
+        self.set_xy(x + 3, y)
+
+    def _icon(
+        self, icon: Icon, x: float, y: float, color: Color, count: int = 1
+    ) -> float:
+        """
+        Draws the icon (repeated `count` times in a row) with its top left corner at the given position.
+        :return: The horizontal position of the right side of the last icon.
+        """
+        index = self._icon_xobject(icon)
+        self.set_fill_color(*color)
+        size = self._icon_size
+        for idx in range(count):
+            self._place_form_xobject(
+                index, x + idx * size, y + size, ICON_SIZE / ICON_GRID
+            )
+        return x + count * size
+
+    def _text_block(self, lines: list[tuple[float, float, str]], color: Color) -> None:
+        """
+        Draws single lines of text with the current font in a single text object.
+        Each line is given by the origin of its baseline and its text.
+        """
+        font: Any = self.current_font
+        self._resource_catalog.add(  # type: ignore[attr-defined]
+            PDFResourceType.FONT, font.i, self.page
+        )
+        r, g, b = color
+        fill = f"{r / 255:.4f} {g / 255:.4f} {b / 255:.4f} rg"
+        operators = [f"q {fill} BT /F{font.i} {self.font_size_pt:.2f} Tf"]
+        for x, y, text in lines:
+            operators.append(
+                f"1 0 0 1 {x * self.k:.2f} {(self.h - y) * self.k:.2f} Tm"
+                f" {font.encode_text(self.normalize_text(text))}"
+            )
+        operators.append("ET Q")
+        self._out("\n".join(operators))
+
+    def _cell(
+        self,
+        w: float,
+        h: float,
+        text: str,
+        align: str = "L",
+        border: str | int = 0,
+        fill: bool = False,
+        new_x: XPos = XPos.RIGHT,
+        new_y: YPos = YPos.TOP,
+        link: str | int = 0,
+    ) -> None:
+        """
+        Draws a single line of plain text like `cell`, writing the operators directly to the page content.
+        The components draw thousands of such cells (e.g. the labels of the task cards and the table cells), and most of the time of `cell` goes to the text processing they do not need.
+        Anything else (e.g. a page break or a text style) is drawn by `cell`.
+
+        :param border: 0, 1 or "B".
+        :param new_x: XPos.RIGHT, XPos.LEFT or XPos.LMARGIN.
+        :param new_y: YPos.TOP or YPos.NEXT.
+        """
+        if not self._can_emit_cell(text, h, align, border, new_x, new_y):
+            self.cell(
+                w,
+                h,
+                text,
+                align=align,
+                border=border,  # type: ignore[arg-type]
+                fill=fill,
+                new_x=new_x,
+                new_y=new_y,
+                link=link,
+            )
+            return
+        k = self.k
+        if w == 0:
+            w = self.w - self.r_margin - self.x
+        left, right = self.x * k, (self.x + w) * k
+        top, bottom = (self.h - self.y) * k, (self.h - (self.y + h)) * k
+        operators = []
+        if fill or border == 1:
+            paint = ("B" if border == 1 else "f") if fill else "S"
+            operators.append(
+                f"{left:.2f} {top:.2f} {right - left:.2f} {bottom - top:.2f} re {paint}"
+            )
+        if border == "B":
+            operators.append(f"{left:.2f} {bottom:.2f} m {right:.2f} {bottom:.2f} l S")
+        local_color = False
+        if text:
+            font: Any = self.current_font
+            if not self.current_font_is_set_on_page:
+                # the font is selected in the page content, before the cell
+                self._out(self._set_font_for_page(font, self.font_size_pt))  # type: ignore[attr-defined]
+            text_width = self._text_width(text)
+            if align == "R":
+                dx = w - self.c_margin - text_width
+            elif align == "C":
+                dx = (w - text_width) / 2
+            else:
+                dx = self.c_margin
+            operators.append(
+                f"BT {(self.x + dx) * k:.2f}"
+                f" {(self.h - self.y - 0.5 * h - 0.3 * self.font_size) * k:.2f} Td"
+            )
+            if self.text_color != self.fill_color:
+                operators.append(self.text_color.serialize().lower())
+                local_color = True
+            operators.append(font.encode_text(text))
+            operators.append("ET")
+        if operators:
+            content = " ".join(operators)
+            self._out(f"q {content} Q" if local_color else content)
+        if link and text:
+            self.link(
+                self.x + dx,
+                self.y + 0.5 * h - 0.5 * self.font_size,
+                text_width,
+                self.font_size,
+                link,
+            )
+        self._lasth = h
+        if new_x == XPos.RIGHT:
+            self.x += w
+        elif new_x == XPos.LMARGIN:
+            self.x = self.l_margin
+        if new_y == YPos.NEXT:
+            self.y += h
+
+    def _can_emit_cell(
+        self,
+        text: str,
+        h: float,
+        align: str,
+        border: str | int,
+        new_x: XPos,
+        new_y: YPos,
+    ) -> bool:
+        # the plain text of an embedded font, without the per-fragment text state of fpdf
+        # (fpdf internals, missing in the type stubs)
+        doc: Any = self
+        return (
+            not self.dry_run
+            and self.is_ttf_font
+            and not getattr(self.current_font, "is_symbol", False)
+            and not self.will_page_break(h)
+            and h > 0
+            and align in ("L", "R", "C")
+            and border in (0, 1, "B")
+            and new_x in (XPos.RIGHT, XPos.LEFT, XPos.LMARGIN)
+            and new_y in (YPos.TOP, YPos.NEXT)
+            and not self.text_shaping
+            and not doc._fallback_font_ids
+            and not self.underline
+            and not self.strikethrough
+            and self.font_stretching == 100
+            and self.char_spacing == 0
+            and self.text_mode == TextMode.FILL
+            and self.char_vpos == CharVPos.LINE
+            and not doc._record_text_quad_points
+            and (not self.str_alias_nb_pages or self.str_alias_nb_pages not in text)
+        )
+
+    @property
+    def _icon_size(self) -> float:
+        return ICON_SIZE / self.k
+
+    def _icon_xobject(self, icon: Icon) -> int:
+        # each icon is compiled once, and drawn with a single operator afterwards
+        form = self._form_xobjects.get(icon)
+        if form is not None:
+            return form.index
+        return self._form_xobject(
+            icon, compile_icon(icon), (0, 0, ICON_GRID, ICON_GRID)
+        )
+
+    def _form_xobject(
+        self, key: Hashable, content: str, b_box: tuple[float, float, float, float]
+    ) -> int:
+        """
+        Registers a Form XObject (a reusable drawing) once per document.
+
+        :param key: The key identifying the drawing, e.g. the icon.
+        :param content: The drawing operators, in the coordinates of the bounding box.
+        :param b_box: The bounding box of the drawing (left, bottom, right, top).
+        :return: The index of the XObject.
+        """
+        form = self._form_xobjects.get(key)
+        if form is not None:
+            return form.index
+        index = self._xobject_index()
+        xobject: Any = PDFContentStream(
+            content.encode("latin-1"), compress=self.compress
+        )
+        xobject.type = Name("XObject")
+        xobject.subtype = Name("Form")
+        xobject.b_box = PDFArray(list(b_box))
+        xobject._registered = False
+        self._resource_catalog.form_xobjects.append(  # type: ignore[attr-defined]
+            (index, xobject)
+        )
+        self._form_xobjects[key] = FormXObject(index, content, b_box)
+        return index
+
+    def _xobject_index(self) -> int:
+        """
+        Reserves the index of a new XObject from the counter of fpdf's resource catalog.
+
+        fpdf numbers the images by the size of the image cache instead, so the index also
+        follows the indices of the images and of the Form XObjects already registered.
+
+        :return: The index of the XObject.
+        """
+        catalog: Any = self._resource_catalog  # type: ignore[attr-defined]
+        indices: list[int] = [info["i"] for info in self.image_cache.images.values()]
+        indices.extend(form.index for form in self._form_xobjects.values())
+        index: int = max([catalog.next_xobject_index - 1, *indices]) + 1
+        catalog.next_xobject_index = index + 1
+        return index
+
+    def _preload_image(self, image: bytes) -> None:
+        """
+        Caches an image before it is drawn, so that a new image whose index is already taken
+        (by a Form XObject or an appended image) is moved to a free index.
+
+        :param image: The encoded image.
+        """
+        name, _, info = preload_image(self.image_cache, BytesIO(image))
+        # drawing the image counts its usage again
+        info["usages"] -= 1
+        if info["usages"]:
+            return
+        taken = {form.index for form in self._form_xobjects.values()}
+        taken.update(
+            other["i"] for key, other in self.image_cache.images.items() if key != name
+        )
+        if info["i"] in taken:
+            info["i"] = self._xobject_index()
+
+    def _place_form_xobject(
+        self, index: int, x: float, y: float, scale: float = 1
+    ) -> None:
+        # (x, y) is the bottom left corner of the bounding box, in user units
+        self._resource_catalog.add(  # type: ignore[attr-defined]
+            PDFResourceType.X_OBJECT, index, self.page
+        )
+        self._out(
+            f"q {scale:.4f} 0 0 {scale:.4f} {x * self.k:.2f} {(self.h - y) * self.k:.2f}"
+            f" cm /I{index} Do Q"
+        )
 
     def _plot_bar_chart(
         self,
@@ -399,30 +1456,35 @@ class PDF(FPDF):
         if limit is not None:
             max_value = max(max_value, limit)
 
-        self._draw_gridlines(x, start_y, height, width)
-
         x += spacing
+        if self.dry_run:
+            self._dry_run_element("bar_plot")
+            self._dry_run_element("bar", count=len(values))
+            return x + len(values) * (bar_width + spacing) - spacing, start_y + height
 
+        self._draw_gridlines(start_x, start_y, height, width)
+
+        # the bars of the same color are painted as a single compound path
+        bars: defaultdict[Color, list[str]] = defaultdict(list)
+        bottom = (self.h - start_y - height) * self.k
+        colors = self.style.chart_colors
         for index, value in enumerate(values):
             if value > 0:
-                self.set_fill_color(
-                    *self.style.chart_colors[index % len(self.style.chart_colors)]
-                )
                 bar_height = height * value / max_value
-                y = start_y + height - bar_height
-                if bar_height > 0.7:
-                    self.rect(
-                        x,
-                        y,
-                        bar_width,
-                        bar_height,
-                        style="F",
-                        round_corners=True,
-                        corner_radius=0.5,
+                radius = _BAR_CORNER_RADIUS if bar_height > 0.7 else 0
+                bars[colors[index % len(colors)]].append(
+                    rounded_rect(
+                        x * self.k,
+                        bottom,
+                        bar_width * self.k,
+                        bar_height * self.k,
+                        radius * self.k,
                     )
-                else:
-                    self.rect(x, y, bar_width, bar_height, style="F")
+                )
             x += bar_width + spacing
+        for color, paths in bars.items():
+            self.set_fill_color(*color)
+            self._out("\n".join(paths) + " f")
 
         if limit is not None:
             limit_line_y = start_y + height - height * limit / max_value
@@ -436,19 +1498,37 @@ class PDF(FPDF):
     def _draw_gridlines(
         self, x: float, start_y: float, height: float, width: float
     ) -> None:
+        # the gridlines of the charts of the same size are drawn from a shared template
         self.set_draw_color(*self.style.border_color)
-        y = start_y
-        while y < start_y + height:
-            self.line(x, y, width, y)
-            y += 5
+        length, top = (width - x) * self.k, height * self.k
+        key = ("gridlines", round(length, 2), round(top, 2))
+        form = self._form_xobjects.get(key)
+        if form is not None:
+            index = form.index
+        else:
+            ys = []
+            offset = 0.0
+            while offset < height:
+                ys.append(top - offset * self.k)
+                offset += _GRIDLINE_SPACING
+            # the bounding box leaves room for the line width
+            index = self._form_xobject(
+                key, horizontal_lines(length, ys) + "\nS", (-2, -2, length + 2, top + 2)
+            )
+        self._place_form_xobject(index, x, start_y + height)
 
+    @_hashed
     def bar_chart(
         self,
-        data: Mapping[K, float],
+        data: ChartData[K],
         caption: str,
         height: float = 30,
         wide: bool = False,
         limit: Optional[float] = None,
+        top_n: Optional[int] = None,
+        other_label: str = "Other",
+        bins: Optional[Bins] = None,
+        labels: Optional[Sequence[str]] = None,
     ) -> tuple[float, float]:
         """
         Creates a bar chart with the provided data. The chart is designed to fit to a 2-column grid.
@@ -456,25 +1536,29 @@ class PDF(FPDF):
 
         It automatically creates a new page if the chart does not fit on the current page.
 
-        :param data: The data to display in the bar chart, as a mapping of labels to values. The ideal data size is <= 12, for more data points consider using the wide chart or a pie chart.
+        :param data: The data to display in the bar chart, as a mapping of labels to values (displayed in the order of the labels), or as array-like values with `labels` (displayed in their order). The ideal data size is <= 12, for more data points consider using the wide chart or a pie chart.
         :param caption: The caption of the chart, displayed above the legend.
         :param height: The height of the chart.
         :param wide: When set to True, the chart is displayed to fit to the available page width.
         :param limit: Optional limit to be displayed as a horizontal line on the chart.
+        :param top_n: When set, only the `top_n` largest values are displayed (ordered by value), and the rest is summed up in a single bar.
+        :param other_label: The label of the bar summing up the values outside the top N.
+        :param bins: When set, the chart displays the number of data points in each bin of values instead of the values. Either the number of equal-width bins, or the bin edges.
+        :param labels: The labels of array-like data (e.g. a NumPy array, pandas Series or Arrow array), indexed by position. By default, the values are labeled by their position. The array is reduced with vectorized operations, see `aggregate_array`.
         :return:
         """
-        if not data.keys():
+        items = self._chart_items(data, labels, top_n, other_label, bins, True)
+        if not items:
             return self.x, self.y
 
+        self.element_counts["bar_chart"] += 1
         self._break_page_if_needed(height)
         start_x, start_y = self.x, self.y
-
-        sorted_labels = sorted(data)
-        values = [data[label] for label in sorted_labels]
+        values = [value for _, value in items]
         chart_width = 40 if wide else 28
 
         x, y = self._plot_bar_chart(values, height, chart_width, limit)
-        if len(data.keys()) > 12:
+        if len(items) > 12:
             x, y = start_x, y + _SMALL_SPACING
         else:
             x, y = x + _SMALL_SPACING, start_y + _SMALL_SPACING
@@ -482,7 +1566,7 @@ class PDF(FPDF):
         legend_start_x = x + _MEDIUM_SPACING if wide else start_x + 30
         legend_start_y = start_y + _SMALL_SPACING if height >= 30 else start_y - 1
 
-        legend_labels = [f"{key} ({data[key]:.2f})" for key in sorted_labels]
+        legend_labels = [f"{key} ({value:.2f})" for key, value in items]
         x, y = self._legend(legend_labels, legend_start_x, legend_start_y, caption)
         end_x = x
         if start_x == self.l_margin:
@@ -491,11 +1575,16 @@ class PDF(FPDF):
             self.set_xy(self.l_margin, y + _LARGE_SPACING)
         return end_x, y
 
+    @_hashed
     def pie_chart(
         self,
-        data: Mapping[K, float],
+        data: ChartData[K],
         caption: str,
         height: float = 30,
+        top_n: Optional[int] = None,
+        other_label: str = "Other",
+        bins: Optional[Bins] = None,
+        labels: Optional[Sequence[str]] = None,
     ) -> tuple[float, float]:
         """
         Creates a pie chart with the provided data. The chart is designed to fit to a 2-column grid.
@@ -503,32 +1592,137 @@ class PDF(FPDF):
 
         It automatically creates a new page if the chart does not fit on the current page.
 
-        :param data: The data to display in the bar chart, as a mapping of labels to values.
+        :param data: The data to display in the pie chart, as a mapping of labels to values, or as array-like values with `labels`.
         :param caption: The caption of the chart, displayed above the legend.
         :param height: The height of the chart.
+        :param top_n: When set, only the `top_n` largest values are displayed (ordered by value), and the rest is summed up in a single slice.
+        :param other_label: The label of the slice summing up the values outside the top N.
+        :param bins: When set, the chart displays the number of data points in each bin of values instead of the values. Either the number of equal-width bins, or the bin edges.
+        :param labels: The labels of array-like data (e.g. a NumPy array, pandas Series or Arrow array), indexed by position. By default, the values are labeled by their position. The array is reduced with vectorized operations, see `aggregate_array`.
         :return:
+        :raises ValueError: When a value is negative, also in the dry-run mode.
         """
         self._break_page_if_needed(height)
 
-        self.set_x(self.x - _SMALL_SPACING)
-        img_buf = build_pie_chart_bytes(
-            list(data.values()), colors=self.style.chart_colors
-        )
+        items = self._chart_items(data, labels, top_n, other_label, bins, False)
+        values = [value for _, value in items]
+        if any(value < 0 for value in values):
+            raise ValueError("The values of a pie chart must not be negative")
 
-        if img_buf is None:
+        self.set_x(self.x - _SMALL_SPACING)
+        if sum(values) == 0:
             return self.x, self.y
 
         start_x = self.x
         x, y = self.x, self.y
-        self.image(img_buf, x=x, y=y, w=height)
+        if not self.dry_run:
+            image = self._pie_chart_image(values, height)
+            if image is None:
+                return self.x, self.y
+            self._preload_image(image)
+            info = self.image(BytesIO(image), x=x, y=y, w=height)
+            self._track_image(info)
+            self._chart_sources[info["i"]] = (tuple(values), height)
+        self.element_counts["pie_chart"] += 1
+        self._chart_slices[tuple(values)] = len(values)
         self.set_xy(x + height, y)
 
-        if len(data.keys()) > 12:
+        if len(items) > 12:
             legend_x, legend_y = start_x, y + height + _SMALL_SPACING
         else:
             legend_x = x + height + _MEDIUM_SPACING
             legend_y = y + _SMALL_SPACING
-        legend_labels = [f"{key} ({data[key]})" for key in data.keys()]
+        legend_labels = [f"{key} ({value})" for key, value in items]
+        end_x, end_y = self._legend(legend_labels, legend_x, legend_y, caption)
+        if x <= self.l_margin:
+            self.set_xy(end_x + _LARGE_SPACING, y)
+        else:
+            self.set_xy(self.l_margin, y + height + _LARGE_SPACING)
+        return end_x, end_y
+
+    def _pie_chart_image(self, values: list[float], size: float) -> Optional[bytes]:
+        # the identical charts (e.g. per team) are rendered once, and embedded once by the image cache
+        key = (tuple(values), round(size, 2))
+        image = self._chart_images.get(key)
+        if image is None:
+            buf = build_pie_chart_bytes(
+                values,
+                size=size,
+                colors=self.style.chart_colors,
+                backend=self.chart_backend,
+            )
+            if buf is None:
+                return None
+            image = buf.getvalue()
+            self._chart_images.put(key, image)
+        return image
+
+    @_hashed
+    def donut(
+        self,
+        data: ChartData[K],
+        caption: str,
+        height: float = 30,
+        top_n: Optional[int] = None,
+        other_label: str = "Other",
+        bins: Optional[Bins] = None,
+        labels: Optional[Sequence[str]] = None,
+    ) -> tuple[float, float]:
+        """
+        Creates a donut chart with the provided data. The chart is designed to fit to a 2-column grid.
+        Unlike `pie_chart`, the chart is drawn with vector paths, without an embedded image.
+        The chart is displayed with a legend, consisting of provided labels and values.
+
+        It automatically creates a new page if the chart does not fit on the current page.
+
+        :param data: The data to display in the donut chart, as a mapping of labels to values, or as array-like values with `labels`.
+        :param caption: The caption of the chart, displayed above the legend.
+        :param height: The height (and width) of the chart.
+        :param top_n: When set, only the `top_n` largest values are displayed (ordered by value), and the rest is summed up in a single slice.
+        :param other_label: The label of the slice summing up the values outside the top N.
+        :param bins: When set, the chart displays the number of data points in each bin of values instead of the values. Either the number of equal-width bins, or the bin edges.
+        :param labels: The labels of array-like data, indexed by position, see `bar_chart`.
+        :return: The position of the right bottom corner of the legend.
+        :raises ValueError: When a value is negative.
+        """
+        items = self._chart_items(data, labels, top_n, other_label, bins, False)
+        values = [value for _, value in items]
+        if any(value < 0 for value in values):
+            raise ValueError("The values of a donut chart must not be negative")
+        total = sum(values)
+        if total == 0:
+            return self.x, self.y
+
+        self._break_page_if_needed(height)
+        self.element_counts["donut"] += 1
+        x, y = self.x, self.y
+        if self.dry_run:
+            self._dry_run_element("donut_slice", count=len(values))
+        else:
+            radius = height / 2 * self.k
+            cx, cy = x * self.k + radius, (self.h - y) * self.k - radius
+            colors = self.style.chart_colors
+            # the slices start at the top, clockwise like in `pie_chart`
+            angle = 90.0
+            for index, value in enumerate(values):
+                if value == 0:
+                    continue
+                sweep = 360 * value / total
+                self.set_fill_color(*colors[index % len(colors)])
+                self._out(
+                    annular_sector(
+                        cx, cy, radius, radius * _DONUT_HOLE, angle, angle - sweep
+                    )
+                    + " f"
+                )
+                angle -= sweep
+
+        if len(items) > 12:
+            legend_x, legend_y = x, y + height + _SMALL_SPACING
+        else:
+            legend_x = x + height + _MEDIUM_SPACING
+            legend_y = y + _SMALL_SPACING
+        legend_labels = [f"{key} ({value})" for key, value in items]
         end_x, end_y = self._legend(legend_labels, legend_x, legend_y, caption)
         if x <= self.l_margin:
             self.set_xy(end_x + _LARGE_SPACING, y)
@@ -536,6 +1730,161 @@ class PDF(FPDF):
             self.set_xy(self.l_margin, y + height + _LARGE_SPACING)
         return end_x, end_y
 
+    @_hashed
+    def gauge(
+        self,
+        value: float,
+        caption: str,
+        maximum: float = 100,
+        height: float = 20,
+        color: Optional[Color] = None,
+    ) -> tuple[float, float]:
+        """
+        Creates a half-circle gauge showing the value as a percentage of the maximum, with a caption on the right.
+        The gauge is designed to fit to a 2-column grid.
+
+        It automatically creates a new page if the gauge does not fit on the current page.
+        After the rendering, the caret is positioned to the right column (if it started at the left margin), or the left column below.
+
+        :param value: The value to display. Values outside of 0 and `maximum` are clamped.
+        :param caption: The caption of the gauge.
+        :param maximum: The value of a full gauge.
+        :param height: The height of the gauge. The width of the arc is twice the height.
+        :param color: The color of the value arc. By default, the first of the `chart_colors` style property.
+        :return: The position of the right bottom corner of the gauge.
+        :raises ValueError: When the maximum is not positive.
+        """
+        if maximum <= 0:
+            raise ValueError("maximum must be positive")
+        self._break_page_if_needed(height)
+        self.element_counts["gauge"] += 1
+        start_x, start_y = self.x, self.y
+        fraction = min(max(value / maximum, 0.0), 1.0)
+        percentage = f"{fraction:.0%}"
+        detail = f"{value:g} / {maximum:g}"
+
+        if self.dry_run:
+            self._dry_run_element("gauge", caption, percentage, detail)
+        else:
+            radius = height * self.k
+            cx, cy = start_x * self.k + radius, (self.h - start_y) * self.k - radius
+            self.set_fill_color(*self.style.border_color)
+            track = annular_sector(cx, cy, radius, radius * _GAUGE_HOLE, 180, 0)
+            self._out(track + " f")
+            if fraction > 0:
+                self.set_fill_color(*(color or self.style.chart_colors[0]))
+                arc = annular_sector(
+                    cx, cy, radius, radius * _GAUGE_HOLE, 180, 180 - 180 * fraction
+                )
+                self._out(arc + " f")
+
+            self.set_text_color(*self.style.font_color)
+            self.set_font(FONT_FAMILY, "B", TEXT_SIZE)
+            self.set_xy(start_x, start_y + height - 5)
+            self.cell(2 * height, 5, percentage, align="C")
+            text_x = start_x + 2 * height + _MEDIUM_SPACING
+            self.set_font(FONT_FAMILY, "", 9)
+            self.set_xy(text_x, start_y + _SMALL_SPACING)
+            self.cell(0, 5, caption, align="L")
+            self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+            self.set_xy(text_x, start_y + _SMALL_SPACING + 5)
+            self.cell(0, 5, detail, align="L")
+            self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+
+        self._advance_in_grid(start_x, start_y, _GRID_COLUMN_WIDTH, height)
+        return start_x + _GRID_COLUMN_WIDTH, start_y + height
+
+    @_hashed
+    def progress_bar(
+        self,
+        value: float,
+        caption: str,
+        maximum: float = 100,
+        wide: bool = False,
+        color: Optional[Color] = None,
+    ) -> tuple[float, float]:
+        """
+        Creates a progress bar with a caption and the percentage of the maximum. The bar is designed to fit to a 2-column grid.
+
+        It automatically creates a new page if the bar does not fit on the current page.
+        After the rendering, the caret is positioned to the right column (if it started at the left margin), or the left column below.
+
+        :param value: The value to display. Values outside of 0 and `maximum` are clamped.
+        :param caption: The caption of the bar, displayed above it.
+        :param maximum: The value of a full bar.
+        :param wide: When set to True, the bar spans the available page width.
+        :param color: The color of the progress. By default, the first of the `chart_colors` style property.
+        :return: The position of the right bottom corner of the bar.
+        :raises ValueError: When the maximum is not positive.
+        """
+        if maximum <= 0:
+            raise ValueError("maximum must be positive")
+        height = 5 + _SMALL_SPACING + _PROGRESS_BAR_HEIGHT
+        self._break_page_if_needed(height)
+        self.element_counts["progress_bar"] += 1
+        start_x, start_y = self.x, self.y
+        width = self.w - self.r_margin - start_x if wide else _GRID_COLUMN_WIDTH
+        fraction = min(max(value / maximum, 0.0), 1.0)
+        percentage = f"{fraction:.0%}"
+
+        if self.dry_run:
+            self._dry_run_element("progress_bar", caption, percentage)
+        else:
+            self.set_text_color(*self.style.font_color)
+            self.set_font(FONT_FAMILY, "B", LABEL_SIZE)
+            percentage_width = self._text_width(percentage) + 2 * self.c_margin
+            self.set_xy(start_x + width - percentage_width, start_y)
+            self.cell(percentage_width, 5, percentage, align="R")
+            self.set_font(FONT_FAMILY, "", 9)
+            caption_width = width - percentage_width - _SMALL_SPACING
+            if self._text_width(caption) + 2 * self.c_margin > caption_width:
+                caption = self._trim_with_ellipsis(caption, int(caption_width))
+            self.set_xy(start_x, start_y)
+            self.cell(caption_width, 5, caption, align="L")
+            self.set_font(FONT_FAMILY, "", TEXT_SIZE)
+
+            bottom = (self.h - start_y - height) * self.k
+            bar_height = _PROGRESS_BAR_HEIGHT * self.k
+            radius = bar_height / 2
+            self.set_fill_color(*self.style.border_color)
+            track = rounded_rect(
+                start_x * self.k, bottom, width * self.k, bar_height, radius
+            )
+            self._out(track + " f")
+            if fraction > 0:
+                self.set_fill_color(*(color or self.style.chart_colors[0]))
+                bar = rounded_rect(
+                    start_x * self.k,
+                    bottom,
+                    width * fraction * self.k,
+                    bar_height,
+                    radius,
+                )
+                self._out(bar + " f")
+
+        if wide:
+            self.set_y(start_y + height + _MEDIUM_SPACING)
+        else:
+            self._advance_in_grid(start_x, start_y, width, height)
+        return start_x + width, start_y + height
+
+    def _chart_items(
+        self,
+        data: ChartData[K],
+        labels: Optional[Sequence[str]],
+        top_n: Optional[int],
+        other_label: str,
+        bins: Optional[Bins],
+        sort_labels: bool,
+    ) -> list[tuple[str, float]]:
+        if not isinstance(data, Mapping):
+            return aggregate_array(data, labels, top_n, other_label, bins)
+        if top_n is not None or bins is not None:
+            return aggregate_items(data, top_n, other_label, bins)
+        if sort_labels:
+            return [(label, data[label]) for label in sorted(data)]
+        return list(data.items())
+
     def _legend(
         self, labels: list[str], x: float, y: float, caption: str
     ) -> tuple[float, float]:
@@ -543,21 +1892,55 @@ class PDF(FPDF):
         self.set_font(FONT_FAMILY, "", 9)
         self.cell(0, 5, caption, align="L", new_y=YPos.NEXT)
         legend_start_y = self.y + _SMALL_SPACING
-        next_column_x = x + _SMALL_SPACING
-        max_y = y
 
-        legend_colors = self.style.chart_colors
-        for idx, label in enumerate(labels):
-            if idx % 4 == 0:
-                self.set_xy(next_column_x, legend_start_y)
-            color = legend_colors[idx % len(legend_colors)]
-            x, y = self.legend_label(color, label)
-            next_column_x = max(next_column_x, x + _LARGE_SPACING)
+        self.set_font(FONT_FAMILY, size=LABEL_SIZE)
+        self.set_text_color(*self.style.font_color)
+        layout = self._legend_layout(labels, x, legend_start_y)
 
-            max_y = max(max_y, y)
+        legend_colors = self.style.chart_colors
+        column_offsets = layout.column_offsets
+        for entry in layout.entries:
+            if self.dry_run:
+                self._dry_run_element("legend_label", entry.label)
+                continue
+            entry_x = x + column_offsets[entry.column]
+            entry_y = legend_start_y + entry.row * LEGEND_ROW_HEIGHT
+            if entry.color_index is None:
+                color = self.style.disabled_color
+            else:
+                color = legend_colors[entry.color_index % len(legend_colors)]
+            self.set_fill_color(*color)
+            self.ellipse(entry_x + 1, entry_y + 1.5, 2, 2, style="F")
+            self.set_xy(entry_x + LEGEND_DOT_WIDTH, entry_y)
+            self._cell(15, LEGEND_ROW_HEIGHT, entry.label)
 
-        return next_column_x, max_y
+        self.set_font(FONT_FAMILY, size=TEXT_SIZE)
+        self.set_xy(x, legend_start_y + layout.height)
+        return x + layout.width, max(y, legend_start_y + layout.height)
+
+    def _legend_layout(self, labels: list[str], x: float, y: float) -> LegendLayout:
+        max_width = self.w - self.r_margin - x
+        max_height = self.h - self.b_margin - y
+        key = (
+            tuple(labels),
+            self.font_family,
+            self.font_size_pt,
+            round(max_width, 2),
+            round(max_height, 2),
+        )
+        layout = self._legend_layouts.get(key)
+        if layout is None:
+            layout = layout_legend(labels, self._measure_texts, max_width, max_height)
+            self._legend_layouts.put(key, layout)
+        return layout
+
+    def _measure_texts(self, texts: Sequence[str]) -> list[float]:
+        table = self._char_width_table(
+            self.font_family, self.font_style, self.font_size_pt
+        )
+        return [table.measure(text) for text in texts]
 
+    @_hashed
     def legend_label(self, color: Color, label: str) -> tuple[float, float]:
         """
         Generates a legend label with a colored dot. The label object has the height of 5mm.
@@ -571,12 +1954,13 @@ class PDF(FPDF):
         self.set_x(start_x + 3)
         self.set_font(FONT_FAMILY, size=LABEL_SIZE)
         self.set_text_color(*self.style.font_color)
-        text_length = self.get_string_width(label)
-        self.cell(15, 5, label, new_y=YPos.NEXT)
+        text_length = self._text_width(label)
+        self._cell(15, 5, label, new_y=YPos.NEXT)
         self.set_font(FONT_FAMILY, size=TEXT_SIZE)
         self.set_x(start_x)
         return start_x + text_length, self.y
 
+    @_hashed
     def accent_card(self, accent_color: Color, width: float, height: float) -> None:
         """
         Creates a card with an accent color stripe.
@@ -0,0 +1,122 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import PURPLE_HAZE, Style
+
+
+class PDFPool:
+    """
+    A thread-safe pool of pre-initialized report generators.
+
+    Creating a `PDF` registers the fonts and binds the style, which is expensive compared to rendering a small report.
+    The pool keeps the returned generators and resets them cheaply (see `PDF.reset`) instead.
+
+    :param style: The style of the generators.
+    :param max_idle: The maximum number of idle generators kept in the pool.
+    :param max_instances: The maximum number of generators in use at the same time. When reached, `acquire` blocks until a generator is released. Unlimited by default.
+    :param kwargs: Additional arguments passed to the `PDF` constructor.
+    """
+
+    def __init__(
+        self,
+        style: Style = PURPLE_HAZE,
+        max_idle: int = 4,
+        max_instances: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        if max_idle < 0:
+            raise ValueError("max_idle must not be negative")
+        if max_instances is not None and max_instances <= 0:
+            raise ValueError("max_instances must be positive")
+        self.style = style
+        self.max_idle = max_idle
+        self.max_instances = max_instances
+        self._kwargs = kwargs
+        self._idle: list[PDF] = []
+        # the ids of the generators that were acquired and not released yet
+        self._in_use: set[int] = set()
+        self._lock = threading.Lock()
+        self._slots = (
+            threading.BoundedSemaphore(max_instances) if max_instances else None
+        )
+
+    @property
+    def idle(self) -> int:
+        """
+        The number of idle generators in the pool.
+        """
+        with self._lock:
+            return len(self._idle)
+
+    def prewarm(self, count: int) -> None:
+        """
+        Creates idle generators up to the given count (but at most `max_idle`).
+        """
+        while self.idle < min(count, self.max_idle):
+            pdf = self._create()
+            with self._lock:
+                if len(self._idle) >= self.max_idle:
+                    return
+                self._idle.append(pdf)
+
+    def acquire(self, timeout: Optional[float] = None) -> PDF:
+        """
+        Takes a generator from the pool, creating a new one if there is no idle generator.
+
+        :param timeout: The maximum time in seconds to wait when `max_instances` generators are in use.
+        :return: A generator ready for a new report.
+        :raises TimeoutError: When no generator could be acquired in time.
+        """
+        if self._slots is not None and not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No PDF generator available in the pool")
+        with self._lock:
+            pdf = self._idle.pop() if self._idle else None
+        if pdf is None:
+            try:
+                pdf = self._create()
+            except BaseException:
+                # the slot of a generator that could not be created is not held
+                if self._slots is not None:
+                    self._slots.release()
+                raise
+        with self._lock:
+            self._in_use.add(id(pdf))
+        return pdf
+
+    def release(self, pdf: PDF) -> None:
+        """
+        Returns a generator to the pool. The generator is reset, and must not be used by the caller anymore.
+
+        :raises ValueError: When the generator was not acquired from the pool, or was already released.
+        """
+        with self._lock:
+            if id(pdf) not in self._in_use:
+                raise ValueError("The PDF generator is not in use from this pool")
+            self._in_use.remove(id(pdf))
+        try:
+            pdf.reset()
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(pdf)
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    @contextmanager
+    def pdf(self, timeout: Optional[float] = None) -> Iterator[PDF]:
+        """
+        Acquires a generator for the duration of the `with` block.
+
+        :param timeout: The maximum time in seconds to wait for a generator, see `acquire`.
+        """
+        pdf = self.acquire(timeout)
+        try:
+            yield pdf
+        finally:
+            self.release(pdf)
+
+    def _create(self) -> PDF:
+        return PDF(self.style, **self._kwargs)
@@ -0,0 +1,123 @@
+"""
+Support of the reproducible output: the pinned generation time and the hash of the
+inputs of a report.
+
+The hash is computed from the element calls (their names and arguments), so it is
+available before anything is rendered, e.g. in the dry-run mode.
+"""
+
+import dataclasses
+import hashlib
+import os
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+
+import numpy as np
+
+SOURCE_DATE_EPOCH: str = "SOURCE_DATE_EPOCH"
+
+
+def pinned_time(generation_time: Optional[datetime] = None) -> datetime:
+    """
+    Returns the generation time of a reproducible report.
+
+    :param generation_time: The explicit generation time. When not set, the `SOURCE_DATE_EPOCH` environment variable (seconds since the epoch) is used, see https://reproducible-builds.org/specs/source-date-epoch/.
+    :return: The generation time.
+    :raises ValueError: When no generation time is set and `SOURCE_DATE_EPOCH` is not set or invalid.
+    """
+    if generation_time is not None:
+        return generation_time
+    epoch = os.environ.get(SOURCE_DATE_EPOCH)
+    if epoch is None:
+        raise ValueError(
+            f"Reproducible reports need a generation_time or {SOURCE_DATE_EPOCH}"
+        )
+    try:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    except ValueError as e:
+        raise ValueError(f"Invalid {SOURCE_DATE_EPOCH}: '{epoch}'") from e
+
+
+class InputHash:
+    """
+    An incremental SHA-256 hash of the calls building a report.
+
+    The values are encoded with their type and length, so that different calls never share an encoding.
+    Supported values are None, numbers, strings, bytes, dates, enums, dataclasses (e.g. `Style`), mappings,
+    sequences and array-like objects (hashed by their dtype, shape and raw data).
+    """
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+
+    def update(self, name: str, *values: Any) -> None:
+        """
+        Adds a call to the hash.
+
+        :param name: The name of the call.
+        :param values: The arguments of the call.
+        :raises TypeError: When a value of an unsupported type is passed.
+        """
+        self._encode(name)
+        self._encode(values)
+
+    def hexdigest(self) -> str:
+        """
+        Returns the hash of the calls added so far.
+        """
+        return self._hash.hexdigest()
+
+    def _write(self, tag: bytes, payload: bytes = b"") -> None:
+        self._hash.update(tag + len(payload).to_bytes(8, "big") + payload)
+
+    def _encode(self, value: Any) -> None:
+        if value is None:
+            self._write(b"N")
+        elif isinstance(value, bool):
+            self._write(b"B", b"1" if value else b"0")
+        elif isinstance(value, int):
+            self._write(b"I", str(value).encode())
+        elif isinstance(value, float):
+            self._write(b"F", value.hex().encode())
+        elif isinstance(value, str):
+            self._write(b"S", value.encode())
+        elif isinstance(value, (bytes, bytearray)):
+            self._write(b"Y", bytes(value))
+        elif isinstance(value, (date, datetime)):
+            self._write(b"D", value.isoformat().encode())
+        elif isinstance(value, Enum):
+            self._write(b"E", type(value).__name__.encode())
+            self._encode(value.value)
+        elif isinstance(value, np.generic):
+            self._encode(value.item())
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            self._write(b"C", type(value).__name__.encode())
+            for field in dataclasses.fields(value):
+                self._encode(getattr(value, field.name))
+        elif isinstance(value, Mapping):
+            self._write(b"M", str(len(value)).encode())
+            for key, item in value.items():
+                self._encode(key)
+                self._encode(item)
+        elif isinstance(value, (list, tuple, range)):
+            self._encode_items(value)
+        elif hasattr(value, "__array__") or isinstance(value, memoryview):
+            self._encode_array(np.asarray(value))
+        elif isinstance(value, Sequence):
+            self._encode_items(value)
+        else:
+            raise TypeError(f"Cannot hash a value of type {type(value).__name__}")
+
+    def _encode_items(self, items: Sequence[Any]) -> None:
+        self._write(b"L", str(len(items)).encode())
+        for item in items:
+            self._encode(item)
+
+    def _encode_array(self, array: Any) -> None:
+        if array.dtype.kind == "O":
+            self._encode_items(array.tolist())
+            return
+        self._write(b"A", f"{array.dtype.str}{array.shape}".encode())
+        self._hash.update(np.ascontiguousarray(array).data)
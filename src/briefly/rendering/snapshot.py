@@ -0,0 +1,213 @@
+"""
+Snapshots of static pages (e.g. a cover page or an appendix), stamped into other reports.
+
+A page is recorded once, with its content stream and the resources it depends on, and
+stamped into each report at the content-stream level, like the pages appended by
+`append_report`. The text is re-encoded only when the font subsets of the report differ
+from the recorded ones, and the footer is drawn by the report when the page is closed,
+with its own generation time and page number.
+"""
+
+import copy
+import hashlib
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fpdf.enums import PDFResourceType
+from fpdf.fonts import TTFFont
+
+from briefly.rendering.merge import (
+    _CONTENT_TOKEN,
+    _STRING_ESCAPE,
+    _FontMapping,
+    _map_fonts,
+    _map_images,
+    _page_content,
+    _rewrite_content,
+    _unescape,
+    _without_footer,
+)
+from briefly.rendering.pdf_generator import PDF, FormXObject
+from briefly.rendering.spill import SpilledData
+from briefly.style import PURPLE_HAZE, Style
+
+
+@dataclass(frozen=True)
+class PageSnapshot:
+    """
+    A recorded page, see `snapshot_page` and `stamp`.
+
+    :ivar content: The content stream of the page, without the footer.
+    :ivar page_size: The width and height of the page, in points.
+    :ivar fonts: The fonts used by the content: their keys, their indices in the recorded report, and the used glyphs with their positions in the recorded font subsets.
+    :ivar images: The chart images used by the content, by their content hash.
+    :ivar forms: The drawing templates (e.g. icons) used by the content, by their keys.
+    :ivar annotations: The external links of the page. The links to pages of the recorded report are not kept.
+    :ivar digest: The SHA-256 hash of the content and the resources, identifying the snapshot in the reproducible reports.
+    """
+
+    content: bytes
+    page_size: tuple[float, float]
+    fonts: tuple[tuple[str, int, tuple[tuple[Any, int], ...]], ...]
+    images: Mapping[str, dict[str, Any]]
+    forms: Mapping[Hashable, FormXObject]
+    annotations: tuple[Any, ...]
+    digest: str
+
+
+def snapshot_page(report: PDF, number: Optional[int] = None) -> PageSnapshot:
+    """
+    Records a page of a report, so that it can be stamped into other reports.
+
+    :param report: The report containing the page. It is not modified.
+    :param number: The number of the page. By default, the current page.
+    :return: The snapshot of the page.
+    :raises ValueError: When the page does not exist, or the report is in the dry-run mode.
+    :raises TypeError: When the page uses a font that is not a TrueType font (e.g. a core font).
+    """
+    if report.dry_run:
+        raise ValueError("Pages of reports in the dry-run mode cannot be recorded")
+    number = report.page if number is None else number
+    # not using the indexing, which loads a spilled page back into memory
+    page: Any = report.pages.get(number)
+    if page is None:
+        raise ValueError(f"The report has no page {number}")
+    content = _without_footer(report, number, _page_content(report, number, page))
+
+    used_glyphs: dict[int, set[int]] = {}
+    used_images: set[int] = set()
+    font_index: Optional[int] = None
+    for match in _CONTENT_TOKEN.finditer(content):
+        if match.group(1) is not None:
+            font_index = int(match.group(1))
+            used_glyphs.setdefault(font_index, set())
+        elif match.group(3) is not None:
+            used_images.add(int(match.group(3)))
+        elif font_index is not None:
+            raw = _STRING_ESCAPE.sub(_unescape, match.group(0)[1:-1])
+            used_glyphs[font_index].update(map(ord, raw.decode("utf-16-be")))
+
+    fonts = []
+    report_fonts = {font.i: (key, font) for key, font in report.fonts.items()}
+    for index, char_ids in sorted(used_glyphs.items()):
+        key, font = report_fonts[index]
+        if not isinstance(font, TTFFont):
+            raise TypeError(
+                f"Font '{key}' is not a TrueType font and cannot be recorded"
+            )
+        glyphs = {char_id: glyph for glyph, char_id in font.subset.items() if glyph}
+        fonts.append(
+            (
+                key,
+                index,
+                tuple((glyphs[char_id], char_id) for char_id in sorted(char_ids)),
+            )
+        )
+
+    images = {}
+    for key, info in report.image_cache.images.items():
+        if info["i"] in used_images:
+            images[key] = copy.copy(info)
+            images[key]["usages"] = 1
+            for field in ("data", "smask"):
+                if isinstance(info.get(field), SpilledData):
+                    # the spill file of the report is deleted when the report is reset
+                    images[key][field] = bytes(info[field])
+    forms = {
+        key: form
+        for key, form in report._form_xobjects.items()
+        if form.index in used_images
+    }
+    annotations = tuple(
+        copy.copy(annotation)
+        for annotation in page.annots or ()
+        if getattr(annotation, "dest", None) is None
+    )
+
+    digest = hashlib.sha256(content)
+    for key, _, glyph_ids in fonts:
+        digest.update(repr((key, [glyph.unicode for glyph, _ in glyph_ids])).encode())
+    for key in images:
+        digest.update(key.encode())
+    for form_key, form in forms.items():
+        digest.update(repr(form_key).encode() + form.content.encode())
+    return PageSnapshot(
+        content=content,
+        page_size=(round(report.w_pt, 2), round(report.h_pt, 2)),
+        fonts=tuple(fonts),
+        images=images,
+        forms=forms,
+        annotations=annotations,
+        digest=digest.hexdigest(),
+    )
+
+
+def record_pages(
+    build: Callable[[PDF], Any], style: Style = PURPLE_HAZE, **kwargs: Any
+) -> list[PageSnapshot]:
+    """
+    Records the pages built by a group of calls, e.g. a cover page with a `main_title`.
+
+    :param build: The function building the pages on the provided report, starting with `add_page`.
+    :param style: The style of the pages.
+    :param kwargs: Additional arguments passed to the `PDF` constructor.
+    :return: The snapshots of the built pages.
+    """
+    report = PDF(style, **kwargs)
+    build(report)
+    return [snapshot_page(report, number) for number in report.pages]
+
+
+def stamp(target: PDF, snapshot: PageSnapshot) -> None:
+    """
+    Adds a page with the content of a snapshot to the report.
+    The footer of the page shows the generation time of the report and the number of the new page.
+
+    :param target: The report to add the page to.
+    :param snapshot: The snapshot of the page.
+    :raises ValueError: When the snapshot was recorded with a different page size.
+    """
+    if snapshot.page_size != (round(target.w_pt, 2), round(target.h_pt, 2)):
+        raise ValueError("The snapshot was recorded with a different page size")
+    if target._input_hash is not None:
+        target._input_hash.update("stamp", snapshot.digest)
+
+    target_doc: Any = target
+    fonts = _map_fonts(target, snapshot.fonts)
+    images = _map_images(target, snapshot.images, snapshot.forms)
+    used_fonts: set[int] = set()
+    used_images: set[int] = set()
+    if _is_identity(fonts, images):
+        # the common case of a page stamped into reports using the same subsets
+        content = snapshot.content
+        used_fonts.update(mapping.font.i for mapping in fonts.values())
+        used_images.update(images.values())
+    else:
+        content = _rewrite_content(
+            snapshot.content, fonts, images, used_fonts, used_images
+        )
+
+    # the background is drawn by the stamped content
+    background = target.page_background
+    target.page_background = None
+    try:
+        target.add_page()
+    finally:
+        target.page_background = background
+    target.element_counts["page_snapshot"] += 1
+    target._out(b"q\n" + content + b"\nQ")
+    for index in used_fonts:
+        target_doc._resource_catalog.add(PDFResourceType.FONT, index, target.page)
+    for index in used_images:
+        target_doc._resource_catalog.add(PDFResourceType.X_OBJECT, index, target.page)
+    for annotation in snapshot.annotations:
+        target_doc.pages[target.page].add_annotation(copy.copy(annotation))
+
+
+def _is_identity(fonts: dict[int, _FontMapping], images: dict[int, int]) -> bool:
+    return all(
+        mapping.font.i == index
+        and all(char_id == mapped for char_id, mapped in mapping.table.items())
+        for index, mapping in fonts.items()
+    ) and all(index == mapped for index, mapped in images.items())
@@ -0,0 +1,154 @@
+"""
+Spilling of the rendered content to a temporary file, for the memory-bounded rendering.
+
+The content of the finished pages and the data of the chart images are written to an
+append-only temporary file, and read back one record at a time when the document is
+output.
+"""
+
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Optional, Self
+
+from fpdf.output import PDFPage
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """
+    The memory used by the buffered content of a report.
+
+    :ivar current: The size of the page content and image data currently held in memory, in bytes.
+    :ivar peak: The highest observed value of `current`, in bytes.
+    :ivar spilled: The size of the content written to the spill file, in bytes.
+    """
+
+    current: int
+    peak: int
+    spilled: int
+
+
+class SpillFile:
+    """
+    An append-only temporary file holding the spilled records, with an index of their positions.
+    The file is deleted when closed, e.g. at the end of a `with` block or when the report is reset (see `PDF.reset`).
+
+    :param directory: The directory of the temporary file. By default, the system temporary directory is used.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._index: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def write(self, key: str, data: bytes | bytearray) -> None:
+        """
+        Appends a record to the file. A record written again under the same key replaces the previous one.
+        """
+        with self._lock:
+            self._file.seek(self.size)
+            self._file.write(data)
+            self._index[key] = (self.size, len(data))
+            self.size += len(data)
+
+    def read(self, key: str) -> bytes:
+        """
+        Reads a record back from the file.
+
+        :raises KeyError: When no record was written under the key.
+        """
+        offset, length = self._index[key]
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self) -> None:
+        """
+        Closes and deletes the file.
+        """
+        self._file.close()
+        self._index.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+
+class SpilledData:
+    """
+    Data spilled to a file, read back when converted to bytes (e.g. when fpdf embeds an image).
+
+    :param file: The spill file holding the data.
+    :param key: The key of the record.
+    :param length: The size of the data.
+    """
+
+    __slots__ = ("_file", "_key", "_length")
+
+    def __init__(self, file: SpillFile, key: str, length: int) -> None:
+        self._file = file
+        self._key = key
+        self._length = length
+
+    def __bytes__(self) -> bytes:
+        return self._file.read(self._key)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class SpilledPages(dict[int, PDFPage]):
+    """
+    The pages of a document, some of which have their content spilled to a file.
+
+    The content of a spilled page is read back when the page is accessed by its number, which is how fpdf accesses the
+    pages when the document is output. Iterating over the values returns the pages as they are, with empty contents
+    for the spilled pages.
+
+    :param pages: The pages of the document.
+    :param file: The spill file.
+    """
+
+    def __init__(self, pages: dict[int, PDFPage], file: SpillFile) -> None:
+        super().__init__(pages)
+        self.file = file
+        self.spilled: dict[int, int] = {}
+
+    def spill(self, number: int) -> int:
+        """
+        Writes the content of a page to the spill file, and releases it from memory.
+
+        :param number: The number of the page.
+        :return: The size of the released content.
+        """
+        page = super().__getitem__(number)
+        contents = page.contents
+        assert isinstance(contents, bytearray)
+        self.file.write(_page_key(number), contents)
+        self.spilled[number] = len(contents)
+        page.contents = bytearray()
+        return len(contents)
+
+    def __getitem__(self, number: int) -> PDFPage:
+        page = super().__getitem__(number)
+        if number in self.spilled:
+            del self.spilled[number]
+            page.contents = bytearray(self.file.read(_page_key(number)))
+        return page
+
+    def read(self, number: int) -> bytes:
+        """
+        Reads the content of a spilled page, without loading it back into the page.
+        """
+        return self.file.read(_page_key(number))
+
+
+def _page_key(number: int) -> str:
+    return f"page/{number}"
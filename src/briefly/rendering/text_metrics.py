@@ -0,0 +1,153 @@
+"""
+Fast text measurement helpers, used where fpdf's per-call `get_string_width` is too slow.
+"""
+
+import heapq
+import random
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Optional, TypeVar
+
+T = TypeVar("T")
+
+_LATIN_CODEPOINTS = 256
+
+
+class CharWidthTable:
+    """
+    Advance widths of the characters of a font at a fixed size, in user units.
+
+    Kerning and text shaping are not applied, which matches fpdf's unshaped text.
+    The widths are summed in the same order as in fpdf, so that the result equals `FPDF.get_string_width`.
+
+    :param widths: The advance widths of the characters in 1/1000 em, keyed by code point.
+    :param default_width: The advance width of characters missing in `widths`.
+    :param font_size_pt: The font size in points.
+    :param k: The scale factor of the user unit (number of points per user unit).
+    :param precomputed: The advance widths of the first code points (at least the Latin-1 range), in 1/1000 em, see `font_metrics`. Used instead of `widths` for the code points they cover.
+    """
+
+    __slots__ = ("_default_width", "_fast", "_font_size_pt", "_k", "_widths")
+
+    def __init__(
+        self,
+        widths: Mapping[int, float],
+        default_width: float,
+        font_size_pt: float,
+        k: float,
+        precomputed: Optional[Sequence[float]] = None,
+    ) -> None:
+        if precomputed is not None and len(precomputed) < _LATIN_CODEPOINTS:
+            raise ValueError("The precomputed widths must cover the Latin-1 range")
+        self._widths = widths
+        self._default_width = default_width
+        self._font_size_pt = font_size_pt
+        self._k = k
+        self._fast = (
+            list(precomputed)
+            if precomputed is not None
+            else [widths.get(code, default_width) for code in range(_LATIN_CODEPOINTS)]
+        )
+
+    def _width(self, char: str) -> float:
+        code = ord(char)
+        if code < len(self._fast):
+            return self._fast[code]
+        return self._widths.get(code, self._default_width)
+
+    def advance(self, char: str) -> float:
+        """
+        Returns the advance width of a single character.
+        """
+        return self._scale(self._width(char))
+
+    def measure(self, text: str) -> float:
+        """
+        Returns the width of the text.
+        """
+        try:
+            return self._scale(sum(map(self._fast.__getitem__, text.encode("latin-1"))))
+        except UnicodeEncodeError:
+            return self._scale(sum(map(self._width, text)))
+
+    def _scale(self, width: float) -> float:
+        return width * self._font_size_pt * 0.001 / self._k
+
+
+def reservoir_sample(
+    items: Iterable[T], size: int, rng: Optional[random.Random] = None
+) -> list[T]:
+    """
+    Draws a uniform sample of the items in a single pass, without knowing their number.
+    Sequences are sampled by index, without iterating over them.
+
+    :param items: The items to sample.
+    :param size: The maximum size of the sample.
+    :param rng: The random generator to use. A generator with a fixed seed is used by default, so that the sample is reproducible.
+    :return: The sampled items, in the order of the input.
+    """
+    rng = rng or random.Random(0)
+    if isinstance(items, Sequence):
+        if len(items) <= size:
+            return list(items)
+        return [items[idx] for idx in sorted(rng.sample(range(len(items)), size))]
+
+    sample: list[tuple[int, T]] = []
+    for idx, item in enumerate(items):
+        if idx < size:
+            sample.append((idx, item))
+        else:
+            slot = rng.randint(0, idx)
+            if slot < size:
+                sample[slot] = (idx, item)
+    sample.sort(key=lambda indexed: indexed[0])
+    return [item for _, item in sample]
+
+
+def estimate_column_widths(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[str]],
+    header_widths: CharWidthTable,
+    cell_widths: CharWidthTable,
+    padding: float = 0,
+    sample_size: int = 1000,
+    exact_candidates: int = 0,
+    measure_exact: Optional[Callable[[str], float]] = None,
+) -> list[float]:
+    """
+    Estimates the widths of table columns from a sample of the rows.
+
+    Cells that are not part of the sample are not measured, so that very long tables
+    are sized in constant time.
+
+    :param headers: The titles of the columns.
+    :param rows: The rows of the table.
+    :param header_widths: The character widths of the header font.
+    :param cell_widths: The character widths of the cell font.
+    :param padding: The horizontal padding added to each column.
+    :param sample_size: The number of sampled rows.
+    :param exact_candidates: The number of the longest sampled cells per column that are re-measured with `measure_exact`.
+    :param measure_exact: The exact measurement function used for the longest cells.
+    :return: The estimated widths of the columns.
+    """
+    header_sizes = [header_widths.measure(header) for header in headers]
+    widths = list(header_sizes)
+    candidates: list[list[tuple[float, str]]] = [[] for _ in headers]
+
+    for row in reservoir_sample(rows, sample_size):
+        for idx, cell in enumerate(row[: len(headers)]):
+            width = cell_widths.measure(cell)
+            widths[idx] = max(widths[idx], width)
+            if exact_candidates > 0:
+                column_candidates = candidates[idx]
+                if len(column_candidates) < exact_candidates:
+                    heapq.heappush(column_candidates, (width, cell))
+                elif width > column_candidates[0][0]:
+                    heapq.heapreplace(column_candidates, (width, cell))
+
+    if measure_exact is not None:
+        for idx, column_candidates in enumerate(candidates):
+            if column_candidates:
+                exact = max(measure_exact(cell) for _, cell in column_candidates)
+                widths[idx] = max(header_sizes[idx], exact)
+
+    return [width + padding for width in widths]
@@ -0,0 +1,204 @@
+"""
+Rendering of a report in several styles (e.g. a light and a dark theme) from a single layout pass.
+
+The layout does not depend on the colors: the report is built once, with a placeholder
+style whose colors identify the fields of the style, and its pages are appended to one
+report per style at the content-stream level (see `append_report`). Only the color
+operators are substituted, and the pie charts (rasterized with the chart colors) are
+rendered again for each style. The footers are drawn by each report.
+"""
+
+import copy
+import math
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import fields
+from typing import Any, Optional
+
+from fpdf.drawing_primitives import convert_to_device_color
+from fpdf.image_datastructures import ImageCache
+from fpdf.image_parsing import preload_image
+
+from briefly.rendering.graphs import build_pie_chart_bytes
+from briefly.rendering.merge import append_report
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import Color, Style
+
+# the maximum number of placeholder colors of a list field (the least common multiple of its lengths)
+_MAX_PLACEHOLDER_COLORS = 4096
+
+# the color operators, skipping the strings of the text operators
+_COLOR_OPERATOR = re.compile(
+    rb"\((?:[^\\()]|\\.)*\)|(?<![\w.])([\d.]+) ([\d.]+) ([\d.]+) (rg|RG)\b", re.DOTALL
+)
+
+
+def render(
+    build: Callable[[PDF], Any], styles: Sequence[Style], **kwargs: Any
+) -> list[PDF]:
+    """
+    Renders the report built by the function in each of the styles, laying it out once.
+
+    The reports are equivalent to building the report in each style, but the text is measured and wrapped once.
+    The colors passed explicitly to the elements (e.g. the color of a tag) are kept in all the styles.
+
+    :param build: The function building the report on the provided report, starting with `add_page`.
+    :param styles: The styles of the reports.
+    :param kwargs: Additional arguments passed to the `PDF` constructor. By default, the reports share the generation time.
+    :return: The report in each style, in the order of the styles, ready to be output.
+    :raises ValueError: When no style is provided, or in the dry-run mode.
+    """
+    if not styles:
+        raise ValueError("At least one style is required")
+    if kwargs.get("dry_run"):
+        raise ValueError(
+            "Reports in the dry-run mode cannot be rendered in several styles"
+        )
+
+    placeholder, colors = _placeholder_style(styles)
+    layout = _LayoutPDF(placeholder, styles[0].chart_colors, **kwargs)
+    kwargs["generation_time"] = layout.generation_time
+    build(layout)
+    if layout.toc_placeholder is not None:
+        layout.output()
+
+    reports = []
+    for style in styles:
+        substitutes = {}
+        for placeholder_color, (name, index) in colors.items():
+            style_colors = _field_colors(style, name)
+            substitutes[placeholder_color] = style_colors[index % len(style_colors)]
+        images = None
+        if style.chart_colors != styles[0].chart_colors:
+            images = _chart_images(layout, style)
+        report = PDF(style, **kwargs)
+        append_report(
+            report, layout, images=images, transform=_substitute_colors(substitutes)
+        )
+        reports.append(report)
+    return reports
+
+
+class _LayoutPDF(PDF):
+    """
+    The report laid out with the placeholder style.
+    The pie charts are rasterized with the chart colors of the first style.
+    """
+
+    def __init__(self, style: Style, chart_colors: list[Color], **kwargs: Any) -> None:
+        self._layout_chart_colors = chart_colors
+        super().__init__(style, **kwargs)
+
+    def _pie_chart_image(self, values: list[float], size: float) -> Optional[bytes]:
+        key = (tuple(values), round(size, 2))
+        image = self._chart_images.get(key)
+        if image is None:
+            buf = build_pie_chart_bytes(
+                values,
+                size=size,
+                colors=self._layout_chart_colors,
+                backend=self.chart_backend,
+            )
+            if buf is None:
+                return None
+            image = buf.getvalue()
+            self._chart_images.put(key, image)
+        return image
+
+
+def _field_colors(style: Style, name: str) -> list[Color]:
+    value = getattr(style, name)
+    return value if isinstance(value, list) else [value]
+
+
+def _placeholder_style(
+    styles: Sequence[Style],
+) -> tuple[Style, dict[tuple[int, int, int], tuple[str, int]]]:
+    """
+    Builds the style with a distinct placeholder color for each color of the style fields.
+    The list fields have a placeholder color for each index modulo the lengths of the list in all the styles.
+
+    :return: The placeholder style, and the style field and index of each placeholder color, by the components of the color multiplied by 2.
+    """
+    placeholder: Any = object.__new__(Style)
+    colors: dict[tuple[int, int, int], tuple[str, int]] = {}
+    for field in fields(Style):
+        lengths = [len(_field_colors(style, field.name)) for style in styles]
+        count = math.lcm(*lengths)
+        if count > _MAX_PLACEHOLDER_COLORS:
+            raise ValueError(
+                f"The lengths of '{field.name}' in the styles have no small common multiple"
+            )
+        field_colors = []
+        for index in range(count):
+            # the half-integer components never match the colors of the elements
+            number = len(colors)
+            color = (number % 255 + 0.5, number // 255 + 0.5, 0.5)
+            colors[_doubled(color)] = (field.name, index)
+            field_colors.append(color)
+        value = (
+            field_colors
+            if isinstance(getattr(styles[0], field.name), list)
+            else field_colors[0]
+        )
+        # bypasses the validation of the integer components
+        object.__setattr__(placeholder, field.name, value)
+    return placeholder, colors
+
+
+def _doubled(components: Sequence[float]) -> tuple[int, int, int]:
+    r, g, b = (round(component * 2) for component in components)
+    return r, g, b
+
+
+def _substitute_colors(
+    substitutes: dict[tuple[int, int, int], Color],
+) -> Callable[[bytes], bytes]:
+    def replace(match: re.Match[bytes]) -> bytes:
+        if match.group(4) is None:
+            return match.group(0)
+        components = [float(match.group(idx)) * 255 for idx in (1, 2, 3)]
+        # the operands are rounded to 4 decimals
+        if any(abs(value % 1 - 0.5) > 0.1 for value in components):
+            return match.group(0)
+        color = substitutes.get(_doubled(components))
+        if color is None:
+            return match.group(0)
+        operator = convert_to_device_color(*color).serialize()
+        return (operator.upper() if match.group(4) == b"RG" else operator).encode()
+
+    def transform(content: bytes) -> bytes:
+        return _COLOR_OPERATOR.sub(replace, content)
+
+    return transform
+
+
+def _chart_images(layout: PDF, style: Style) -> dict[str, dict[str, Any]]:
+    """
+    Renders the pie charts of the layout with the chart colors of the style.
+    :return: The images of the layout, with the pie charts replaced.
+    """
+    charts: dict[int, tuple[str, Any]] = {}
+    for index, (values, size) in layout._chart_sources.items():
+        buf = build_pie_chart_bytes(
+            list(values),
+            size=size,
+            colors=style.chart_colors,
+            backend=layout.chart_backend,
+        )
+        assert buf is not None
+        key, _, info = preload_image(ImageCache(), buf)
+        charts[index] = key, info
+
+    images: dict[str, dict[str, Any]] = {}
+    layout_images: dict[str, Any] = layout.image_cache.images
+    for key, info in layout_images.items():
+        chart = charts.get(info["i"])
+        if chart is None:
+            images[key] = info
+            continue
+        chart_key, image = chart[0], copy.copy(chart[1])
+        image["i"] = info["i"]
+        image["usages"] = info["usages"]
+        images[chart_key] = image
+    return images
@@ -0,0 +1,66 @@
+"""
+Word wrapping of plain text, equivalent to the line breaking of fpdf's `multi_cell`.
+
+The lines are computed from the advance widths of the characters, without fpdf's
+per-call text processing, so that the lines of repeated texts (e.g. the statuses of the
+task cards) can be cached and drawn with `cell`.
+"""
+
+from collections.abc import Callable
+from typing import Optional
+
+from fpdf.line_break import BREAKING_SPACE_SYMBOLS_STR, NBSP, NEWLINE, SOFT_HYPHEN
+
+# the tolerance of fpdf's width comparisons, see fpdf.util.FloatTolerance
+_TOLERANCE = 1e-9
+
+
+def can_wrap(text: str) -> bool:
+    """
+    Returns whether `wrap_text` breaks the text like fpdf.
+    Texts with soft hyphens (which fpdf may replace with a hyphen at the end of a line) and texts ending with a line break (followed by an empty line in fpdf) are not supported.
+    """
+    return SOFT_HYPHEN not in text and not text.endswith(NEWLINE)
+
+
+def wrap_text(
+    text: str, max_width: float, measure: Callable[[str], float]
+) -> tuple[str, ...]:
+    """
+    Breaks the text into lines fitting the width, like `multi_cell` with the default word wrapping.
+
+    The lines are broken at the last space fitting the width (the space is dropped), at the explicit line breaks, or within a word longer than the width.
+
+    :param text: The text to wrap.
+    :param max_width: The width available for the text, without the cell margins.
+    :param measure: The function measuring the width of a text in the current font.
+    :return: The lines of the text. An empty text has a single empty line.
+    """
+    lines: list[str] = []
+    idx, end = 0, len(text)
+    while idx < end:
+        line: list[str] = []
+        width = 0.0
+        # the length of the line and the index of the character at the last space
+        space_break: Optional[tuple[int, int]] = None
+        while idx < end:
+            char = text[idx]
+            if char == NEWLINE:
+                idx += 1
+                break
+            if width + measure(char) - max_width > _TOLERANCE and line:
+                if char in BREAKING_SPACE_SYMBOLS_STR:
+                    idx += 1
+                elif space_break is not None:
+                    del line[space_break[0] :]
+                    idx = space_break[1] + 1
+                break
+            if char in BREAKING_SPACE_SYMBOLS_STR:
+                space_break = (len(line), idx)
+            elif char == NBSP:
+                char = " "
+            line.append(char)
+            width = measure("".join(line))
+            idx += 1
+        lines.append("".join(line))
+    return tuple(lines) or ("",)
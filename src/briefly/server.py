@@ -0,0 +1,635 @@
+"""
+A long-lived render server, with a pool of pre-warmed worker processes.
+
+Starting Python and importing fpdf2 and matplotlib costs more than rendering a typical
+report, so the workers are started once, with the fonts loaded, a generator ready for
+each style and matplotlib initialized, and render the reports sent to the server.
+
+Run with: python -m briefly.server --port 8000 (or --socket /path/to/briefly.sock)
+
+Endpoints:
+ - **POST /render**: Renders the report spec in the JSON body (see `render_spec`) and streams the PDF back. The
+   `X-Render-Timeout` header lowers the render timeout of the request.
+ - **GET /metrics**: The request counts, the state of the workers and the latency percentiles, as JSON.
+ - **GET /health**: Responds with 200 while the server is running.
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from functools import cache, partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+from typing import Any, Optional
+
+from fpdf.errors import FPDFException
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.pool import PDFPool
+from briefly.style import LATTE, MOCHA, NOTION, PURPLE_HAZE, Style
+
+STYLES: Mapping[str, Style] = {
+    "purple_haze": PURPLE_HAZE,
+    "notion": NOTION,
+    "latte": LATTE,
+    "mocha": MOCHA,
+}
+
+# the methods of `PDF` available to the specs: the elements and the positioning calls
+ELEMENTS: frozenset[str] = frozenset(
+    {
+        "add_page",
+        "main_title",
+        "divider",
+        "section_title",
+        "summary_card",
+        "summary_cards",
+        "styled_table",
+        "tag",
+        "tags",
+        "task_card",
+        "bar_chart",
+        "pie_chart",
+        "donut",
+        "gauge",
+        "progress_bar",
+        "legend_label",
+        "accent_card",
+        "table_of_contents",
+        "ln",
+        "set_x",
+        "set_y",
+        "set_xy",
+    }
+)
+
+_CHUNK_SIZE = 64 * 1024
+_logger = logging.getLogger(__name__)
+_PERCENTILES = (50, 90, 95, 99)
+
+
+class ServerOverloadedError(RuntimeError):
+    """
+    Raised when a report cannot be queued, because all the workers are busy and the queue is full.
+    """
+
+
+def render_spec(spec: Any, pools: Optional[Mapping[str, PDFPool]] = None) -> bytes:
+    """
+    Renders a report spec.
+
+    A spec is an object with the name of the style (`"style"`, see `STYLES`, `"purple_haze"` by default) and the list
+    of `"elements"`. Each element is an object with the name of the `PDF` method (`"element"`, see `ELEMENTS`) and its
+    keyword arguments, e.g. `{"element": "tag", "text": "Backend"}`. Dates are passed as ISO 8601 strings.
+
+    :param spec: The report spec, e.g. decoded from JSON.
+    :param pools: The generators to use, by the name of the style. By default, a new generator is created.
+    :return: The PDF document.
+    :raises TypeError: When the spec is not an object, or its style or elements have the wrong type.
+    :raises ValueError: When the spec is otherwise invalid, e.g. an unknown style or invalid element arguments.
+    """
+    if not isinstance(spec, Mapping):
+        raise TypeError("The spec must be an object")
+    style = spec.get("style", "purple_haze")
+    if not isinstance(style, str):
+        raise TypeError("The style must be a string")
+    if style not in STYLES:
+        raise ValueError(
+            f"Unknown style '{style}', expected one of: {', '.join(STYLES)}"
+        )
+    elements = spec.get("elements")
+    if not isinstance(elements, list):
+        raise TypeError("The spec must have a list of elements")
+
+    pool = pools[style] if pools is not None else PDFPool(STYLES[style], max_idle=0)
+    with pool.pdf() as pdf:
+        for idx, element in enumerate(elements):
+            _render_element(pdf, idx, element)
+        try:
+            return bytes(pdf.output())
+        except FPDFException as e:
+            raise ValueError(f"Invalid report: {e}") from e
+
+
+def _render_element(pdf: PDF, idx: int, element: Any) -> None:
+    if not isinstance(element, Mapping) or element.get("element") not in ELEMENTS:
+        raise ValueError(
+            f"Element {idx} must be an object with one of the elements:"
+            f" {', '.join(sorted(ELEMENTS))}"
+        )
+    name = element["element"]
+    kwargs = {key: value for key, value in element.items() if key != "element"}
+    try:
+        for key in _date_arguments(name):
+            if isinstance(kwargs.get(key), str):
+                kwargs[key] = date.fromisoformat(kwargs[key])
+        getattr(pdf, name)(**kwargs)
+    except (TypeError, ValueError, KeyError, FPDFException) as e:
+        raise ValueError(f"Invalid element {idx} ({name}): {e}") from e
+
+
+@cache
+def _date_arguments(name: str) -> tuple[str, ...]:
+    parameters = inspect.signature(getattr(PDF, name)).parameters.values()
+    return tuple(
+        parameter.name
+        for parameter in parameters
+        if parameter.annotation in (date, Optional[date])
+    )
+
+
+def _warm_up() -> dict[str, PDFPool]:
+    pools = {name: PDFPool(style, max_idle=1) for name, style in STYLES.items()}
+    for pool in pools.values():
+        with pool.pdf() as pdf:
+            pdf.add_page()
+            pdf.summary_card(["Warm-up"])
+            pdf.pie_chart({"one": 1, "two": 2}, "Warm-up")
+            pdf.output()
+    return pools
+
+
+def _worker_main(conn: Connection) -> None:
+    # the server handles the interrupts, and stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    pools = _warm_up()
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            spec = conn.recv()
+        except EOFError:
+            return
+        try:
+            pdf = render_spec(spec, pools)
+        except (TypeError, ValueError) as e:
+            conn.send(("invalid", str(e)))
+            continue
+        except Exception as e:
+            # the worker is kept running, the traceback is only logged
+            _logger.exception("Rendering a report failed")
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            continue
+        conn.send(("ok", len(pdf)))
+        view = memoryview(pdf)
+        for start in range(0, len(pdf), _CHUNK_SIZE):
+            conn.send_bytes(view[start : start + _CHUNK_SIZE])
+
+
+class _Worker:
+    def __init__(self, context: SpawnContext) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self, timeout: float) -> bool:
+        try:
+            return self.conn.poll(timeout) and self.conn.recv()[0] == "ready"
+        except EOFError:
+            return False
+        except OSError:
+            return False
+
+    def stop(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class RenderedReport:
+    """
+    A report rendered by a worker, streamed in chunks when iterated over.
+
+    :ivar size: The size of the PDF document, in bytes.
+    :ivar complete: Whether all the chunks were received.
+    """
+
+    def __init__(self, size: int, chunks: Iterator[bytes]) -> None:
+        self.size = size
+        self.complete = False
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._chunks
+        self.complete = True
+
+
+class WorkerPool:
+    """
+    A pool of pre-warmed worker processes rendering report specs.
+
+    A report is rendered by an idle worker. When all the workers are busy, the report waits in a bounded queue, and
+    when the queue is full it is rejected. A worker exceeding the timeout is killed and replaced by a new one.
+
+    :param workers: The number of worker processes. By default, the number of CPUs.
+    :param queue_size: The maximum number of reports waiting for a worker. By default, twice the number of workers.
+    :param timeout: The maximum time in seconds to render a report, including the time spent in the queue.
+    :param start_timeout: The maximum time in seconds for a worker to start and warm up.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: float = 30.0,
+        start_timeout: float = 60.0,
+    ) -> None:
+        workers = workers if workers is not None else os.cpu_count() or 1
+        queue_size = queue_size if queue_size is not None else 2 * workers
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if queue_size < 0:
+            raise ValueError("queue_size must not be negative")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._running: set[_Worker] = set()
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """
+        Starts the workers, and waits until they are warmed up.
+
+        :raises RuntimeError: When a worker did not start in time.
+        """
+        started = [_Worker(self._context) for _ in range(self.workers)]
+        with self._lock:
+            self._running.update(started)
+        for worker in started:
+            if not worker.wait_ready(self.start_timeout):
+                self.close()
+                raise RuntimeError("A render worker did not start in time")
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        """
+        Stops the workers.
+        """
+        with self._lock:
+            self._closed = True
+            running = list(self._running)
+            self._running.clear()
+        for worker in running:
+            worker.stop()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the number of workers, idle workers, queued reports and worker restarts.
+        """
+        with self._lock:
+            return {
+                "workers": len(self._running),
+                "idle": self._idle.qsize(),
+                "queued": self._waiting,
+                "restarts": self.restarts,
+            }
+
+    @contextmanager
+    def render(
+        self, spec: Any, timeout: Optional[float] = None
+    ) -> Iterator[RenderedReport]:
+        """
+        Renders a report spec (see `render_spec`) on a worker.
+        The worker is held until the end of the `with` block, in which the chunks of the document should be read.
+
+        :param spec: The report spec.
+        :param timeout: The maximum time in seconds to render the report. It cannot exceed the timeout of the pool.
+        :return: The rendered report.
+        :raises ServerOverloadedError: When the queue is full.
+        :raises TimeoutError: When the report was not rendered in time.
+        :raises ValueError: When the spec is invalid.
+        :raises RuntimeError: When the rendering failed.
+        """
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        deadline = time.monotonic() + timeout
+        if not self._slots.acquire(blocking=False):
+            raise ServerOverloadedError("The render queue is full")
+        try:
+            worker = self._take_worker(deadline)
+            healthy = False
+            try:
+                worker.conn.send(spec)
+                kind, value = self._receive(worker, deadline)
+                if kind != "ok":
+                    healthy = True
+                    raise (ValueError if kind == "invalid" else RuntimeError)(value)
+                report = RenderedReport(value, self._chunks(worker, value, deadline))
+                yield report
+                # a partially read report is left in the pipe, so the worker is replaced
+                healthy = report.complete
+            finally:
+                if healthy:
+                    self._idle.put(worker)
+                else:
+                    self._replace(worker)
+        finally:
+            self._slots.release()
+
+    def _take_worker(self, deadline: float) -> _Worker:
+        with self._lock:
+            self._waiting += 1
+        try:
+            return self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise TimeoutError("No render worker became available in time") from None
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def _receive(self, worker: _Worker, deadline: float) -> tuple[str, Any]:
+        self._wait(worker, deadline)
+        try:
+            kind, value = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            raise RuntimeError("The render worker exited unexpectedly") from e
+        return kind, value
+
+    def _chunks(self, worker: _Worker, size: int, deadline: float) -> Iterator[bytes]:
+        received = 0
+        while received < size:
+            self._wait(worker, deadline)
+            try:
+                chunk = worker.conn.recv_bytes()
+            except (EOFError, OSError) as e:
+                raise RuntimeError("The render worker exited unexpectedly") from e
+            received += len(chunk)
+            yield chunk
+
+    def _wait(self, worker: _Worker, deadline: float) -> None:
+        # a worker that exited is ready too, and fails when read
+        if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+            raise TimeoutError("The report was not rendered in time")
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.stop()
+        with self._lock:
+            self._running.discard(worker)
+            self.restarts += 1
+            if self._closed:
+                return
+        threading.Thread(target=self._spawn, daemon=True).start()
+
+    def _spawn(self) -> None:
+        while True:
+            worker = _Worker(self._context)
+            with self._lock:
+                if self._closed:
+                    break
+                self._running.add(worker)
+            if worker.wait_ready(self.start_timeout):
+                self._idle.put(worker)
+                return
+            with self._lock:
+                self._running.discard(worker)
+            worker.stop()
+            time.sleep(1)
+        worker.stop()
+
+
+class Metrics:
+    """
+    The request metrics of the server: the counts of the responses by status, and the latency percentiles of the
+    recent requests.
+
+    :param window: The number of the most recent requests used for the percentiles.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self.started = time.monotonic()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._statuses: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, status: int, latency: float) -> None:
+        """
+        Records a response.
+
+        :param status: The HTTP status of the response.
+        :param latency: The time to respond, in seconds.
+        """
+        with self._lock:
+            self._statuses[status] += 1
+            self._latencies.append(latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the metrics as a JSON-serializable object. The latencies are in milliseconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            statuses = dict(self._statuses)
+        return {
+            "uptime": round(time.monotonic() - self.started, 3),
+            "requests": sum(statuses.values()),
+            "statuses": {
+                str(status): count for status, count in sorted(statuses.items())
+            },
+            "latency_ms": {f"p{p}": _percentile(latencies, p) for p in _PERCENTILES}
+            | {"max": round(latencies[-1] * 1000, 3) if latencies else None},
+        }
+
+
+def _percentile(values: list[float], p: float) -> Optional[float]:
+    # the nearest-rank percentile of sorted values, in milliseconds
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * p // 100))
+    return round(values[int(rank) - 1] * 1000, 3)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(
+        self, *args: Any, pool: WorkerPool, metrics: Metrics, max_body: int
+    ) -> None:
+        self.pool = pool
+        self.metrics = metrics
+        self.max_body = max_body
+        super().__init__(*args)
+
+    def address_string(self) -> str:
+        # the client address of a Unix socket is empty
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._send_json(200, self.metrics.snapshot() | self.pool.stats())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/render":
+            self.close_connection = True
+            self._send_json(404, {"error": "Not found"})
+            return
+        start = time.perf_counter()
+        status = self._render()
+        self.metrics.record(status, time.perf_counter() - start)
+
+    def _render(self) -> int:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            timeout_header = self.headers.get("X-Render-Timeout")
+            timeout = float(timeout_header) if timeout_header else None
+        except ValueError:
+            self.close_connection = True
+            return self._send_json(400, {"error": "Invalid headers"})
+        if length < 0:
+            # reading a negative length would block until the client closes the connection
+            self.close_connection = True
+            return self._send_json(400, {"error": "Invalid headers"})
+        if length > self.max_body:
+            self.close_connection = True
+            return self._send_json(413, {"error": "The spec is too large"})
+        try:
+            spec = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            return self._send_json(400, {"error": f"Invalid JSON: {e}"})
+
+        with ExitStack() as stack:
+            try:
+                report = stack.enter_context(self.pool.render(spec, timeout))
+            except ServerOverloadedError as e:
+                return self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+            except TimeoutError as e:
+                return self._send_json(504, {"error": str(e)})
+            except ValueError as e:
+                return self._send_json(400, {"error": str(e)})
+            except RuntimeError as e:
+                return self._send_json(500, {"error": str(e)})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(report.size))
+            self.end_headers()
+            try:
+                for chunk in report:
+                    self.wfile.write(chunk)
+            except OSError:
+                # the client disconnected or the worker timed out (an OSError too)
+                self.close_connection = True
+            except RuntimeError:
+                # the status is sent already, the client sees a truncated document
+                self.close_connection = True
+        return 200
+
+    def _send_json(
+        self, status: int, body: Any, headers: Optional[Mapping[str, str]] = None
+    ) -> int:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+        return status
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(
+    pool: WorkerPool,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: Optional[str] = None,
+    metrics: Optional[Metrics] = None,
+    max_body: int = 16 * 1024 * 1024,
+) -> socketserver.BaseServer:
+    """
+    Creates the HTTP server of the render API, see the module documentation. The server is bound, but not started.
+
+    :param pool: The workers rendering the reports.
+    :param host: The host to listen on.
+    :param port: The port to listen on. Use 0 to pick a free port.
+    :param socket_path: The path of a Unix socket to listen on, instead of the host and port.
+    :param metrics: The metrics updated by the server. By default, new metrics are created.
+    :param max_body: The maximum size of a report spec, in bytes.
+    :return: The server.
+    """
+    handler = partial(
+        _Handler, pool=pool, metrics=metrics or Metrics(), max_body=max_body
+    )
+    if socket_path is None:
+        return ThreadingHTTPServer((host, port), handler)
+    # a socket left behind by a previous server would prevent binding
+    if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        os.unlink(socket_path)
+    return _UnixHTTPServer(socket_path, handler)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Runs the render server until interrupted.
+
+    :param argv: The command line arguments. By default, the arguments of the process are used.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m briefly.server",
+        description="Serves the rendering of report specs over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="the host to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="the port to listen on")
+    parser.add_argument("--socket", help="the path of a Unix socket to listen on")
+    parser.add_argument("--workers", type=int, help="the number of worker processes")
+    parser.add_argument("--queue-size", type=int, help="the size of the render queue")
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="the render timeout in seconds"
+    )
+    parser.add_argument(
+        "--max-body",
+        type=int,
+        default=16 * 1024 * 1024,
+        help="the maximum size of a spec in bytes",
+    )
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(args.workers, args.queue_size, args.timeout)
+    pool.start()
+    server = create_server(
+        pool, args.host, args.port, args.socket, max_body=args.max_body
+    )
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Serving on {address} with {pool.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        if args.socket:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import re
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import NOTION, PURPLE_HAZE, Style
+
+_TEXT = re.compile(rb"/F(\d+) [\d.]+ Tf|\(((?:[^\\()]|\\.)*)\)", re.DOTALL)
+
+
+def _page_texts(pdf: PDF, page: int) -> list[str]:
+    """Decodes the text of a page content stream, using the font subsets of the document."""
+    fonts = {font.i: font for font in pdf.fonts.values()}
+    texts = []
+    font = None
+    for match in _TEXT.finditer(bytes(pdf.pages[page].contents)):
+        if match.group(1) is not None:
+            font = fonts[int(match.group(1))]
+            continue
+        chars = {char_id: glyph for glyph, char_id in font.subset.items() if glyph}
+        raw = re.sub(
+            rb"\\(.)",
+            lambda escape: b"\r" if escape.group(1) == b"r" else escape.group(1),
+            match.group(2),
+            flags=re.DOTALL,
+        )
+        text = "".join(
+            chr(chars[ord(char)].unicode[0]) for char in raw.decode("utf-16-be")
+        )
+        texts.append(text)
+    return texts
+
+
+def _build_report(pdf: PDF, title: str = "Weekly report") -> None:
+    """Builds a report with every kind of element, a table spanning several pages and an appendix."""
+    pdf.add_page()
+    pdf.main_title(title)
+    pdf.section_title("Overview", anchor="overview")
+    pdf.pie_chart({"Done": 3, "To Do": 2, "Blocked": 1}, "Status")
+    pdf.bar_chart({"Alice": 3, "Bob": 5, "Carol": 1}, "Story points")
+    pdf.donut({"Done": 3, "To Do": 5}, "Donut")
+    pdf.tag("Custom", color=(10, 20, 30))
+    pdf.section_title("Tasks")
+    for idx in range(30):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            "A title long enough to be wrapped into multiple lines",
+            "In Progress",
+            date(2025, 1, 3),
+            idx % 4 + 1,
+            3,
+            flagged=idx == 2,
+            link="#overview",
+        )
+    pdf.set_xy(pdf.l_margin, pdf.get_y() + 40)
+    pdf.styled_table(
+        ["Key", "Title"], [[f"PROJ-{idx}", f"Task {idx}"] for idx in range(60)]
+    )
+    pdf.add_page()
+    pdf.section_title("Appendix")
+
+
+@pytest.fixture
+def pdf() -> PDF:
+    pdf = PDF(NOTION)
+    pdf.add_page()
+    return pdf
+
+
+@pytest.fixture
+def generation_time() -> datetime:
+    return datetime(2025, 1, 2, 15, 30, 45)
+
+
+@pytest.fixture
+def page_texts() -> Callable[[PDF, int], list[str]]:
+    return _page_texts
+
+
+@pytest.fixture
+def build_report() -> Callable[..., None]:
+    return _build_report
+
+
+@pytest.fixture
+def report(generation_time: datetime) -> Callable[..., PDF]:
+    """The factory of the reports built by `build_report`, generated at `generation_time`."""
+
+    def report(style: Style = PURPLE_HAZE, **kwargs: Any) -> PDF:
+        kwargs.setdefault("generation_time", generation_time)
+        pdf = PDF(style, **kwargs)
+        _build_report(pdf)
+        return pdf
+
+    return report
+
+
+@pytest.fixture
+def render_report(generation_time: datetime) -> Callable[..., bytes]:
+    """Renders a report on a possibly reused generator, pinning its generation and creation time."""
+
+    def render_report(pdf: PDF, build: Callable[..., Any], *args: Any) -> bytes:
+        pdf.generation_time = generation_time
+        pdf.set_creation_date(generation_time)
+        build(pdf, *args)
+        return bytes(pdf.output())
+
+    return render_report
@@ -0,0 +1,150 @@
+from array import array
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from briefly.rendering.aggregation import (
+    aggregate_array,
+    aggregate_items,
+    bin_items,
+    top_n_items,
+)
+from briefly.rendering.pdf_generator import PDF
+
+
+@pytest.fixture
+def counts() -> dict[str, float]:
+    return {f"user{idx}": idx % 10 for idx in range(1000)}
+
+
+def test_top_n_items():
+    data = {"a": 1, "b": 5, "c": 3, "d": 2}
+    assert top_n_items(data, 2) == [("b", 5), ("c", 3), ("Other", 3)]
+    assert top_n_items(data, 4, "Rest") == [("b", 5), ("c", 3), ("d", 2), ("a", 1)]
+
+    with pytest.raises(ValueError):
+        top_n_items(data, 0)
+
+
+def test_bin_items_with_bin_count():
+    data = {"a": 0, "b": 1, "c": 5, "d": 9, "e": 10}
+    assert bin_items(data, 2) == [("0-5", 2), ("5-10", 3)]
+    assert bin_items({}, 2) == []
+
+    with pytest.raises(ValueError):
+        bin_items(data, 0)
+
+
+def test_bin_items_with_constant_values():
+    assert bin_items({"a": 5, "b": 5}, 3) == [("5-6", 2), ("6-7", 0), ("7-8", 0)]
+    assert bin_items({"a": 3}, 1) == [("3-4", 1)]
+
+
+def test_bin_items_with_bin_edges():
+    data = {"a": -1, "b": 1, "c": 5, "d": 9, "e": 10, "f": 11}
+    assert bin_items(data, [0, 5, 10]) == [("0-5", 1), ("5-10", 3)]
+
+    with pytest.raises(ValueError):
+        bin_items(data, [10, 0])
+
+
+def test_aggregate_items(counts: dict[str, float]):
+    assert aggregate_items({"a": 1, "b": 2}) == [("a", 1), ("b", 2)]
+    items = aggregate_items(counts, top_n=2, bins=[0, 5, 10])
+    assert items == [("0-5", 500), ("5-10", 500)]
+
+
+def test_bar_chart_with_top_n(pdf: PDF, counts: dict[str, float]):
+    pdf._plot_bar_chart = MagicMock(return_value=(60, 55))
+    pdf._legend = MagicMock(return_value=(120, 50))
+    pdf.bar_chart(counts, "Tasks by assignee", top_n=3, other_label="Others")
+
+    values = pdf._plot_bar_chart.call_args.args[0]
+    assert values == [9, 9, 9, 4473]
+    labels = pdf._legend.call_args.args[0]
+    assert labels[-1] == "Others (4473.00)"
+
+
+def test_pie_chart_with_bins(pdf: PDF, counts: dict[str, float]):
+    pdf._legend = MagicMock(return_value=(120, 50))
+    pdf.pie_chart(counts, "Distribution", bins=2)
+
+    labels = pdf._legend.call_args.args[0]
+    assert labels == ["0-4.5 (500)", "4.5-9 (500)"]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"top_n": 3, "other_label": "Others"},
+        {"top_n": 2000},
+        {"bins": 4},
+        {"bins": [2, 5, 7.5]},
+        {"bins": 3, "top_n": 2},
+    ],
+)
+def test_aggregate_array_matches_aggregate_items(counts: dict[str, float], options):
+    values = np.fromiter(counts.values(), dtype=np.int64)
+    labels = list(counts)
+
+    assert aggregate_array(values, labels, **options) == aggregate_items(
+        counts, **options
+    )
+
+
+@pytest.mark.parametrize("bins", [1, 3])
+def test_aggregate_array_with_constant_values(bins):
+    expected = bin_items({"a": 5.0, "b": 5.0}, bins)
+    assert aggregate_array(np.array([5.0, 5.0]), bins=bins) == expected
+    assert expected[0] == ("5-6", 2)
+
+
+def test_aggregate_array():
+    values = np.array([1.5, np.nan, 4.0, 2.0])
+    assert aggregate_array(values) == [("0", 1.5), ("2", 4.0), ("3", 2.0)]
+    assert aggregate_array(values, ["a", "b", "c", "d"], top_n=1) == [
+        ("c", 4.0),
+        ("Other", 3.5),
+    ]
+    # buffer protocol, unsigned values
+    assert aggregate_array(array("H", [1, 7, 7]), top_n=2) == [
+        ("1", 7),
+        ("2", 7),
+        ("Other", 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    "data", [np.array([[1, 2], [3, 4]]), np.array(["a", "b"]), [1, None]]
+)
+def test_aggregate_array_with_invalid_data(data):
+    with pytest.raises(ValueError):
+        aggregate_array(data)
+
+
+def test_aggregate_array_with_invalid_labels():
+    with pytest.raises(ValueError):
+        aggregate_array(np.arange(3), ["a", "b"])
+
+
+def test_bar_chart_with_array(pdf: PDF):
+    pdf._plot_bar_chart = MagicMock(return_value=(60, 55))
+    pdf._legend = MagicMock(return_value=(120, 50))
+    values = np.arange(1_000_000, dtype=np.float64)
+    labels = np.char.add("user", np.arange(1_000_000).astype(str))
+    pdf.bar_chart(values, "Tasks by assignee", top_n=2, labels=labels)
+
+    assert pdf._plot_bar_chart.call_args.args[0] == [999999, 999998, 499997500003]
+    assert pdf._legend.call_args.args[0][:2] == [
+        "user999999 (999999.00)",
+        "user999998 (999998.00)",
+    ]
+
+
+def test_pie_chart_with_array(pdf: PDF):
+    pdf._legend = MagicMock(return_value=(120, 50))
+    pdf.pie_chart(np.array([3, 0, 5]), "Status", labels=["Done", "To Do", "Blocked"])
+
+    labels = pdf._legend.call_args.args[0]
+    assert labels == ["Done (3)", "To Do (0)", "Blocked (5)"]
@@ -0,0 +1,93 @@
+from datetime import date, datetime
+
+import pytest
+from fpdf import XPos, YPos
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import MOCHA, NOTION
+
+
+class CellPDF(PDF):
+    """Draws all cells with fpdf's `cell`."""
+
+    def _can_emit_cell(self, *args: object) -> bool:
+        return False
+
+
+def _pair() -> tuple[PDF, PDF]:
+    pdfs = PDF(NOTION), CellPDF(NOTION)
+    for pdf in pdfs:
+        pdf.add_page()
+        pdf.set_xy(30, 40)
+    return pdfs
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"align": "R"},
+        {"align": "C", "fill": True},
+        {"border": "B", "fill": True},
+        {"border": 1},
+        {"new_x": XPos.LEFT, "new_y": YPos.NEXT},
+        {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT},
+        {"link": "https://a.b"},
+    ],
+)
+@pytest.mark.parametrize("text", ["In Progress", "Überprüfung (draft)", ""])
+def test_cell_matches_fpdf(kwargs: dict, text: str):
+    pdf, expected = _pair()
+    for report in (pdf, expected):
+        report.set_font("inter", "B", 7)
+        report.set_text_color(50, 60, 70)
+        report.set_fill_color(200, 10, 10)
+        report._cell(20, 5, text, **kwargs)
+        report._cell(0, 5, text, **kwargs)
+
+    assert bytes(pdf.pages[1].contents) == bytes(expected.pages[1].contents)
+    assert (pdf.get_x(), pdf.get_y(), pdf._lasth) == (
+        expected.get_x(),
+        expected.get_y(),
+        expected._lasth,
+    )
+    assert len(pdf.pages[1].annots) == len(expected.pages[1].annots)
+
+
+def test_cell_with_page_break_uses_fpdf():
+    pdf, expected = _pair()
+    for report in (pdf, expected):
+        report.set_y(report.h - 20)
+        report._cell(20, 10, "Text")
+    assert pdf.page == expected.page == 2
+    assert bytes(pdf.pages[2].contents) == bytes(expected.pages[2].contents)
+
+
+@pytest.mark.parametrize("style", [NOTION, MOCHA])
+def test_components_render_identically(style):
+    def build(pdf: PDF) -> None:
+        pdf.add_page()
+        pdf.summary_card(["Total Tickets: 58", "Completed: 42"], width=50)
+        pdf.set_y(80)
+        for idx in range(12):
+            pdf.task_card(
+                f"PROJ-{idx}",
+                ["Fix login flow", "A title long enough to wrap " * 4][idx % 2],
+                ["Done", "Waiting for customer approval"][idx % 2],
+                date(2025, 1, 3) if idx % 3 else None,
+                idx % 4 + 1,
+                3,
+                flagged=idx == 5,
+                link="https://a.b" if idx % 4 == 0 else 0,
+            )
+        pdf.tags(["backend", "frontend"])
+        pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+        pdf.progress_bar(0.7, "Progress")
+        pdf.styled_table(["Key", "Title"], [[f"PROJ-{idx}", ""] for idx in range(80)])
+
+    reports = []
+    for cls in (PDF, CellPDF):
+        pdf = cls(style, reproducible=True, generation_time=datetime(2025, 1, 2))
+        build(pdf)
+        reports.append(bytes(pdf.output()))
+    assert reports[0] == reports[1]
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from briefly import PDF, PDFPool
+from briefly.style import NOTION, PURPLE_HAZE
+
+REPORTS = 64
+
+
+def build(pdf: PDF, idx: int) -> None:
+    pdf.add_page()
+    pdf.main_title(f"Team {idx}")
+    pdf.table_of_contents()
+    pdf.section_title("Summary")
+    pdf.summary_card([f"Total Tickets: {idx}", "Completed: 42"])
+    pdf.pie_chart({"Done": idx % 7 + 1, "In Progress": 3, "To Do": idx % 3}, "Status")
+    pdf.bar_chart({f"Week {week}": (idx + week) % 9 for week in range(10)}, "Velocity")
+    pdf.section_title("Tasks", anchor="tasks")
+    for task in range(idx % 5 + 3):
+        pdf.task_card(
+            f"T{idx}-{task}",
+            f"Task {task} of the team {idx}",
+            "Done",
+            date(2025, 1, task + 1),
+            task % 4 + 1,
+            task,
+            flagged=task == 1,
+            link="#tasks",
+        )
+    pdf.styled_table(["Key", "Status"], [[f"T{idx}-{row}", "Done"] for row in range(8)])
+
+
+def test_concurrent_reports_match_serial_ones(render_report):
+    pdf = PDF(NOTION)
+    serial = []
+    for idx in range(REPORTS):
+        serial.append(render_report(pdf, build, idx))
+        pdf.reset()
+
+    pool = PDFPool(NOTION, max_idle=16)
+
+    def render_pooled(idx: int) -> bytes:
+        with pool.pdf() as pooled:
+            return render_report(pooled, build, idx)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        concurrent = list(executor.map(render_pooled, range(REPORTS)))
+
+    assert concurrent == serial
+
+
+def test_concurrent_styles(render_report):
+    styles = [NOTION, PURPLE_HAZE] * 8
+    serial = [render_report(PDF(style), build, idx) for idx, style in enumerate(styles)]
+
+    with ThreadPoolExecutor(max_workers=len(styles)) as executor:
+        concurrent = list(
+            executor.map(
+                lambda idx: render_report(PDF(styles[idx]), build, idx),
+                range(len(styles)),
+            )
+        )
+
+    assert concurrent == serial
@@ -0,0 +1,89 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from briefly.rendering.estimate import estimate_output_size
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import NOTION
+
+
+def build_report(pdf: PDF) -> None:
+    pdf.add_page()
+    pdf.main_title("Sprint report")
+    pdf.section_title("Overview")
+    pdf.summary_card(["Total Tickets: 58", "Completed: 42"], width=50)
+    pdf.tag("Backend")
+    pdf.set_y(80)
+    pdf.styled_table(
+        ["Key", "Summary", "Status"],
+        [[f"PROJ-{idx}", "Fix login flow", "Done"] for idx in range(80)],
+    )
+    for idx in range(20):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            "Analysis of performance issues",
+            "In Progress",
+            date(2025, 10, 12),
+            priority=1 + idx % 4,
+            estimate=8,
+            link="https://example.com",
+        )
+    data = {f"cat{idx}": idx + 1 for idx in range(6)}
+    pdf.bar_chart(data, "Categories", limit=3)
+    pdf.pie_chart(data, "Categories")
+
+
+def test_estimate_output_size():
+    assert estimate_output_size(1, 0, [], [], 0) == 2_500
+    assert estimate_output_size(2, 1000, [10], [4], 2) == 10_110
+
+
+def test_dry_run_matches_the_layout_of_the_report():
+    pdf = PDF(NOTION)
+    build_report(pdf)
+    expected = pdf.estimate()
+    output_size = len(pdf.output())
+
+    dry_run = PDF(NOTION, dry_run=True)
+    with patch("briefly.rendering.pdf_generator.build_pie_chart_bytes") as build:
+        build_report(dry_run)
+        estimate = dry_run.estimate()
+    build.assert_not_called()
+
+    assert estimate.pages == expected.pages == 5
+    assert estimate.elements == expected.elements
+    assert estimate.elements["task_card"] == 20
+    assert estimate.elements["table_row"] == 80
+    assert estimate.content_bytes == pytest.approx(expected.content_bytes, 0.05)
+    assert estimate.estimated_size == pytest.approx(output_size, 0.25)
+
+
+def test_dry_run_does_not_emit_page_content():
+    pdf = PDF(NOTION, dry_run=True)
+    build_report(pdf)
+    assert all(len(page.contents) == 0 for page in pdf.pages.values())
+
+
+def build_dashboard(pdf: PDF) -> None:
+    pdf.add_page()
+    for idx in range(40):
+        pdf.progress_bar(idx, f"Sprint {idx} completion", maximum=40)
+    for idx in range(40):
+        pdf.gauge(idx, f"Capacity {idx}", maximum=40)
+    for idx in range(10):
+        pdf.donut({f"cat{n}": n + 1 for n in range(idx % 6 + 1)}, f"Chart {idx}")
+
+
+def test_dry_run_matches_the_vector_components():
+    pdf = PDF(NOTION)
+    build_dashboard(pdf)
+    expected = pdf.estimate()
+
+    dry_run = PDF(NOTION, dry_run=True)
+    build_dashboard(dry_run)
+    estimate = dry_run.estimate()
+
+    assert estimate.pages == expected.pages
+    assert estimate.elements == expected.elements
+    assert estimate.content_bytes == pytest.approx(expected.content_bytes, 0.1)
@@ -0,0 +1,30 @@
+import pytest
+
+from briefly.rendering.icons import FLAG_ICON, Icon, compile_icon
+
+
+def test_compile_icon():
+    assert compile_icon(FLAG_ICON).splitlines()[:3] == [
+        "14.40 18.00 m",
+        "14.00 20.00 l",
+        "5.00 20.00 l",
+    ]
+    assert compile_icon(FLAG_ICON).endswith("h\nf")
+
+
+def test_compile_icon_with_curves():
+    icon = Icon("test", "M2 2c1 0 2 1 2 2s1 2 2 2C8 6 9 7 9 8z")
+    assert compile_icon(icon).splitlines() == [
+        "2.00 22.00 m",
+        "3.00 22.00 4.00 21.00 4.00 20.00 c",
+        "4.00 19.00 5.00 18.00 6.00 18.00 c",
+        "8.00 18.00 9.00 17.00 9.00 16.00 c",
+        "h",
+        "f",
+    ]
+
+
+@pytest.mark.parametrize("path", ["2 2L4 4", "M2 2L4", "M2 2A1 1 0 0 1 4 4"])
+def test_compile_invalid_icon(path: str):
+    with pytest.raises(ValueError):
+        compile_icon(Icon("invalid", path))
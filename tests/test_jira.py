@@ -0,0 +1,179 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+from briefly.jira import (
+    Issue,
+    issue_table,
+    read_csv_issues,
+    read_json_issues,
+    render_task_cards,
+)
+from briefly.rendering.pdf_generator import PDF
+
+ISSUES = [
+    {
+        "key": "PROJ-1",
+        "fields": {
+            "summary": "Fix login flow",
+            "status": {"name": "In Progress", "id": "3"},
+            "duedate": "2025-01-03",
+            "priority": {"name": "High", "id": "2"},
+            "customfield_10016": 3.0,
+            "customfield_10021": [{"value": "Impediment"}],
+            "description": 'Brackets [ and braces { in a "string"',
+        },
+    },
+    {
+        "key": "PROJ-2",
+        "fields": {
+            "summary": "Add metrics dashboard",
+            "status": {"name": "Done"},
+            "duedate": None,
+            "priority": None,
+            "customfield_10016": None,
+            "customfield_10021": None,
+        },
+    },
+]
+SEARCH_RESPONSE = {
+    "expand": "names,schema",
+    "names": {"issues": "Not the issues", "list": [1, 2]},
+    "startAt": 0,
+    "total": 2,
+    "issues": ISSUES,
+}
+CSV_EXPORT = (
+    "Summary,Issue key,Status,Priority,Due date,Sprint,Sprint,"
+    "Custom field (Story Points),Custom field (Flagged)\n"
+    "Fix login flow,PROJ-1,In Progress,High,03/Jan/25 12:00 AM,S1,S2,3,Impediment\n"
+    '"Add metrics, dashboard",PROJ-2,Done,,,,,,\n'
+)
+
+
+@pytest.mark.parametrize("export", [SEARCH_RESPONSE, ISSUES])
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_read_json_issues(export: object, chunk_size: int):
+    source = io.BytesIO(json.dumps(export, indent=1).encode())
+    issues = list(
+        read_json_issues(source, base_url="https://a.b/", chunk_size=chunk_size)
+    )
+
+    assert issues == [
+        Issue(
+            "PROJ-1",
+            "Fix login flow",
+            "In Progress",
+            "2025-01-03",
+            "High",
+            3.0,
+            True,
+            "https://a.b/browse/PROJ-1",
+        ),
+        Issue(
+            "PROJ-2",
+            "Add metrics dashboard",
+            "Done",
+            link="https://a.b/browse/PROJ-2",
+        ),
+    ]
+    assert not source.closed
+
+
+def test_read_json_issues_from_path(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(SEARCH_RESPONSE))
+    assert [issue.key for issue in read_json_issues(path)] == ["PROJ-1", "PROJ-2"]
+
+
+@pytest.mark.parametrize(
+    "export",
+    ['{"total": 0}', '{"issues": [{"key": "PROJ-1"}', ""],
+)
+def test_read_json_issues_with_invalid_export(export: str):
+    with pytest.raises(ValueError):
+        list(read_json_issues(io.StringIO(export)))
+
+
+def test_read_json_issues_with_invalid_issue():
+    with pytest.raises(TypeError):
+        list(read_json_issues(io.StringIO('{"issues": [1]}')))
+
+
+def test_read_csv_issues():
+    issues = list(read_csv_issues(io.StringIO(CSV_EXPORT)))
+
+    assert issues == [
+        Issue(
+            "PROJ-1",
+            "Fix login flow",
+            "In Progress",
+            "03/Jan/25 12:00 AM",
+            "High",
+            3.0,
+            True,
+        ),
+        Issue("PROJ-2", "Add metrics, dashboard", "Done"),
+    ]
+    assert issues[0].due_date == date(2025, 1, 3)
+
+
+def test_read_csv_issues_without_key_column():
+    with pytest.raises(ValueError):
+        list(read_csv_issues(io.StringIO("Summary,Status\nTitle,Done\n")))
+    assert list(read_csv_issues(io.StringIO(""))) == []
+
+
+def test_issue_due_date_is_parsed_lazily():
+    issue = Issue("PROJ-1", "Title", "Done", due="soon")
+    with pytest.raises(ValueError):
+        _ = issue.due_date
+    assert Issue("PROJ-1", "Title", "Done", due="2025-01-03T10:00").due_date == date(
+        2025, 1, 3
+    )
+
+
+def test_task_card_arguments():
+    issue = Issue("PROJ-1", "Title", "Done", "2025-01-03", "Critical", 2.5, link=None)
+    assert issue.task_card_arguments() == {
+        "task_id": "PROJ-1",
+        "title": "Title",
+        "status": "Done",
+        "due_date": date(2025, 1, 3),
+        "priority": 1,
+        "estimate": 2,
+        "flagged": False,
+        "link": 0,
+    }
+    assert Issue("PROJ-2", "Title", "Done", priority="Custom").priority_level is None
+
+
+def test_render_task_cards(pdf: PDF):
+    issues = read_json_issues(io.StringIO(json.dumps(SEARCH_RESPONSE)), "https://a.b")
+    assert render_task_cards(pdf, issues) == 2
+    assert pdf.element_counts["task_card"] == 2
+    assert len(pdf.pages[1].annots) == 2
+
+
+def test_issue_table_consumes_the_issues_lazily(pdf: PDF):
+    read = []
+
+    def issues():
+        for idx in range(50):
+            read.append(idx)
+            yield Issue(f"PROJ-{idx}", "Title", "Done", "2025-01-03", estimate=1.5)
+
+    issue_table(pdf, issues(), columns=("key", "due", "estimate"), sample_size=10)
+
+    assert len(read) == 50
+    assert pdf.element_counts["table_row"] == 50
+    assert Issue("PROJ-1", "T", "D", "2025-01-03", estimate=1.5).table_row(
+        ("key", "due", "estimate", "priority")
+    ) == ["PROJ-1", "03.01.2025", "1.5", ""]
+
+
+def test_issue_table_with_unknown_column(pdf: PDF):
+    with pytest.raises(ValueError):
+        issue_table(pdf, [], columns=("key", "assignee"))
@@ -0,0 +1,120 @@
+import pytest
+
+from briefly.rendering.lazy import LazyReport, _PagesPDF
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.snapshot import snapshot_page, stamp
+
+
+@pytest.fixture
+def texts(page_texts, generation_time):
+    def texts(snapshot) -> list[str]:
+        pdf = PDF(generation_time=generation_time)
+        stamp(pdf, snapshot)
+        return page_texts(pdf, 1)
+
+    return texts
+
+
+@pytest.fixture
+def footers(monkeypatch):
+    numbers = []
+    monkeypatch.setattr(
+        _PagesPDF, "footer", lambda self: numbers.append(self.page_no())
+    )
+    return numbers
+
+
+def test_render_pages_of_the_whole_report_matches_the_report(
+    build_report, report, generation_time
+):
+    lazy = LazyReport(build_report, reproducible=True, generation_time=generation_time)
+    expected = report(reproducible=True)
+
+    assert lazy.page_count == expected.page
+    assert lazy.render_pages(range(1, lazy.page_count + 1)) == bytes(expected.output())
+
+
+def test_page_snapshots_match_the_pages_of_the_report(
+    build_report, report, texts, generation_time
+):
+    lazy = LazyReport(build_report, generation_time=generation_time)
+    expected = report()
+    expected.output()
+
+    for page in range(1, lazy.page_count + 1):
+        (snapshot,) = lazy.page_snapshots(range(page, page + 1))
+        assert texts(snapshot) == texts(snapshot_page(expected, page))
+
+
+def test_render_pages_of_a_table_continued_from_the_previous_page(
+    footers, build_report, generation_time
+):
+    lazy = LazyReport(build_report, generation_time=generation_time)
+    last_table_page = lazy.page_count - 1
+
+    output = lazy.render_pages(range(last_table_page, last_table_page + 1))
+
+    assert output.count(b"/Type /Page\n") == 1
+    assert footers[-1] == last_table_page
+
+
+def test_render_pages_numbers_the_pages_as_in_the_report(
+    footers, build_report, generation_time
+):
+    lazy = LazyReport(build_report, generation_time=generation_time)
+
+    output = lazy.render_pages(range(2, 4))
+
+    assert output.count(b"/Type /Page\n") == 2
+    assert footers[-2:] == [2, 3]
+
+
+def test_render_pages_with_a_step(footers, build_report, generation_time):
+    lazy = LazyReport(build_report, generation_time=generation_time)
+
+    output = lazy.render_pages(range(1, 4, 2))
+
+    assert output.count(b"/Type /Page\n") == 2
+    assert footers[-2:] == [1, 3]
+
+
+def test_render_pages_with_rows_of_an_iterator(texts, generation_time):
+    def build(pdf: PDF) -> None:
+        pdf.add_page()
+        pdf.styled_table(["Key"], ([f"PROJ-{idx}"] for idx in range(80)))
+
+    lazy = LazyReport(build, generation_time=generation_time)
+    expected = PDF(generation_time=generation_time)
+    expected.add_page()
+    expected.styled_table(["Key"], [[f"PROJ-{idx}"] for idx in range(80)])
+    expected.output()
+
+    assert lazy.page_count == expected.page > 1
+    (snapshot,) = lazy.page_snapshots(range(2, 3))
+    assert texts(snapshot) == texts(snapshot_page(expected, 2))
+
+
+@pytest.mark.parametrize("pages", [range(1), range(1, 100), range(2, 2)])
+def test_render_pages_out_of_the_report(pages, build_report, generation_time):
+    lazy = LazyReport(build_report, generation_time=generation_time)
+
+    with pytest.raises(ValueError):
+        lazy.render_pages(pages)
+
+
+def test_render_pages_of_the_table_of_contents(generation_time):
+    def build(pdf: PDF) -> None:
+        pdf.add_page()
+        pdf.table_of_contents()
+        pdf.section_title("Tasks")
+
+    lazy = LazyReport(build, generation_time=generation_time)
+
+    with pytest.raises(ValueError, match="table of contents"):
+        lazy.render_pages(range(1, 2))
+    assert lazy.render_pages(range(2, 3)).count(b"/Type /Page\n") == 1
+
+
+def test_lazy_report_in_dry_run(build_report):
+    with pytest.raises(ValueError, match="dry-run"):
+        LazyReport(build_report, dry_run=True)
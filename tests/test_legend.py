@@ -0,0 +1,79 @@
+import pytest
+
+from briefly.rendering.cache import LRUCache
+from briefly.rendering.legend import layout_legend
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import NOTION
+
+
+def measure(texts):
+    return [len(text) * 2.0 for text in texts]
+
+
+def test_layout_legend_with_no_labels():
+    layout = layout_legend([], measure, 100, 100)
+    assert layout.entries == ()
+    assert layout.width == 2
+
+
+def test_layout_legend_uses_columns_of_four():
+    layout = layout_legend(["a", "bb", "c", "d", "eeeee"], measure, 100, 100)
+    assert layout.rows == 4
+    assert layout.column_widths == (4, 10)
+    assert layout.column_offsets == (2, 16)
+    assert [(e.column, e.row) for e in layout.entries] == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (0, 3),
+        (1, 0),
+    ]
+
+
+def test_layout_legend_adds_rows_when_columns_overflow():
+    labels = [f"label {idx:02}" for idx in range(24)]
+    layout = layout_legend(labels, measure, 60, 200)
+    assert layout.rows == 12
+    assert len(layout.column_widths) == 2
+    assert all(e.label in labels for e in layout.entries)
+
+
+def test_layout_legend_aggregates_tail_into_other():
+    labels = [f"label {idx:02}" for idx in range(100)]
+    layout = layout_legend(labels, measure, 30, 40)
+    assert len(layout.entries) == 8
+    assert layout.entries[-1].label == "Other (+93)"
+    assert layout.entries[-1].color_index is None
+
+
+def test_layout_legend_truncates_long_labels():
+    labels = ["a very very long label that does not fit", "short"]
+    layout = layout_legend(labels, measure, 40, 40)
+    assert layout.entries[0].label.endswith("...")
+    assert layout.column_widths[0] <= 25
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_legend_with_many_labels_fits_the_page():
+    pdf = PDF(NOTION)
+    pdf.add_page()
+    labels = [f"Assignee number {idx}" for idx in range(80)]
+    x, y = pdf._legend(labels, 60, 25, "Assignees")
+    assert x <= pdf.w - pdf.r_margin + 10
+    assert y <= pdf.h - pdf.b_margin
+
+    pdf._legend(labels, 60, 25, "Assignees")
+    assert pdf._legend_layouts.hits == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from briefly.rendering.pdf_generator import PDF
+
+
+def _annotations(pdf: PDF) -> list:
+    return [annot for page in pdf.pages.values() for annot in page.annots]
+
+
+def test_links_to_the_same_anchor_share_the_destination(pdf: PDF):
+    pdf.task_card("TEST-1", "First", "Done", link="#summary")
+    pdf.task_card("TEST-2", "Second", "Done", link="#summary")
+    pdf.add_page()
+    pdf.section_title("Summary", anchor="summary")
+
+    annotations = _annotations(pdf)
+    assert len(annotations) == 2
+    assert annotations[0].dest is annotations[1].dest
+    assert len(pdf.links) == 1
+
+    pdf.output()
+    assert annotations[0].dest.page_number == 2
+    assert annotations[0].dest.top == pytest.approx(pdf.h_pt - 30 * pdf.k)
+
+
+def test_task_card_has_a_single_annotation(pdf: PDF):
+    pdf.task_card(
+        "TEST-1",
+        "A task with a title that spans over multiple lines of the card",
+        "In Progress",
+        link="https://example.com/TEST-1",
+    )
+    assert len(_annotations(pdf)) == 1
+
+
+def test_task_card_anchor(pdf: PDF):
+    pdf.section_title("Tasks", link="#TEST-2")
+    pdf.task_card("TEST-1", "First", "Done")
+    pdf.task_card("TEST-2", "Second", "Done", anchor="TEST-2")
+
+    pdf.output()
+    dest = pdf.links[pdf.anchor_link("TEST-2")]
+    assert dest.page_number == 1
+    assert dest.top == pytest.approx(pdf.h_pt - 45 * pdf.k)
+
+
+def test_undefined_anchor(pdf: PDF):
+    pdf.section_title("Tasks", link="#missing")
+    with pytest.raises(ValueError, match="missing"):
+        pdf.output()
+
+
+def test_duplicate_anchor(pdf: PDF):
+    pdf.section_title("Tasks", anchor="tasks")
+    with pytest.raises(ValueError):
+        pdf.section_title("More tasks", anchor="tasks")
+
+
+def test_table_of_contents(pdf: PDF):
+    pdf.table_of_contents(pages=2)
+    for idx in range(50):
+        pdf.section_title(f"Section {idx}")
+
+    pdf.output()
+    assert [section.name for section in pdf._outline][:2] == ["Section 0", "Section 1"]
+    # one link per section, on the reserved pages
+    toc_annotations = [*pdf.pages[1].annots, *pdf.pages[2].annots]
+    assert len(toc_annotations) == 50
+    assert toc_annotations[0].dest.page_number == 3
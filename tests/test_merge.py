@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from briefly import merge
+from briefly.rendering.merge import append_report
+from briefly.rendering.pdf_generator import PDF
+from briefly.style import NOTION
+
+
+def _report(team: str) -> PDF:
+    pdf = PDF(NOTION)
+    pdf.add_page()
+    pdf.main_title(f"Team {team}")
+    pdf.section_title("Tasks", anchor="tasks")
+    pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+    pdf.task_card(
+        f"{team}-1", "Fix (the) login", "Done", date(2025, 1, 3), 1, 5, link="#tasks"
+    )
+    pdf.add_page()
+    pdf.section_title(f"More tasks of {team}")
+    return pdf
+
+
+def test_merge_concatenates_the_pages(page_texts):
+    merged = merge([_report("Alpha"), _report("Beta")], NOTION)
+
+    assert merged.page == 4
+    assert "Team Alpha" in page_texts(merged, 1)
+    assert "Team Beta" in page_texts(merged, 3)
+    assert "Fix (the) login" in page_texts(merged, 3)
+    assert "More tasks of Beta" in page_texts(merged, 4)
+    assert [section.page_number for section in merged._outline] == [1, 2, 3, 4]
+    assert merged.element_counts["task_card"] == 2
+
+
+def test_merge_renumbers_the_footer(page_texts):
+    first, second = _report("Alpha"), _report("Beta")
+    first.output()
+    merged = merge([first, second], NOTION)
+
+    texts = page_texts(merged, 3)
+    assert "Page 3" in texts
+    assert "Page 1" not in texts
+
+
+def test_merge_shares_fonts_and_images():
+    sizes = [len(_report(team).output()) for team in ("Alpha", "Beta", "Gamma")]
+    merged = merge([_report(team) for team in ("Alpha", "Beta", "Gamma")], NOTION)
+
+    assert len(merged.image_cache.images) == 1
+    assert len(merged.output()) < sum(sizes) / 2
+
+
+def test_merge_moves_the_links():
+    merged = merge([_report("Alpha"), _report("Beta")], NOTION)
+
+    annotations = [page.annots for page in merged.pages.values()]
+    assert annotations[0][0].dest.page_number == 1
+    assert annotations[2][0].dest.page_number == 3
+
+
+def test_append_report_in_dry_run():
+    with pytest.raises(ValueError):
+        append_report(PDF(NOTION), PDF(NOTION, dry_run=True))
+
+
+def test_append_report_with_a_core_font():
+    report = PDF(NOTION)
+    report.add_page()
+    report.set_font("helvetica")
+    report.cell(10, 10, "Core")
+
+    with pytest.raises(TypeError):
+        append_report(PDF(NOTION), report)
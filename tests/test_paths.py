@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from briefly.rendering.paths import annular_sector, arc, horizontal_lines, rounded_rect
+
+
+def test_rounded_rect():
+    path = rounded_rect(10, 20, 8, 30, 1)
+    assert path.startswith("11.00 20.00 m 17.00 20.00 l")
+    assert path.count(" c") == 4
+    assert path.endswith(" h")
+
+
+def test_rounded_rect_radius_fits_the_rectangle():
+    assert rounded_rect(0, 0, 2, 10, 5).startswith("1.00 0.00 m 1.00 0.00 l")
+    assert rounded_rect(10, 20, 8, 0.5) == "10.00 20.00 8.00 0.50 re"
+
+
+def test_horizontal_lines():
+    assert (
+        horizontal_lines(10, [5, 2.5]) == "0 5.00 m 10.00 5.00 l\n0 2.50 m 10.00 2.50 l"
+    )
+
+
+def bezier_point(p0, p1, p2, p3, t):
+    return tuple(
+        (1 - t) ** 3 * a + 3 * (1 - t) ** 2 * t * b + 3 * (1 - t) * t**2 * c + t**3 * d
+        for a, b, c, d in zip(p0, p1, p2, p3)
+    )
+
+
+def test_arc_approximates_the_circle():
+    path = arc(50, 50, 100, 90, -180)
+    numbers = [float(token) for token in path.split() if token not in "mlc"]
+    assert path.endswith(" c") and path.count(" c") == 3
+    assert numbers[:2] == [50, 150]
+    assert numbers[-2:] == [-50, 50]
+
+    start = (numbers[0], numbers[1])
+    for idx in range(2, len(numbers), 6):
+        p1, p2, p3 = [tuple(numbers[idx + j : idx + j + 2]) for j in (0, 2, 4)]
+        for t in (0.25, 0.5, 0.75):
+            x, y = bezier_point(start, p1, p2, p3, t)
+            assert math.hypot(x - 50, y - 50) == pytest.approx(100, abs=0.05)
+        start = p3
+
+
+def test_arc_without_move():
+    assert arc(0, 0, 10, 0, 45, move=False).startswith("10.00 0.00 l")
+
+
+def test_annular_sector():
+    path = annular_sector(0, 0, 10, 6, 180, 0)
+    assert path.startswith("-10.00 0.00 m")
+    # the inner arc goes back from the end to the start
+    assert "10.00 0.00 c 6.00 0.00 l" in path
+    assert path.endswith("-6.00 0.00 c h")
+
+
+def test_annular_sector_without_hole():
+    path = annular_sector(5, 5, 10, 0, 90, 0)
+    assert path.startswith("5.00 5.00 m 5.00 15.00 l")
+    assert path.endswith("15.00 5.00 c h")
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.pool import PDFPool
+from briefly.style import NOTION
+
+
+def build(pdf: PDF, title: str) -> None:
+    pdf.add_page()
+    pdf.main_title(title)
+    pdf.summary_card(["Total Tickets: 58", "Completed: 42"])
+    pdf.task_card("PROJ-1", "Fix login flow", "Done", link="https://example.com")
+
+
+def test_reset_renders_like_a_new_instance(render_report):
+    pdf = PDF(NOTION)
+    render_report(pdf, build, "First report with some other glyphs: xyzq")
+    pdf.reset()
+
+    assert pdf.page == 0
+    assert pdf.element_counts == {}
+    assert render_report(pdf, build, "Second report") == render_report(
+        PDF(NOTION), build, "Second report"
+    )
+
+
+def test_pool_reuses_released_instances(render_report):
+    pool = PDFPool(NOTION, max_idle=1)
+    with pool.pdf() as pdf:
+        render_report(pdf, build, "Report")
+    assert pool.idle == 1
+
+    with pool.pdf() as reused:
+        assert reused is pdf
+        assert reused.page == 0
+    assert pool.idle == 1
+
+
+def test_pool_limits():
+    pool = PDFPool(NOTION, max_idle=1, max_instances=2)
+    pool.prewarm(3)
+    assert pool.idle == 1
+
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(first)
+    pool.release(second)
+    assert pool.idle == 1
+
+    with pytest.raises(ValueError):
+        PDFPool(max_instances=0)
+    with pytest.raises(ValueError):
+        PDFPool(max_idle=-1)
+
+
+def test_pool_releases_the_slot_when_creation_fails():
+    pool = PDFPool(NOTION, max_instances=1, memory_budget=0)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            pool.acquire(timeout=0.01)
+
+
+def test_pool_rejects_unknown_and_repeated_releases():
+    pool = PDFPool(NOTION, max_idle=2, max_instances=1)
+    pdf = pool.acquire()
+    pool.release(pdf)
+
+    with pytest.raises(ValueError):
+        pool.release(pdf)
+    with pytest.raises(ValueError):
+        pool.release(PDF(NOTION))
+    assert pool.idle == 1
+    assert pool.acquire(timeout=0.01) is pdf
+
+
+def test_pool_is_thread_safe(render_report):
+    pool = PDFPool(NOTION, max_idle=2, max_instances=3)
+    expected = render_report(PDF(NOTION), build, "Report")
+    results: list[bytes] = []
+
+    def worker() -> None:
+        for _ in range(3):
+            with pool.pdf(timeout=30) as pdf:
+                results.append(render_report(pdf, build, "Report"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [expected] * 12
+    assert pool.idle == 2
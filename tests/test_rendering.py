@@ -1,23 +1,25 @@
+import re
 from datetime import date, datetime
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
+import numpy as np
 import pytest
 from fpdf import XPos, YPos
-from fpdf.enums import MethodReturnValue
+from PIL import Image
 
 from briefly.style import NOTION
-from briefly.rendering.graphs import build_pie_chart_bytes
+from briefly.rendering.graphs import (
+    CHART_DPI,
+    NOTION_CHART_COLORS,
+    MatplotlibBackend,
+    RasterBackend,
+    build_pie_chart_bytes,
+    chart_dpi,
+)
 from briefly.rendering.icons import DUE_DATE_ICON, FLAG_ICON, PRIORITY_ICON
 from briefly.rendering.pdf_generator import PDF
 
 
-@pytest.fixture
-def pdf() -> PDF:
-    pdf = PDF(NOTION)
-    pdf.add_page()
-    return pdf
-
-
 @pytest.fixture
 def data() -> dict[str, float]:
     return {
@@ -36,9 +38,10 @@ def test_graph():
     assert build_pie_chart_bytes([1, 2, 3]) is not None
 
 
-def test_graph_with_negative_values():
+@pytest.mark.parametrize("backend", [None, RasterBackend()])
+def test_graph_with_negative_values(backend):
     with pytest.raises(ValueError):
-        build_pie_chart_bytes([-1, -2, -3])
+        build_pie_chart_bytes([-1, -2, -3], backend=backend)
 
 
 def test_header(pdf: PDF):
@@ -88,6 +91,74 @@ def test_tag(pdf: PDF):
     assert height == 5
 
 
+def test_summary_cards(pdf: PDF):
+    pdf._out = MagicMock()
+    x, y = pdf.summary_cards(
+        [["Total: 58", "Completed: 42"], ["Open: 16"], ["Late: 3"]]
+    )
+    assert x == pytest.approx(pdf.w - 25)
+    # the second row is as high as its single-line card
+    assert y == 25 + 22 + 5 + 16
+    assert pdf.get_x() == 25
+    assert pdf.get_y() == y + 5
+    assert pdf.element_counts["summary_card"] == 3
+    # one fill color, one background path and one text object
+    _, backgrounds, text = [c.args[0] for c in pdf._out.call_args_list[-3:]]
+    assert backgrounds.count(" h") == 3
+    assert backgrounds.endswith(" f")
+    assert text.startswith("q ") and text.endswith("ET Q")
+    assert text.count(" Tm ") == 4
+
+
+def test_summary_cards_break_pages(pdf: PDF):
+    pdf.summary_cards([["Line"] * 5] * 24, columns=4)
+    # 6 rows of 40mm with 5mm spacing do not fit between 25mm and 272mm
+    assert pdf.page == 2
+    assert pdf.get_y() == 25 + 40 + 5
+
+
+def test_summary_cards_trims_long_lines(pdf: PDF):
+    blocks = []
+    pdf._text_block = MagicMock(side_effect=lambda lines, _: blocks.append(list(lines)))
+    pdf.summary_cards([["word " * 40]], columns=4)
+    (lines,) = blocks
+    assert lines[0][2].endswith("...")
+    assert pdf._text_width(lines[0][2]) < 32.5
+
+
+def test_summary_cards_with_invalid_columns(pdf: PDF):
+    with pytest.raises(ValueError):
+        pdf.summary_cards([["Line"]], columns=0)
+
+
+def test_tags(pdf: PDF):
+    pdf._out = MagicMock()
+    x, y = pdf.tags(["one", "two", "three"])
+    widths = pdf._measure_texts(["one", "two", "three"])
+    assert x == pytest.approx(25 + sum(widths) + 3 * 4 + 2 * 2)
+    assert y == 30
+    assert pdf.get_x() == 25
+    assert pdf.get_y() == 32
+    assert pdf.element_counts["tag"] == 3
+    _, backgrounds, text = [c.args[0] for c in pdf._out.call_args_list[-3:]]
+    assert backgrounds.count(" h") == 3
+    assert text.count(" Tm ") == 3
+
+
+def test_tags_wrap_lines(pdf: PDF):
+    x, y = pdf.tags(["Test tag"] * 4, wrap_width=30)
+    # two tags of 13.15mm fit in a line
+    assert y == pytest.approx(25 + 5 + 2 + 5)
+    assert x == pytest.approx(25 + 2 * 13.15 + 2, 0.01)
+
+
+def test_tags_break_pages(pdf: PDF):
+    pdf.set_y(265)
+    _, y = pdf.tags(["Test tag"] * 20)
+    assert pdf.page == 2
+    assert y == 30
+
+
 def test_pie_chart(pdf: PDF, data: dict[str, float]):
     x, y = pdf.pie_chart(data, "Test Pie Chart", 70)
     assert pdf.font_family == "inter"
@@ -96,6 +167,76 @@ def test_pie_chart(pdf: PDF, data: dict[str, float]):
     assert y == 54
 
 
+def test_donut(pdf: PDF, data: dict[str, float]):
+    pdf._out = MagicMock(wraps=pdf._out)
+    x, y = pdf.donut(data, "Test Donut", 30)
+    slices = [c.args[0] for c in pdf._out.call_args_list if c.args[0].endswith("h f")]
+    # the slice of the zero value is skipped
+    assert len(slices) == 3
+    assert pdf.element_counts["donut"] == 1
+    assert pdf.get_x() == pytest.approx(x + 10)
+    assert pdf.get_y() == 25
+    assert not pdf.image_cache.images
+
+
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_pie_chart_with_negative_values(dry_run: bool):
+    pdf = PDF(NOTION, dry_run=dry_run)
+    pdf.add_page()
+    with pytest.raises(ValueError):
+        pdf.pie_chart({"one": -1, "two": 2}, "Test Pie")
+
+
+def test_donut_with_negative_values(pdf: PDF):
+    with pytest.raises(ValueError):
+        pdf.donut({"one": -1, "two": 2}, "Test Donut")
+
+
+def test_donut_without_data(pdf: PDF):
+    assert pdf.donut({"one": 0}, "Test Donut") == (25, 25)
+    assert pdf.element_counts["donut"] == 0
+
+
+def test_gauge(pdf: PDF):
+    pdf._out = MagicMock(wraps=pdf._out)
+    x, y = pdf.gauge(30, "Capacity", maximum=60)
+    paths = [c.args[0] for c in pdf._out.call_args_list if c.args[0].endswith("h f")]
+    # the track and the value arc
+    assert len(paths) == 2
+    assert (x, y) == (25 + 77.5, 25 + 20)
+    assert pdf.get_x() == 25 + 77.5 + 5
+    assert pdf.get_y() == 25
+
+    pdf.gauge(0, "Empty")
+    assert pdf.get_x() == 25
+    assert pdf.get_y() == 25 + 20 + 5
+
+
+def test_progress_bar(pdf: PDF):
+    pdf._out = MagicMock(wraps=pdf._out)
+    x, y = pdf.progress_bar(120, "Sprint completion")
+    paths = [c.args[0] for c in pdf._out.call_args_list if c.args[0].endswith("h f")]
+    assert len(paths) == 2
+    # the value is clamped, so the progress fills the track
+    track, bar = (path.split(" m ")[1].split(" l")[0] for path in paths)
+    assert track == bar
+    assert (x, y) == (25 + 77.5, 25 + 10)
+    assert pdf.get_x() == 25 + 77.5 + 5
+
+
+def test_wide_progress_bar(pdf: PDF):
+    x, y = pdf.progress_bar(1, "Burn", maximum=4, wide=True)
+    assert x == pytest.approx(pdf.w - 25)
+    assert pdf.get_x() == 25
+    assert pdf.get_y() == y + 5
+
+
+@pytest.mark.parametrize("component", ["gauge", "progress_bar"])
+def test_components_with_invalid_maximum(pdf: PDF, component: str):
+    with pytest.raises(ValueError):
+        getattr(pdf, component)(1, "Caption", maximum=0)
+
+
 def test_task_card_with_all_properties(pdf: PDF):
     task_id = "TEST-1234"
     status = "In Progress"
@@ -106,7 +247,7 @@ def test_task_card_with_all_properties(pdf: PDF):
     title = "Test task"
     link = "link"
 
-    pdf.cell = MagicMock()
+    pdf._cell = MagicMock()
     pdf.accent_card = MagicMock()
     pdf._two_line_label = MagicMock()
     pdf._two_line_label.return_value = 30, 30
@@ -116,21 +257,28 @@ def test_task_card_with_all_properties(pdf: PDF):
     pdf._small_label.return_value = 30, 30
     pdf._flagged_icon = MagicMock()
     pdf._task_title = MagicMock()
+    pdf.link = MagicMock()
+    pdf._icon = MagicMock()
     pdf.task_card(task_id, title, status, due_date, priority, estimate, flagged, link)
 
     pdf.accent_card.assert_called_once_with(pdf.style.priority_color, 77.5, 30)
     pdf._two_line_label.assert_called_once_with(status, 37.5, 35)
     pdf._priority_icons.assert_called_once_with(priority, flagged, 36, 31)
     pdf._flagged_icon.assert_called_once_with(36, 31)
-    pdf._task_title.assert_called_once_with(title, 52.5, 29, link=link)
+    pdf._task_title.assert_called_once_with(title, 52.5, 29)
+    pdf.link.assert_called_once_with(25, 25, 77.5, 30, link)
 
     label_calls = [call("SP: 5", 30, 31), call("03.01.2025", 37.5, 31)]
     pdf._small_label.assert_has_calls(label_calls, any_order=True)
-    cell_calls = [
-        call(15, 5, task_id, align="R", link=link, new_x=XPos.LEFT, new_y=YPos.NEXT),
-        call(3, 5, DUE_DATE_ICON, align="L"),
-    ]
-    pdf.cell.assert_has_calls(cell_calls, any_order=True)
+    pdf._cell.assert_called_once_with(
+        15, 5, task_id, align="R", new_x=XPos.LEFT, new_y=YPos.NEXT
+    )
+    pdf._icon.assert_called_once_with(
+        DUE_DATE_ICON,
+        pytest.approx(35.5),
+        pytest.approx(32.465, 0.001),
+        NOTION.disabled_color,
+    )
 
 
 def test_task_card_color_depends_on_priority(pdf: PDF):
@@ -188,120 +336,144 @@ def test_break_page_if_needed(pdf: PDF):
 
 
 def test__task_title(pdf: PDF):
-    pdf.cell = MagicMock()
-    pdf.multi_cell = MagicMock()
+    pdf._cell = MagicMock()
+    pdf._wrap = MagicMock()
+    pdf._wrapped_cell = MagicMock()
 
     title = "Short task"
-    pdf.multi_cell.return_value = [title]
+    pdf._wrap.return_value = (title,)
     pdf._task_title(title, 30, 30)
-    pdf.multi_cell.assert_called_once_with(
-        45, 15, title, max_line_height=4, dry_run=True, output=MethodReturnValue.LINES
-    )
-    pdf.cell.assert_called_once_with(45, 5, title, align="L", link=0)
+    pdf._wrap.assert_called_once_with(title, 45)
+    pdf._cell.assert_called_once_with(45, 5, title, align="L", link=0)
+    pdf._wrapped_cell.assert_not_called()
 
     title = "Medium task with multiple lines"
-    pdf.multi_cell.return_value = ["Medium task", "with multiple lines"]
+    pdf._wrap.return_value = ("Medium task", "with multiple lines")
     pdf._task_title(title, 30, 30)
-    pdf.multi_cell.assert_called_with(
-        45, 15, title, align="L", max_line_height=4, link=0
+    pdf._wrapped_cell.assert_called_with(
+        45, 15, ("Medium task", "with multiple lines"), "L", max_line_height=4, link=0
     )
 
     title = "Very very very very very very long task with an incredibly long title"
-    pdf.multi_cell.return_value = [
+    pdf._wrap.return_value = (
         "Very very very",
         "long task",
         "with an",
         "incredibly long",
         "title",
-    ]
+    )
     pdf._trim_with_ellipsis = MagicMock(return_value="incredibly long ...")
     pdf._task_title(title, 30, 30)
     expected_title = "Very very very long task with an incredibly long ..."
-    pdf.multi_cell.assert_called_with(
-        45, 15, expected_title, align="L", max_line_height=4, link=0
-    )
+    pdf._wrap.assert_called_with(expected_title, 45)
     pdf._trim_with_ellipsis.assert_called_once_with("incredibly long", 45)
 
 
 def test__trim_with_ellipsis(pdf: PDF):
-    pdf.get_string_width = MagicMock()
-    pdf.get_string_width.side_effect = lambda text: len(text) * 2
+    pdf._text_width = MagicMock()
+    pdf._text_width.side_effect = lambda text: len(text) * 2
     assert pdf._trim_with_ellipsis("test", 10) == "test"
     assert pdf._trim_with_ellipsis("test test", 10) == "..."
     assert pdf._trim_with_ellipsis("test test", 15) == "test..."
 
 
 def test__priority_icons(pdf: PDF):
-    pdf.cell = MagicMock()
-    pdf.set_text_color = MagicMock()
+    pdf._icon = MagicMock()
 
     pdf._priority_icons(None, False, 10, 10)
-    pdf.cell.assert_not_called()
+    pdf._icon.assert_not_called()
 
     pdf._priority_icons(1, False, 10, 10)
-    expected_icons = PRIORITY_ICON * 4
-    pdf.cell.assert_called_with(15, 5, expected_icons)
-    text_color_calls = [
-        call(*pdf.style.priority_color),
-        call(*pdf.style.font_color),
-    ]
-    pdf.set_text_color.assert_has_calls(text_color_calls)
+    pdf._icon.assert_called_with(
+        PRIORITY_ICON,
+        pytest.approx(11),
+        pytest.approx(11.766, 0.001),
+        NOTION.priority_color,
+        4,
+    )
 
-    pdf._priority_icons(2, False, 10, 10)
-    expected_icons = PRIORITY_ICON * 3
-    pdf.cell.assert_called_with(15, 5, expected_icons)
-    text_color_calls = [
-        call(*pdf.style.font_color),
-    ]
-    pdf.set_text_color.assert_has_calls(text_color_calls)
+    for priority in (2, 3, 4):
+        pdf._priority_icons(priority, False, 10, 10)
+        pdf._icon.assert_called_with(
+            PRIORITY_ICON,
+            pytest.approx(11),
+            pytest.approx(11.766, 0.001),
+            NOTION.font_color,
+            5 - priority,
+        )
 
-    pdf._priority_icons(3, False, 10, 10)
-    expected_icons = PRIORITY_ICON * 2
-    pdf.cell.assert_called_with(15, 5, expected_icons)
-    text_color_calls = [
-        call(*pdf.style.font_color),
-    ]
-    pdf.set_text_color.assert_has_calls(text_color_calls)
+    pdf._priority_icons(3, True, 10, 10)
+    pdf._icon.assert_called_with(
+        PRIORITY_ICON,
+        pytest.approx(11),
+        pytest.approx(11.766, 0.001),
+        NOTION.disabled_color,
+        2,
+    )
 
-    pdf._priority_icons(4, False, 10, 10)
-    expected_icons = PRIORITY_ICON
-    pdf.cell.assert_called_with(15, 5, expected_icons)
-    text_color_calls = [
-        call(*pdf.style.font_color),
-    ]
-    pdf.set_text_color.assert_has_calls(text_color_calls)
 
-    pdf._priority_icons(3, True, 10, 10)
-    expected_icons = PRIORITY_ICON * 2
-    pdf.cell.assert_called_with(15, 5, expected_icons)
-    text_color_calls = [
-        call(*pdf.style.disabled_color),
+def test__icon(pdf: PDF):
+    end_x = pdf._icon(PRIORITY_ICON, 10, 10, NOTION.priority_color, 3)
+    assert end_x == pytest.approx(10 + 3 * 7 / pdf.k)
+    assert pdf._icon(PRIORITY_ICON, 10, 20, NOTION.font_color) == pytest.approx(
+        10 + 7 / pdf.k
+    )
+
+    contents = bytes(pdf.pages[1].contents)
+    assert contents.count(b"/I1 Do") == 4
+    assert len(pdf._form_xobjects) == 1
+    assert "material icons" not in pdf.fonts
+
+
+def test_icons_and_chart_images_have_distinct_xobject_indices(pdf: PDF):
+    pdf.compress = False
+    pdf._icon(PRIORITY_ICON, 10, 10, NOTION.priority_color)
+    pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+    pdf.pie_chart({"Done": 1, "To Do": 4}, "Status")
+    pdf._icon(FLAG_ICON, 10, 20, NOTION.priority_color)
+
+    indices = [form.index for form in pdf._form_xobjects.values()]
+    indices += [info["i"] for info in pdf.image_cache.images.values()]
+    assert sorted(indices) == [1, 2, 3, 4]
+    output = bytes(pdf.output())
+    assert output.count(b"/Subtype /Form") == 2
+    resources = re.search(rb"/XObject <<([^>]*)>>", output)
+    assert resources is not None
+    assert re.findall(rb"/I(\d+) \d+ 0 R", resources.group(1)) == [
+        b"1",
+        b"2",
+        b"3",
+        b"4",
     ]
-    pdf.set_text_color.assert_has_calls(text_color_calls)
 
 
 def test__small_label(pdf: PDF):
-    pdf.cell = MagicMock()
+    pdf._cell = MagicMock()
     x, y = pdf._small_label("text", 30, 50)
-    pdf.cell.assert_called_once_with(15, 5, "text", align="R")
+    pdf._cell.assert_called_once_with(15, 5, "text", align="R")
     assert x == 45
     assert y == 53
 
 
 def test__two_line_label(pdf: PDF):
-    pdf.multi_cell = MagicMock()
+    pdf._wrapped_cell = MagicMock()
     x, y = pdf._two_line_label("text", 30, 50)
-    pdf.multi_cell.assert_called_once_with(15, 6, "text", align="R", max_line_height=3)
+    pdf._wrapped_cell.assert_called_once_with(15, 6, ("text",), "R", max_line_height=3)
     assert x == 45
     assert y == 50
 
 
 def test__flagged_icon(pdf: PDF):
-    pdf.cell = MagicMock()
+    pdf._icon = MagicMock()
     pdf._flagged_icon(30, 50)
-    assert pdf.x == 30
+    assert pdf.x == 33
     assert pdf.y == 50
-    pdf.cell.assert_called_once_with(3, 5, FLAG_ICON, align="R")
+    pdf._icon.assert_called_once_with(
+        FLAG_ICON,
+        pytest.approx(29.531, 0.001),
+        pytest.approx(51.566, 0.001),
+        NOTION.priority_color,
+    )
 
 
 def test__accent_card(pdf: PDF):
@@ -322,28 +494,124 @@ def test__accent_card(pdf: PDF):
 
 
 def test__draw_gridlines(pdf: PDF):
-    pdf.line = MagicMock()
     pdf._draw_gridlines(25, 25, 20, 30)
-    line_calls = [
-        call(25, 25, 30, 25),
-        call(25, 30, 30, 30),
-        call(25, 35, 30, 35),
-        call(25, 40, 30, 40),
+    pdf._draw_gridlines(25, 60, 20, 30)
+    pdf._draw_gridlines(25, 95, 30, 30)
+
+    assert len(pdf._form_xobjects) == 2
+    form = pdf._form_xobjects[("gridlines", 14.17, 56.69)]
+    assert form.content.splitlines() == [
+        "0 56.69 m 14.17 56.69 l",
+        "0 42.52 m 14.17 42.52 l",
+        "0 28.35 m 14.17 28.35 l",
+        "0 14.17 m 14.17 14.17 l",
+        "S",
     ]
-    pdf.line.assert_has_calls(line_calls)
+    assert bytes(pdf.pages[1].contents).count(b"/I%d Do" % form.index) == 2
 
 
 def test__plot_bar_chart(pdf: PDF):
-    pdf.rect = MagicMock()
+    pdf._out = MagicMock()
     x, y = pdf._plot_bar_chart([], 30, 70)
     assert x == 25
     assert y == 25
-    pdf.rect.assert_not_called()
+    pdf._out.assert_not_called()
+
+    x, y = pdf._plot_bar_chart([1, 2, 4], 30, 70)
+    assert (x, y) == (40, 55)
+    bars = [args[0] for args, _ in pdf._out.call_args_list if args[0].endswith(" f")]
+    assert len(bars) == 3
+    # bottom-aligned bars with rounded corners
+    assert bars[0].startswith("77.95 685.98 m")
+    assert bars[2].endswith(" c h f")
+
+
+def test__plot_bar_chart_groups_bars_by_color(pdf: PDF):
+    colors = len(pdf.style.chart_colors)
+    pdf._out = MagicMock()
+    pdf._plot_bar_chart([1] * (colors + 2), 30, 70)
+
+    bars = [args[0] for args, _ in pdf._out.call_args_list if args[0].endswith(" f")]
+    assert len(bars) == colors
+    assert bars[0].count(" h") == 2
+
+
+def test_graph_is_quantized_to_a_palette():
+    buf = build_pie_chart_bytes([1, 2, 3], size=30)
+    assert buf is not None
+    with Image.open(buf) as image:
+        assert image.mode == "P"
+        assert "transparency" in image.info
+        # 30 mm at 150 dpi
+        assert image.size == (177, 177)
+
+
+def test_graph_of_tiny_chart_keeps_minimum_resolution():
+    assert chart_dpi(30) == CHART_DPI
+    assert chart_dpi(10) == pytest.approx(406.4)
+
+
+def test_pie_chart_reuses_identical_images(pdf: PDF):
+    with patch(
+        "briefly.rendering.pdf_generator.build_pie_chart_bytes",
+        wraps=build_pie_chart_bytes,
+    ) as build:
+        for _ in range(3):
+            pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+        pdf.pie_chart({"Done": 3, "To Do": 2}, "Status", height=20)
+    assert build.call_count == 2
+    assert len(pdf.image_cache.images) == 2
+    info = next(iter(pdf.image_cache.images.values()))
+    assert info["cs"] == "Indexed"
+    assert info["usages"] == 3
+
+
+def _rgba(values: list[float], backend) -> np.ndarray:
+    buf = build_pie_chart_bytes(values, size=30, palette=False, backend=backend)
+    assert buf is not None
+    with Image.open(buf) as image:
+        return np.asarray(image.convert("RGBA"), dtype=float)
+
+
+@pytest.mark.parametrize("values", [[1, 2, 3], [5, 0, 5], [1], [1, 1000]])
+def test_raster_backend_matches_matplotlib(values: list[float]):
+    expected, image = _rgba(values, MatplotlibBackend()), _rgba(values, RasterBackend())
+    assert image.shape == expected.shape
+    # the premultiplied colors differ only along the anti-aliased edges
+    difference = (
+        np.abs(
+            image[..., :3] * image[..., 3:] - expected[..., :3] * expected[..., 3:]
+        ).max(axis=2)
+        / 255
+    )
+    assert difference.mean() < 2
+    assert (difference > 64).mean() < 0.02
 
-    pdf._plot_bar_chart([1, 2, 4], 30, 70)
-    rect_calls = [
-        call(27, 47.5, 3, 7.5, style="F", round_corners=True, corner_radius=0.5),
-        call(32, 40.0, 3, 15.0, style="F", round_corners=True, corner_radius=0.5),
-        call(37, 25.0, 3, 30.0, style="F", round_corners=True, corner_radius=0.5),
-    ]
-    pdf.rect.assert_has_calls(rect_calls)
+
+def test_raster_backend_draws_the_slices_clockwise():
+    image = _rgba([1, 1], RasterBackend())
+    center = image.shape[0] // 2
+    assert tuple(image[center, center + 30]) == (*NOTION_CHART_COLORS[0], 255)
+    assert tuple(image[center, center - 30]) == (*NOTION_CHART_COLORS[1], 255)
+    assert image[0, 0, 3] == 0
+
+
+def test_pdf_with_chart_backend():
+    backend = RasterBackend()
+    pdf = PDF(NOTION, chart_backend=backend)
+    pdf.add_page()
+    with patch(
+        "briefly.rendering.pdf_generator.build_pie_chart_bytes",
+        wraps=build_pie_chart_bytes,
+    ) as build:
+        pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+    assert build.call_args.kwargs["backend"] is backend
+
+    time = datetime(2025, 1, 2)
+    hashes = {
+        PDF(
+            NOTION, reproducible=True, generation_time=time, chart_backend=backend
+        ).content_hash()
+        for backend in (MatplotlibBackend(), RasterBackend())
+    }
+    assert len(hashes) == 2
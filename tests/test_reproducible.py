@@ -0,0 +1,129 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+
+from briefly import PDF, merge
+from briefly.rendering.reproducible import InputHash, pinned_time
+from briefly.style import NOTION, PURPLE_HAZE
+
+
+def build(pdf: PDF, done: float = 3) -> PDF:
+    pdf.add_page()
+    pdf.main_title("Sprint report")
+    pdf.table_of_contents()
+    pdf.section_title("Status", anchor="status")
+    pdf.pie_chart({"Done": done, "To Do": 2}, "Status")
+    pdf.bar_chart(np.array([1.5, 3, 2]), "Velocity", labels=["W1", "W2", "W3"])
+    pdf.task_card("T-1", "Fix login", "Done", date(2025, 1, 3), 1, 5, link="#status")
+    return pdf
+
+
+@pytest.fixture
+def reproducible(generation_time):
+    def reproducible(style=NOTION, **kwargs) -> PDF:
+        kwargs.setdefault("generation_time", generation_time)
+        return PDF(style, reproducible=True, **kwargs)
+
+    return reproducible
+
+
+def test_reproducible_output(reproducible):
+    first, second = build(reproducible()), build(reproducible())
+
+    assert bytes(first.output()) == bytes(second.output())
+    assert first.content_hash() == second.content_hash()
+
+
+def test_content_hash_is_known_before_rendering(reproducible):
+    dry_run = build(reproducible(dry_run=True))
+    rendered = build(reproducible())
+    content_hash = rendered.content_hash()
+    rendered.output()
+
+    assert dry_run.content_hash() == content_hash == rendered.content_hash()
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        lambda reproducible: build(reproducible(), done=4),
+        lambda reproducible: build(reproducible(PURPLE_HAZE)),
+        lambda reproducible: build(reproducible(generation_time=datetime(2025, 1, 3))),
+        lambda reproducible: build(reproducible(format="letter")),
+    ],
+)
+def test_content_hash_depends_on_the_inputs(other, reproducible):
+    assert other(reproducible).content_hash() != build(reproducible()).content_hash()
+
+
+def test_content_hash_requires_the_reproducible_mode():
+    with pytest.raises(ValueError):
+        PDF(NOTION).content_hash()
+
+
+def test_reset_keeps_the_generation_time(reproducible, generation_time):
+    pdf = build(reproducible())
+    output = bytes(pdf.output())
+    content_hash = pdf.content_hash()
+    pdf.reset()
+
+    assert pdf.generation_time == generation_time
+    assert bytes(build(pdf).output()) == output
+    assert pdf.content_hash() == content_hash
+
+
+def test_merge_reproducible_reports(reproducible, generation_time):
+    def output(pdf: PDF) -> PDF:
+        pdf.output()
+        return pdf
+
+    def merged() -> PDF:
+        return merge(
+            [output(build(reproducible())), output(build(reproducible(), done=5))],
+            NOTION,
+            reproducible=True,
+            generation_time=generation_time,
+        )
+
+    assert bytes(merged().output()) == bytes(merged().output())
+    with pytest.raises(ValueError):
+        merge(
+            [build(PDF(NOTION))],
+            NOTION,
+            reproducible=True,
+            generation_time=generation_time,
+        )
+
+
+def test_pinned_time(monkeypatch: pytest.MonkeyPatch, generation_time):
+    assert pinned_time(generation_time) == generation_time
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1735689600")
+    assert pinned_time() == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert PDF(NOTION, reproducible=True).generation_time == pinned_time()
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+    with pytest.raises(ValueError):
+        pinned_time()
+
+    monkeypatch.delenv("SOURCE_DATE_EPOCH")
+    with pytest.raises(ValueError):
+        PDF(NOTION, reproducible=True)
+
+
+def _hash(*values) -> str:
+    input_hash = InputHash()
+    input_hash.update("call", *values)
+    return input_hash.hexdigest()
+
+
+def test_input_hash():
+    assert _hash(["ab"]) != _hash(["a", "b"])
+    assert _hash(1) != _hash(1.0) != _hash(True)
+    assert _hash(np.arange(3)) == _hash(memoryview(np.arange(3)))
+    assert _hash(np.arange(3)) != _hash(np.arange(3, dtype=np.int32))
+    assert _hash({"a": 1, "b": 2}) != _hash({"b": 2, "a": 1})
+
+    with pytest.raises(TypeError):
+        _hash(object())
@@ -0,0 +1,224 @@
+import http.client
+import json
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from briefly.server import (
+    Metrics,
+    WorkerPool,
+    create_server,
+    render_spec,
+)
+
+SPEC = {
+    "style": "notion",
+    "elements": [
+        {"element": "add_page"},
+        {"element": "main_title", "text": "Weekly report"},
+        {
+            "element": "summary_cards",
+            "cards": [["Total: 58", "Done: 42"], ["Open: 16"]],
+        },
+        {
+            "element": "task_card",
+            "task_id": "PROJ-1",
+            "title": "Fix login flow",
+            "status": "Done",
+            "due_date": "2025-01-03",
+        },
+        {"element": "bar_chart", "data": {"one": 1, "two": 3}, "caption": "Bars"},
+    ],
+}
+SLOW_SPEC = {
+    "elements": [
+        {"element": "add_page"},
+        {"element": "summary_cards", "cards": [["Line"] * 3] * 3000},
+    ]
+}
+
+
+def test_render_spec():
+    pdf = render_spec(SPEC)
+    assert pdf.startswith(b"%PDF")
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"style": "unknown", "elements": []},
+        {"elements": [{"element": "output"}]},
+        {"elements": [{"element": "add_page"}, {"element": "main_title"}]},
+        {"elements": [{"element": "main_title", "text": "No page"}]},
+        {
+            "elements": [
+                {"element": "add_page"},
+                {
+                    "element": "task_card",
+                    "task_id": "1",
+                    "title": "t",
+                    "status": "s",
+                    "due_date": "soon",
+                },
+            ]
+        },
+    ],
+)
+def test_render_spec_with_invalid_spec(spec: Any):
+    with pytest.raises(ValueError):
+        render_spec(spec)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [[], {"elements": {}}, {"style": ["notion"], "elements": []}],
+)
+def test_render_spec_with_invalid_types(spec: Any):
+    with pytest.raises(TypeError):
+        render_spec(spec)
+
+
+def test_metrics_percentiles():
+    metrics = Metrics(window=100)
+    for idx in range(200):
+        metrics.record(200 if idx % 4 else 503, idx / 1000)
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 200
+    assert snapshot["statuses"] == {"200": 150, "503": 50}
+    # only the last 100 latencies (100ms - 199ms) are kept
+    assert snapshot["latency_ms"] == {
+        "p50": 149,
+        "p90": 189,
+        "p95": 194,
+        "p99": 198,
+        "max": 199,
+    }
+
+
+def test_metrics_without_requests():
+    assert Metrics().snapshot()["latency_ms"]["p50"] is None
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"workers": 0}, {"workers": 1, "queue_size": -1}, {"workers": 1, "timeout": 0}],
+)
+def test_worker_pool_with_invalid_arguments(kwargs: dict[str, Any]):
+    with pytest.raises(ValueError):
+        WorkerPool(**kwargs)
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[WorkerPool]:
+    pool = WorkerPool(workers=1, queue_size=0, timeout=20)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="module")
+def server(pool: WorkerPool) -> Iterator[tuple[str, int]]:
+    server = create_server(pool, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+def request(
+    address: tuple[str, int], method: str, path: str, body: Any = None, **headers: str
+) -> tuple[int, bytes]:
+    connection = http.client.HTTPConnection(*address, timeout=30)
+    content = None if body is None else json.dumps(body).encode()
+    connection.request(method, path, content, headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def wait_idle(pool: WorkerPool) -> None:
+    deadline = time.monotonic() + 60
+    while pool.stats()["idle"] < pool.workers and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def test_server_renders_spec(server: tuple[str, int]):
+    status, body = request(server, "POST", "/render", SPEC)
+    assert status == 200
+    assert body.startswith(b"%PDF") and body.rstrip().endswith(b"%%EOF")
+
+
+def test_server_rejects_invalid_requests(server: tuple[str, int]):
+    status, body = request(server, "POST", "/render", {"elements": [{"element": "x"}]})
+    assert status == 400
+    assert "element" in json.loads(body)["error"]
+    assert request(server, "GET", "/unknown")[0] == 404
+    assert request(server, "GET", "/health")[0] == 200
+
+
+def test_server_rejects_invalid_style(server: tuple[str, int]):
+    status, body = request(
+        server, "POST", "/render", {"style": ["notion"], "elements": []}
+    )
+    assert status == 400
+    assert "style" in json.loads(body)["error"]
+
+
+def test_server_rejects_negative_content_length(server: tuple[str, int]):
+    with socket.create_connection(server, timeout=30) as client:
+        client.sendall(
+            b"POST /render HTTP/1.1\r\nHost: localhost\r\nContent-Length: -1\r\n\r\n"
+        )
+        assert client.recv(1024).startswith(b"HTTP/1.1 400")
+
+
+def test_server_rejects_requests_when_queue_is_full(
+    pool: WorkerPool, server: tuple[str, int]
+):
+    with pool.render(SPEC) as report:
+        status, _ = request(server, "POST", "/render", SPEC)
+        assert status == 503
+        assert b"".join(report).startswith(b"%PDF")
+    assert pool.stats()["idle"] == 1
+
+
+def test_server_times_out_and_replaces_worker(
+    pool: WorkerPool, server: tuple[str, int]
+):
+    restarts = pool.stats()["restarts"]
+    status, _ = request(
+        server, "POST", "/render", SLOW_SPEC, **{"X-Render-Timeout": "0.01"}
+    )
+    assert status == 504
+    assert pool.stats()["restarts"] == restarts + 1
+
+    wait_idle(pool)
+    assert request(server, "POST", "/render", SPEC)[0] == 200
+
+
+def test_server_metrics(server: tuple[str, int]):
+    request(server, "POST", "/render", SPEC)
+    status, body = request(server, "GET", "/metrics")
+    metrics = json.loads(body)
+    assert status == 200
+    assert metrics["statuses"]["200"] >= 1
+    assert metrics["workers"] == 1
+    assert metrics["latency_ms"]["p50"] > 0
+
+
+def test_server_on_unix_socket(pool: WorkerPool, tmp_path):
+    path = str(tmp_path / "briefly.sock")
+    server = create_server(pool, socket_path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            client.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            assert client.recv(1024).startswith(b"HTTP/1.1 200")
+    finally:
+        server.shutdown()
+        server.server_close()
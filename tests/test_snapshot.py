@@ -0,0 +1,99 @@
+from datetime import date
+
+import pytest
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.snapshot import record_pages, snapshot_page, stamp
+from briefly.style import NOTION
+
+
+def _cover(pdf: PDF) -> None:
+    pdf.add_page()
+    pdf.main_title("Weekly report")
+    pdf.task_card(
+        "PROJ-1", "Example task", "Done", date(2025, 1, 3), 1, 5, link="https://a.b"
+    )
+    pdf.pie_chart({"Done": 3, "To Do": 2}, "Status")
+    pdf.add_page()
+    pdf.section_title("Appendix")
+
+
+def test_stamp_draws_the_recorded_pages(page_texts, generation_time):
+    cover, appendix = record_pages(_cover, NOTION)
+    pdf = PDF(NOTION, generation_time=generation_time)
+    stamp(pdf, cover)
+    pdf.add_page()
+    pdf.section_title("Body")
+    stamp(pdf, appendix)
+    stamp(pdf, cover)
+
+    assert pdf.page == 4
+    assert "Weekly report" in page_texts(pdf, 1)
+    assert "Appendix" in page_texts(pdf, 3)
+    # the footer is drawn by the report
+    assert "Page 3" in page_texts(pdf, 3)
+    assert "02.01.2025 15:30:45" in page_texts(pdf, 1)
+    assert len(pdf.image_cache.images) == 1
+    assert pdf.pages[1].annots[0].a.uri == "https://a.b"
+    assert pdf.element_counts["page_snapshot"] == 3
+
+
+def test_stamp_reencodes_the_text_for_other_subsets(page_texts):
+    (cover, _) = record_pages(_cover, NOTION)
+    pdf = PDF(NOTION)
+    pdf.add_page()
+    pdf.main_title("Other glyphs first: xyzq")
+    stamp(pdf, cover)
+    stamp(pdf, cover)
+
+    assert "Weekly report" in page_texts(pdf, 2)
+    assert "Example task" in page_texts(pdf, 3)
+    assert len(pdf.pages[2].annots) == 1
+
+
+def test_snapshot_page_of_an_output_report():
+    report = PDF(NOTION)
+    _cover(report)
+    report.output()
+    snapshot = snapshot_page(report, 1)
+
+    assert snapshot.digest == record_pages(_cover, NOTION)[0].digest
+    assert b"Page 1" not in snapshot.content
+    with pytest.raises(ValueError):
+        snapshot_page(report, 3)
+
+
+def test_stamp_with_a_different_page_size():
+    (cover, _) = record_pages(_cover, NOTION)
+    with pytest.raises(ValueError):
+        stamp(PDF(NOTION, orientation="landscape"), cover)
+
+
+def test_snapshot_page_in_dry_run():
+    pdf = PDF(NOTION, dry_run=True)
+    pdf.add_page()
+    with pytest.raises(ValueError):
+        snapshot_page(pdf)
+
+
+def test_snapshot_page_with_a_core_font():
+    pdf = PDF(NOTION)
+    pdf.add_page()
+    pdf.set_font("helvetica")
+    pdf.cell(10, 10, "Core")
+
+    with pytest.raises(TypeError):
+        snapshot_page(pdf)
+
+
+def test_stamp_into_reproducible_report(generation_time):
+    (cover, _) = record_pages(_cover, NOTION)
+
+    def render() -> PDF:
+        pdf = PDF(NOTION, reproducible=True, generation_time=generation_time)
+        stamp(pdf, cover)
+        return pdf
+
+    first, second = render(), render()
+    assert first.content_hash() == second.content_hash()
+    assert bytes(first.output()) == bytes(second.output())
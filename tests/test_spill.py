@@ -0,0 +1,106 @@
+from datetime import date, datetime
+
+import pytest
+
+from briefly import merge
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.spill import SpilledData, SpilledPages, SpillFile
+from briefly.style import NOTION
+
+_GENERATION_TIME = datetime(2025, 1, 1, 12, 0)
+
+
+def _report(memory_budget: int | None = None, team: str = "Alpha") -> PDF:
+    pdf = PDF(NOTION, memory_budget=memory_budget)
+    pdf.generation_time = _GENERATION_TIME
+    pdf.set_creation_date(_GENERATION_TIME)
+    pdf.add_page()
+    pdf.main_title(f"Team {team}")
+    pdf.table_of_contents()
+    for idx in range(40):
+        if idx % 10 == 0:
+            pdf.section_title(f"Sprint {idx // 10}", anchor=f"sprint-{idx // 10}")
+            pdf.pie_chart({"Done": idx + 1, "To Do": 2}, "Status")
+        pdf.task_card(
+            f"{team}-{idx}",
+            f"Task {idx}",
+            "Done",
+            date(2025, 1, 3),
+            1,
+            5,
+            link="#sprint-0",
+        )
+    return pdf
+
+
+def test_memory_budget_spills_to_disk():
+    pdf = _report(memory_budget=5_000)
+
+    usage = pdf.memory_usage()
+    assert usage.spilled > 0
+    assert usage.current <= 5_000 + len(pdf.pages[pdf.page].contents)
+    assert usage.peak >= usage.current
+    assert isinstance(pdf.pages, SpilledPages)
+    assert pdf.pages.spilled
+    assert any(
+        isinstance(info["data"], SpilledData)
+        for info in pdf.image_cache.images.values()
+    )
+
+
+def test_memory_budget_output_is_unchanged():
+    assert _report(memory_budget=10_000).output() == _report().output()
+
+
+def test_memory_usage_without_budget():
+    pdf = _report()
+
+    usage = pdf.memory_usage()
+    assert usage.spilled == 0
+    assert usage.current == usage.peak
+    assert usage.current >= sum(len(page.contents) for page in pdf.pages.values())
+
+
+def test_estimate_counts_spilled_content():
+    assert (
+        _report(memory_budget=10_000).estimate().content_bytes
+        == _report().estimate().content_bytes
+    )
+
+
+def test_merge_spilled_reports():
+    reports = [_report(memory_budget=10_000, team=team) for team in ("Alpha", "Beta")]
+    for report in reports:
+        report.output()
+    pages = sum(report.page for report in reports)
+    merged = merge(reports, NOTION, memory_budget=10_000)
+    for report in reports:
+        report.reset()
+
+    assert merged.page == pages
+    assert merged.memory_usage().spilled > 0
+    assert merged.output()
+
+
+def test_reset_discards_the_spill_file():
+    pdf = _report(memory_budget=10_000)
+    spill = pdf._spill
+    pdf.reset()
+
+    assert spill is not None and spill._file.closed
+    assert pdf.memory_usage().spilled == 0
+    assert pdf.memory_budget == 10_000
+
+
+def test_spill_file_is_closed_at_the_end_of_the_block(tmp_path):
+    with SpillFile(str(tmp_path)) as spill:
+        spill.write("page", b"content")
+        assert spill.read("page") == b"content"
+
+    assert spill._file.closed
+    assert "page" not in spill
+
+
+def test_invalid_memory_budget():
+    with pytest.raises(ValueError):
+        PDF(NOTION, memory_budget=0)
@@ -0,0 +1,110 @@
+import random
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from briefly.rendering.font_metrics import ADVANCE_WIDTHS, PRECOMPUTED_CODEPOINTS
+from briefly.rendering.pdf_generator import FONT_FAMILY, LABEL_SIZE, PDF, TEXT_SIZE
+from briefly.rendering.text_metrics import (
+    CharWidthTable,
+    estimate_column_widths,
+    reservoir_sample,
+)
+
+
+@pytest.fixture
+def table() -> CharWidthTable:
+    return CharWidthTable({ord("a"): 500, ord("ą"): 600}, 1000, 10, 1)
+
+
+def test_char_width_table(table: CharWidthTable):
+    assert table.advance("a") == pytest.approx(5)
+    assert table.advance("b") == pytest.approx(10)
+    assert table.measure("aab") == pytest.approx(20)
+    assert table.measure("aą") == pytest.approx(11)
+
+
+@pytest.mark.parametrize("text", ["Test tag", "Zażółć gęślą jaźń", "PROJ-1234 ✓"])
+def test_char_width_table_matches_fpdf(pdf: PDF, text: str):
+    table = pdf._char_width_table(FONT_FAMILY, "", LABEL_SIZE)
+    pdf.set_font(FONT_FAMILY, "", LABEL_SIZE)
+    assert table.measure(text) == pytest.approx(pdf.get_string_width(text))
+    assert pdf._char_width_table(FONT_FAMILY, "", LABEL_SIZE) is table
+
+
+@pytest.mark.parametrize("style", ["", "B", "I"])
+def test_precomputed_widths_match_the_fonts(pdf: PDF, style: str):
+    font = pdf.fonts[FONT_FAMILY.lower() + style]
+    widths = ADVANCE_WIDTHS[style]
+    assert len(widths) == PRECOMPUTED_CODEPOINTS
+    assert list(widths) == [
+        font.cw.get(code, font.desc.missing_width)
+        for code in range(PRECOMPUTED_CODEPOINTS)
+    ]
+
+
+@pytest.mark.parametrize("style", ["", "B", "I"])
+def test_text_width_equals_fpdf(pdf: PDF, style: str):
+    pdf.set_font(FONT_FAMILY, style, 9)
+    for text in ["PROJ-1234 Fix the login", "Zażółć gęślą jaźń", "Ǆ ✓ 漢字"]:
+        assert pdf._text_width(text) == pdf.get_string_width(text)
+
+
+def test_char_width_table_with_too_few_precomputed_widths():
+    with pytest.raises(ValueError):
+        CharWidthTable({}, 500, 10, 1, precomputed=[500] * 128)
+
+
+def test_reservoir_sample():
+    assert reservoir_sample([1, 2, 3], 5) == [1, 2, 3]
+    assert len(reservoir_sample(range(1000), 10)) == 10
+
+    sample = reservoir_sample(iter(range(1000)), 10, random.Random(1))
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert reservoir_sample(iter(range(1000)), 10, random.Random(1)) == sample
+
+
+def test_estimate_column_widths(table: CharWidthTable):
+    rows = [["a", "aaaa"], ["aa", "b"]]
+    widths = estimate_column_widths(["b", "bb"], rows, table, table, padding=2)
+    assert widths == pytest.approx([12, 22])
+
+    measure_exact = MagicMock(return_value=1)
+    widths = estimate_column_widths(
+        ["b", "b"],
+        rows,
+        table,
+        table,
+        exact_candidates=1,
+        measure_exact=measure_exact,
+    )
+    assert widths == pytest.approx([10, 10])
+    assert measure_exact.call_count == 2
+
+
+def test_styled_table_with_auto_widths(pdf: PDF):
+    pdf._cell = MagicMock()
+    rows = [[f"PROJ-{idx}", "A summary " * (idx % 3)] for idx in range(100)]
+    pdf.styled_table(["Key", "Summary"], rows)
+
+    header_calls = pdf._cell.call_args_list[:2]
+    key_width, summary_width = (c.args[0] for c in header_calls)
+    pdf.set_font(FONT_FAMILY, "", LABEL_SIZE)
+    assert key_width >= pdf.get_string_width("PROJ-99")
+    assert summary_width >= pdf.get_string_width("A summary A summary ")
+    pdf.set_font(FONT_FAMILY, "B", TEXT_SIZE)
+    assert key_width >= pdf.get_string_width("Key")
+
+
+def test_styled_table_auto_widths_fit_the_page(pdf: PDF):
+    pdf._cell = MagicMock()
+    pdf.styled_table(["Description"], [["very long text " * 30]])
+    assert pdf._cell.call_args_list[0].args[0] == pytest.approx(160, 0.01)
+
+
+def test_styled_table_with_array_widths(pdf: PDF):
+    pdf._cell = MagicMock()
+    pdf.styled_table(["Key", "Summary"], [["PROJ-1", "A"]], np.array([40.0, 60.0]))
+    assert [c.args[0] for c in pdf._cell.call_args_list] == [40, 60, 40, 60]
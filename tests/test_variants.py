@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.variants import render
+from briefly.style import LATTE, MOCHA, NOTION, PURPLE_HAZE
+
+_COLOR = re.compile(rb"[\d.]+ [\d.]+ [\d.]+ (?:rg|RG)|\b[\d.]+ [gG]\b")
+
+
+@pytest.mark.parametrize("styles", [[LATTE, MOCHA], [NOTION, PURPLE_HAZE, MOCHA]])
+def test_render_matches_the_reports_rendered_in_each_style(
+    styles, build_report, report, page_texts, generation_time
+):
+    reports = render(build_report, styles, generation_time=generation_time)
+
+    assert len(reports) == len(styles)
+    for style, rendered in zip(styles, reports):
+        expected = report(style)
+        assert rendered.style is style
+        for page in (1, 2):
+            assert page_texts(rendered, page) == page_texts(expected, page)
+            content = bytes(rendered.pages[page].contents)
+            assert set(_COLOR.findall(content)) == set(
+                _COLOR.findall(bytes(expected.pages[page].contents))
+            )
+        # the pie chart is rendered with the chart colors of the style
+        assert rendered.image_cache.images.keys() == expected.image_cache.images.keys()
+        assert len(rendered.pages[1].annots) == len(expected.pages[1].annots) > 0
+
+
+def test_render_keeps_the_explicit_colors(build_report):
+    latte, mocha = render(build_report, [LATTE, MOCHA])
+    # the tag color is serialized by fpdf, independently of the style
+    custom = b"0.0392 0.0784 0.1176 rg"
+    assert custom in bytes(latte.pages[1].contents)
+    assert custom in bytes(mocha.pages[1].contents)
+    # the reports share the generation time
+    assert latte.generation_time == mocha.generation_time
+
+
+def test_render_with_a_table_of_contents(page_texts):
+    def build(pdf: PDF) -> None:
+        pdf.add_page()
+        pdf.table_of_contents()
+        pdf.add_page()
+        pdf.section_title("Tasks")
+
+    (report,) = render(build, [MOCHA])
+    # the table is drawn when the layout is output, after the footer of its page
+    assert page_texts(report, 1)[:3] == ["Contents", "Tasks", "3"]
+    assert "Tasks" in page_texts(report, 3)
+    assert len(report.pages[1].annots) == 1
+
+
+def test_render_in_reproducible_mode(build_report, generation_time):
+    kwargs = {"reproducible": True, "generation_time": generation_time}
+    first = render(build_report, [LATTE, MOCHA], **kwargs)
+    second = render(build_report, [LATTE, MOCHA], **kwargs)
+    assert [bytes(report.output()) for report in first] == [
+        bytes(report.output()) for report in second
+    ]
+    assert first[0].content_hash() != first[1].content_hash()
+
+
+@pytest.mark.parametrize("kwargs", [{"dry_run": True}, {}])
+def test_render_with_invalid_arguments(kwargs, build_report):
+    with pytest.raises(ValueError):
+        render(build_report, [] if not kwargs else [LATTE], **kwargs)
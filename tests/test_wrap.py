@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+from fpdf.enums import MethodReturnValue
+
+from briefly.rendering.cache import LRUCache
+from briefly.rendering.pdf_generator import PDF
+from briefly.rendering.wrap import can_wrap, wrap_text
+from briefly.style import NOTION
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "Done",
+        "In Progress",
+        "Waiting for customer approval",
+        "Ready  for  deployment to production",
+        "Supercalifragilisticexpialidocious",
+        "Überprüfung der naïve café API",
+        "First line\nSecond line",
+        "Non\u00a0breaking spaces\u00a0here",
+        "x" * 80,
+    ],
+)
+@pytest.mark.parametrize("width", [15, 45])
+def test_wrap_text_matches_multi_cell(pdf: PDF, text: str, width: float):
+    pdf.set_font("inter", size=7)
+    expected = pdf.multi_cell(
+        width, text=text, dry_run=True, output=MethodReturnValue.LINES
+    )
+    lines = wrap_text(text, width - 2 * pdf.c_margin, pdf._text_width)
+    assert list(lines) == expected
+
+
+def test_can_wrap():
+    assert can_wrap("In Progress")
+    assert not can_wrap("Soft\u00adhyphen")
+    assert not can_wrap("Trailing line break\n")
+
+
+def test_wrap_with_soft_hyphen_uses_multi_cell(pdf: PDF):
+    lines = pdf._wrap("Extra\u00adordinarily long status", 15)
+    assert lines == tuple(
+        pdf.multi_cell(
+            15,
+            text="Extra\u00adordinarily long status",
+            dry_run=True,
+            output=MethodReturnValue.LINES,
+        )
+    )
+
+
+def test_task_cards_reuse_wrapped_lines(pdf: PDF):
+    for idx in range(10):
+        pdf.task_card(
+            f"PROJ-{idx}",
+            "A title long enough to be wrapped into multiple lines of the card",
+            "Waiting for customer approval",
+            date(2025, 1, 3),
+            2,
+            3,
+        )
+    stats = pdf.cache_stats()["wrapped_lines"]
+    # the status and the title are wrapped once
+    assert (stats.hits, stats.misses, stats.size) == (18, 2, 2)
+    assert stats.hit_rate == pytest.approx(0.9)
+
+
+def test_two_line_label_matches_multi_cell(pdf: PDF):
+    pdf.set_font("inter", size=7)
+    pdf.set_xy(30, 40)
+    pdf.multi_cell(15, 6, "Waiting for customer approval", align="R", max_line_height=3)
+    expected = bytes(pdf.pages[1].contents), pdf.get_x(), pdf.get_y()
+
+    other = PDF(NOTION)
+    other.add_page()
+    other.set_font("inter", size=7)
+    # the same glyphs in the same order of the font subsets
+    other.multi_cell(
+        15, text="Waiting for customer approval", dry_run=True, output="LINES"
+    )
+    _, y = other._two_line_label("Waiting for customer approval", 30, 40)
+    assert (bytes(other.pages[1].contents), other.get_x(), y) == expected
+
+
+def test_cache_stats_without_lookups():
+    stats = LRUCache[str, int]().stats()
+    assert (stats.hits, stats.misses, stats.size, stats.maxsize) == (0, 0, 0, 128)
+    assert stats.hit_rate == 0